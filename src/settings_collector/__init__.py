@@ -1,27 +1,50 @@
 from .version import __version__  # noqa: W0611
 
 from .loaders.base import (  # noqa: W0611
-    SC_LoaderBase, SC_LoaderFromAttribs, SC_LoaderFromDict,
+    SC_LoaderBase, SC_LoaderFromAttribs, SC_LoaderFromDict, SC_LoaderFromFile,
+    SC_LoaderFromSnapshot,
 )
-from .collector import SettingsCollector  # noqa: W0611
+from .collector import (  # noqa: W0611
+    SettingsCollector, sc_clear_caches, sc_collectors,
+)
+from .compiler import sc_compile, sc_compile_to_file  # noqa: W0611
 from .defaults import sc_defaults  # noqa: W0611
 from .exceptions import (  # noqa: W0611
     SC_Exception, SC_ConfigError, SC_WeirdBugError, SC_NotALoader,
     SC_SettingsError,
 )
 from .manager import SC_LoadersManager  # noqa: W0611
+from .metrics import (  # noqa: W0611
+    SC_METRICS_CONTENT_TYPE, sc_metrics_text, sc_metrics_app, sc_metrics_reset,
+)
+from .provenance import SC_Provenance  # noqa: W0611
 from .setting import SC_Setting  # noqa: W0611
 from .settings import SC_Settings, sc_settings  # noqa: W0611
+from .shared import SC_SharedStore  # noqa: W0611
 from .value import SC_Value  # noqa: W0611
-from .test import SCTest, sc_test_print_expected, sc_test_run  # noqa: W0611
+from .test import (  # noqa: W0611
+    SCTest, sc_test_print_expected, sc_test_run, sc_patch, sc_patch_fixture,
+)
 from .undef import SC_undef  # noqa: W0611
+from .watcher import SC_Watcher  # noqa: W0611
 
 from .loaders.base import SC_LoaderBase  # noqa: W0611
 from .loaders.bottle import SC_BottleLoader  # noqa: W0611
 from .loaders.cherrypy import SC_CherryPyLoader  # noqa: W0611
+from .loaders.compiled import SC_CompiledLoader  # noqa: W0611
 from .loaders.django import SC_DjangoLoader  # noqa: W0611
+from .loaders.dotenv import SC_DotEnvLoader  # noqa: W0611
 from .loaders.env import SC_EnvironLoader  # noqa: W0611
 from .loaders.flask import SC_FlaskLoader  # noqa: W0611
+from .loaders.http import SC_HTTPLoader  # noqa: W0611
+from .loaders.ini import SC_INILoader  # noqa: W0611
+from .loaders.json import SC_JSONLoader  # noqa: W0611
 from .loaders.pyramid import SC_PyramidLoader  # noqa: W0611
+from .loaders.redis import SC_RedisLoader  # noqa: W0611
+from .loaders.secrets import SC_SecretsLoader  # noqa: W0611
 from .loaders.settings import SC_SettingsLoader  # noqa: W0611
+from .loaders.shared import SC_SharedMemoryLoader  # noqa: W0611
+from .loaders.sqlite import SC_SQLiteLoader  # noqa: W0611
+from .loaders.toml import SC_TOMLLoader  # noqa: W0611
 from .loaders.turbogears import SC_TurboGearsLoader  # noqa: W0611
+from .loaders.vault import SC_VaultLoader  # noqa: W0611
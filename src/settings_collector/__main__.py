@@ -0,0 +1,94 @@
+"""
+Command line interface of Settings Collector.
+
+Usage: `python -m settings_collector compile --help`.
+"""
+
+import argparse
+import importlib
+import sys
+from typing import Any, List, Optional
+
+from .compiler import sc_compile, sc_compile_to_file
+from .exceptions import SC_ConfigError
+
+
+def _import_object(path: str) -> Any:
+    """
+    Return the object given by its dotted `path` (e.g., `"pkg.mod.name"`).
+    """
+    module_name, _, name = path.rpartition(".")
+    if not module_name:
+        raise SC_ConfigError(f"{repr(path)} is not a dotted path")
+    module = importlib.import_module(module_name)
+    try:
+        return getattr(module, name)
+    except AttributeError:
+        raise SC_ConfigError(
+            f"module {repr(module_name)} has no attribute {repr(name)}",
+        ) from None
+
+
+def _compile(args: argparse.Namespace) -> int:
+    """
+    Run `compile` command.
+    """
+    for module_name in args.module:
+        importlib.import_module(module_name)
+    settings_collectors = (
+        [_import_object(path) for path in args.collector]
+        if args.collector
+        else None
+    )
+    if args.output == "-":
+        sys.stdout.write(sc_compile(settings_collectors, args.scope))
+    else:
+        sc_compile_to_file(args.output, settings_collectors, args.scope)
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Run the command given by the command line arguments `argv`.
+    """
+    parser = argparse.ArgumentParser(prog="python -m settings_collector")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    compile_parser = subparsers.add_parser(
+        "compile",
+        help="load settings and write a Python module that serves them",
+        description=(
+            "Load the settings of all settings collectors (or only the given"
+            " ones) and all of their scopes, and write a Python module that"
+            " serves them through SC_CompiledLoader when imported."
+        ),
+    )
+    compile_parser.add_argument(
+        "-m", "--module", action="append", default=[],
+        help="import this module first (to define settings collectors)",
+    )
+    compile_parser.add_argument(
+        "-c", "--collector", action="append", default=[],
+        help="compile only this settings collector (a dotted path)",
+    )
+    compile_parser.add_argument(
+        "-s", "--scope", action="append", default=[],
+        help="compile this scope of each settings collector as well",
+    )
+    compile_parser.add_argument(
+        "-o", "--output", default="-",
+        help=(
+            "the path of the generated module (its bytecode is written as"
+            " well); if omitted or '-', the module is written to the standard"
+            " output"
+        ),
+    )
+    compile_parser.set_defaults(func=_compile)
+    args = parser.parse_args(argv)
+    try:
+        return args.func(args)
+    except SC_ConfigError as e:
+        parser.exit(1, f"{parser.prog}: error: {e}\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
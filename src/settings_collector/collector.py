@@ -4,12 +4,20 @@ Settings collector implementation.
 
 from __future__ import annotations
 
-from typing import Tuple, Optional, Dict, Any, Iterable, Type
+from contextlib import ContextDecorator
+from functools import wraps
+import inspect
+from typing import (
+    Tuple, Optional, Dict, Any, Iterable, Type, List, Set, Callable,
+)
+from time import perf_counter
+from weakref import WeakSet
 
 from .exceptions import SC_ConfigError, SC_WeirdBugError
 from .manager import SC_LoadersManager
+from .provenance import SC_Provenance
 from .setting import SC_Setting
-from .value import SC_Value, SC_DefaultValue
+from .value import SC_Value, SC_DefaultValue, _sc_overrides, _sc_generation
 
 
 ScopesKeyType = Optional[Tuple[str, ...]]
@@ -36,10 +44,22 @@ class _SettingsCollectorMeta(type):
         "load_all": False,
         # If set to `True`, this loads all settings when the first one is
         # requested. If `False`, they are loaded only when they are requested.
-        # This does not affect the automatically reloaded settings.
+        # This does not affect the automatically reloaded settings nor the
+        # settings that belong to some group (those are always loaded
+        # together with the rest of their group).
         "greedy_load": True,
+        # A dictionary mapping groups' names to sequences of names of the
+        # loaders in which the settings from those groups are looked up (see
+        # `SC_Setting`'s `loaders` argument).
+        "group_loaders": None,
+        # The maximum number of threads used to run the loaders concurrently
+        # when `load_all` is set (0 means that they run one after another).
+        "load_workers": 0,
     }
 
+    # All root settings collectors (scopes remove themselves from here).
+    _collectors: WeakSet = WeakSet()
+
     def __new__(metacls, name, bases, namespace, **kwargs):
         """
         Create and return a new `SettingsCollector` (sub)class.
@@ -68,8 +88,19 @@ class _SettingsCollectorMeta(type):
             parent: Optional[Type[SettingsCollector]] = None
             # Root scope
             root: Optional[Type[SettingsCollector]] = None
-            # Were settings loaded greedily?
-            greedy_loaded: bool = False
+            # The groups of settings that were loaded greedily (`None` being
+            # the default group, which includes all the settings that don't
+            # belong to any named group), with the generations of cached
+            # values in which they were loaded (see `SC_Value.generation`),
+            # or `None` if their values were cleared since.
+            loaded_groups: Dict[
+                Optional[str], Optional[Tuple[int, int]]
+            ] = dict()
+            # Names of settings in each group.
+            groups: Dict[Optional[str], Tuple[str, ...]] = dict()
+            # Generation of cached values, shared with all the scopes (see
+            # `SC_Value.generation`).
+            generation: List[int] = [0]
             # Children scopes (only valid in the root).
             scopes: ScopesType = dict()
 
@@ -87,6 +118,8 @@ class _SettingsCollectorMeta(type):
         result._expand_defaults()
         result._create_sc_values()
 
+        metacls._collectors.add(result)
+
         return result
 
     def __repr__(cls):
@@ -166,17 +199,24 @@ class _SettingsCollectorMeta(type):
         """
         Populate `SC_Values` subclass with definitions of settings.
         """
+        groups: Dict[Optional[str], List[str]] = dict()
         for name in dir(cls):
             sc_setting = getattr(cls, name)
             if not isinstance(sc_setting, SC_Setting):
                 continue
             sc_setting.name = name
-            sc_value = SC_Value(sc_setting)
+            sc_value = SC_Value(
+                sc_setting, cls.SC_Data.generation,  # type: ignore
+            )
             setattr(cls.SC_Settings, name, sc_setting)  # type: ignore
             setattr(cls.SC_Values, name, sc_value)  # type: ignore
             delattr(cls, name)
+            groups.setdefault(sc_setting.group, list()).append(name)
+        cls.SC_Data.groups = {  # type: ignore
+            group: tuple(names) for group, names in groups.items()
+        }
 
-    def __getattr__(cls, name: str) -> Any:
+    def _get_sc_value(cls, name: str) -> SC_Value:
         """
         Return the `SC_Value` instance for `name`.
         """
@@ -190,7 +230,13 @@ class _SettingsCollectorMeta(type):
                 f" {repr(name)}",
             )
         else:
-            return sc_value.getter(cls)  # type: ignore
+            return sc_value
+
+    def __getattr__(cls, name: str) -> Any:
+        """
+        Return the value of the setting `name`.
+        """
+        return cls._get_sc_value(name).getter(cls)  # type: ignore
 
     def __setattr__(cls, name: str, value: Any) -> None:
         """
@@ -262,10 +308,13 @@ class SettingsCollector(metaclass=_SettingsCollectorMeta):
         sc_data.scope_name = scope_name
         sc_data.root = root_scope
         sc_data.scopes = None
+        sc_data.groups = parent_scope.SC_Data.groups  # type: ignore
+        sc_data.generation = parent_scope.SC_Data.generation  # type: ignore
         sc_data.root.SC_Data.scopes[scope_name] = cls  # type: ignore
         cls.SC_Config = parent_scope.SC_Config  # type: ignore
         cls.SC_Settings = parent_scope.SC_Settings  # type: ignore
         cls.__name__ = repr(cls)
+        _SettingsCollectorMeta._collectors.discard(cls)
 
     @classmethod
     def get_sc_values(cls) -> Iterable[Tuple[str, SC_Value]]:
@@ -283,6 +332,22 @@ class SettingsCollector(metaclass=_SettingsCollectorMeta):
             if isinstance(sc_value, SC_Value):
                 yield name, sc_value
 
+    @classmethod
+    def iter_scopes(cls) -> Iterable[Type[SettingsCollector]]:
+        """
+        Return a generator of the root scope and all of its children scopes.
+        """
+        root = cls.SC_Data.root  # type: ignore
+        yield root
+        if root.SC_Data.scopes:
+            # Scopes are registered by both their IDs and their names, so we
+            # use only the former to get each of them once.
+            yield from [
+                scope
+                for scope_id, scope in list(root.SC_Data.scopes.items())
+                if isinstance(scope_id, tuple)
+            ]
+
     @classmethod
     def get_prefix(cls) -> str:
         """
@@ -370,8 +435,34 @@ class SettingsCollector(metaclass=_SettingsCollectorMeta):
         )
 
     @classmethod
-    def _get_sc_default_values(cls) -> Dict[str, Any]:
-        return {name: SC_DefaultValue for name, _ in cls.get_sc_values()}
+    def _get_greedy_groups(
+        cls, settings_names: Optional[Iterable[str]],
+    ) -> Set[Optional[str]]:
+        """
+        Return groups that need to be loaded to get `settings_names`.
+
+        :param settings_names: Either `None` (meaning "all settings") or an
+            iterable of string names of the settings to load.
+        :return: A set of names of groups that are to be loaded greedily
+            (`None` being the default group).
+        """
+        sc_data = cls.SC_Data  # type: ignore
+        if settings_names is None:
+            groups = set(sc_data.groups)
+        else:
+            sc_settings = cls.SC_Settings  # type: ignore
+            groups = {
+                getattr(sc_settings, name).group for name in settings_names
+            }
+            if not cls.SC_Config.greedy_load:
+                groups.discard(None)
+        generation = (sc_data.generation[0], _sc_generation[0])
+        loaded_groups = sc_data.loaded_groups
+        return {
+            group
+            for group in groups
+            if loaded_groups.get(group) != generation
+        }
 
     @classmethod
     def get_settings(
@@ -388,34 +479,381 @@ class SettingsCollector(metaclass=_SettingsCollectorMeta):
         """
         result = dict()
         sc_data = cls.SC_Data  # type: ignore
-        greedy_load = (
-            cls.SC_Config.greedy_load
-            and not sc_data.greedy_loaded
-        )
-        if greedy_load:
-            settings_names = None
+        generation = (sc_data.generation[0], _sc_generation[0])
+        greedy_groups = cls._get_greedy_groups(settings_names)
+        # The errors of the settings that are only reloaded with the requested
+        # ones are raised when those settings are read, just like they would
+        # be if they were loaded one by one.
+        tolerated: Set[str] = set()
+        if settings_names is not None:
+            tolerated.update(
+                name
+                for group in greedy_groups
+                if group in sc_data.loaded_groups
+                for name in sc_data.groups[group]
+            )
+            tolerated.difference_update(settings_names)
+        if greedy_groups:
+            greedy_names = {
+                name
+                for group in greedy_groups
+                for name in sc_data.groups[group]
+            }
+            if settings_names is not None:
+                greedy_names.update(settings_names)
+            settings_names = [
+                name
+                for name in cls.get_settings_names()
+                if name in greedy_names
+            ]
             if sc_data.parent is None:
-                result.update(cls._get_sc_default_values())
-        if expand_names:
+                result.update(
+                    (name, SC_DefaultValue)
+                    for group in greedy_groups
+                    for name in sc_data.groups[group]
+                )
+        if expand_names or settings_names is None:
             settings_names = cls.get_settings_names(settings_names)
-        result.update(SC_LoadersManager.get_settings(cls, settings_names))
-        cls._assign_settings_values(result)
-        if greedy_load:
-            sc_data.greedy_loaded = True
+        sources: Dict[str, Any] = dict()
+        start = perf_counter()
+        result.update(
+            SC_LoadersManager.get_settings(
+                cls, settings_names, sources=sources,
+            ),
+        )
+        duration = perf_counter() - start
+        cls._assign_settings_values(result, tolerated)
+        sc_data.loaded_groups.update(
+            (group, generation) for group in greedy_groups
+        )
+        # Remember where the values came from (see `explain`).
+        prefix = cls.get_scope_prefix()
+        sc_values = cls.SC_Values  # type: ignore
+        for name in settings_names:
+            sc_value = getattr(sc_values, name, None)
+            if sc_value is not None:
+                sc_value.source = (sources.get(name), prefix, duration)
         return result
 
     @classmethod
-    def _assign_settings_values(cls, settings_values: Dict[str, Any]):
+    def get_many(cls, settings_names: Iterable[str]) -> Dict[str, Any]:
+        """
+        Return the values of several settings at once.
+
+        Unlike fetching the settings one by one, this loads all the settings
+        that are not cached with one pass through the loaders, and then those
+        missing in this scope are fetched from the parent scope (again, all of
+        them together).
+
+        :param settings_names: An iterable of string names of the settings.
+        :raise AttributeError: Raised if some of the names are not settings.
+        :return: A dictionary associating settings' names with their values.
+        """
+        sc_values = {
+            name: cls._get_sc_value(name)  # type: ignore
+            for name in settings_names
+        }
+        result = dict()
+        to_load = list()
+        overrides = _sc_overrides.get() or dict()
+        for name, sc_value in sc_values.items():
+            if (cls, name) in overrides:
+                result[name] = overrides[(cls, name)]
+                continue
+            try:
+                result[name] = sc_value.get_cached()
+            except KeyError:
+                sc_value.misses += 1
+                to_load.append(name)
+            else:
+                sc_value.hits += 1
+
+        if to_load:
+            values = cls.get_settings(to_load)
+            inherited = list()
+            for name in to_load:
+                try:
+                    value = values[name]
+                except KeyError:
+                    inherited.append(name)
+                else:
+                    result[name] = sc_values[name]._set_loaded(value)
+            if inherited:
+                parent = cls.SC_Data.parent  # type: ignore
+                if parent is None:
+                    for name in inherited:
+                        result[name] = sc_values[name]._get_default_value()
+                else:
+                    result.update(parent.get_many(inherited))
+
+        return {name: result[name] for name in sc_values}
+
+    @classmethod
+    def explain(cls, name: str) -> SC_Provenance:
+        """
+        Return the description of where the value of `name` came from.
+
+        The value is fetched as usual (so, it is loaded only if it is not
+        cached) and then described based on what was recorded when it was
+        loaded in this scope and its parent scopes.
+
+        :param name: The name of the setting.
+        :raise AttributeError: Raised if `name` is not a setting.
+        :return: The description of the value's origin.
+        """
+        getattr(cls, name)
+        overrides = _sc_overrides.get() or dict()
+        scope = cls
+        duration = 0.0
+        while True:
+            sc_value = scope._get_sc_value(name)  # type: ignore
+            if sc_value.pinned is not None or (scope, name) in overrides:
+                return SC_Provenance(
+                    loader=None,
+                    source_key=None,
+                    scope=scope,
+                    default=False,
+                    cast_fallback=False,
+                    duration=duration,
+                    overridden=True,
+                )
+            if sc_value.source is not None:
+                loader, prefix, load_duration = sc_value.source
+                duration += load_duration
+                if loader is not None:
+                    return SC_Provenance(
+                        loader=loader,
+                        source_key=loader.get_source_key(prefix, name),
+                        scope=scope,
+                        default=sc_value.cast_fallback,
+                        cast_fallback=sc_value.cast_fallback,
+                        duration=duration,
+                    )
+            parent = scope.SC_Data.parent  # type: ignore
+            if parent is None:
+                return SC_Provenance(
+                    loader=None,
+                    source_key=None,
+                    scope=scope,
+                    default=True,
+                    cast_fallback=False,
+                    duration=duration,
+                )
+            scope = parent
+
+    @classmethod
+    def override(cls, **settings_values: Any) -> _SC_Override:
+        """
+        Return a context manager and decorator that overrides settings' values.
+
+        The values are overridden only in the current context (so, only in
+        the current thread or asyncio task, and those started from it while
+        the override is active), without touching the cached values:
+
+        ```python
+        with my_settings.override(foo=17, bar="bard"):
+            ...
+
+        @my_settings.override(foo=17)
+        def f():
+            ...
+        ```
+
+        :param settings_values: Settings' names and their values. The values
+            are cast just like those loaded from the loaders.
+        :raise AttributeError: Raised if some of the names are not settings.
+        :return: An object that can be used as a context manager or as a
+            decorator (of both normal and `async` functions).
+        """
+        return _SC_Override({
+            (cls, name): cls._get_sc_value(name).cast(value)  # type: ignore
+            for name, value in settings_values.items()
+        })
+
+    @classmethod
+    def _assign_settings_values(
+        cls,
+        settings_values: Dict[str, Any],
+        tolerated: Set[str] = frozenset(),  # type: ignore
+    ):
         """
         Assign values from a dictionary to `SC_Value` instances.
+
+        :param tolerated: Names of the settings whose values are left
+            unassigned (instead of raising an error) if they cannot be cast
+            or if they are missing, but required.
         """
         for name, value in settings_values.items():
-            setattr(cls, name, value)
+            if name not in tolerated:
+                setattr(cls, name, value)
+                continue
+            try:
+                setattr(cls, name, value)
+            except (TypeError, ValueError):
+                pass
 
     @classmethod
     def clear_cache(cls):
-        for _, sc_value in cls.get_sc_values():
-            sc_value.clear_cache()
-        if cls.SC_Data.scopes:
-            for scope in cls.SC_Data.scopes.values():
-                scope.clear_cache()
+        """
+        Clear the cached values of this scope (and its children scopes).
+
+        In the root, this only starts a new generation of the cached values
+        shared by all the scopes, so its cost does not depend on the number
+        of the scopes and settings (the values are reloaded on their next
+        read). In other scopes, only that scope's values are cleared.
+        """
+        sc_data = cls.SC_Data  # type: ignore
+        if sc_data.parent is None:
+            sc_data.generation[0] += 1
+        else:
+            for _, sc_value in cls.get_sc_values():
+                sc_value.clear_cache()
+            loaded_groups = sc_data.loaded_groups
+            for group in loaded_groups:
+                loaded_groups[group] = None
+
+    @classmethod
+    def _get_scope_id(
+        cls, scope: str | Iterable[str] | None,
+    ) -> Tuple[str, ...]:
+        """
+        Return the scope ID for `scope` given either as a name or as an ID.
+        """
+        if not scope:
+            return tuple()
+        if isinstance(scope, str):
+            return tuple(scope.split(cls.SC_Config.sep))
+        return tuple(scope)
+
+    @classmethod
+    def invalidate(
+        cls,
+        names: Optional[Iterable[str]] = None,
+        scopes: Optional[Iterable[str | Iterable[str] | None]] = None,
+        scope_prefix: str | Iterable[str] | None = None,
+    ) -> None:
+        """
+        Clear the cached values of only some settings in only some scopes.
+
+        The scopes that don't exist are not created (they have nothing cached
+        anyway). If neither `scopes` nor `scope_prefix` is given, the current
+        scope and all of its children scopes are invalidated.
+
+        :param names: Names of the settings to invalidate. If `None`, all the
+            settings in the selected scopes are invalidated.
+        :param scopes: Names (like `"a__b"`) or IDs (like `("a", "b")`) of the
+            scopes to invalidate. The root is given as `None` or `""`.
+        :param scope_prefix: A name or an ID of a scope that is invalidated
+            together with all of its children scopes. The scopes are matched
+            by their components, so `"tenant4"` does not match `"tenant42"`.
+        :raise AttributeError: Raised if some of the names are not settings.
+        """
+        root = cls.SC_Data.root  # type: ignore
+        all_scopes = root.SC_Data.scopes or dict()
+        if names is not None:
+            names = list(names)
+            for name in names:
+                root._get_sc_value(name)
+        if scopes is None and scope_prefix is None:
+            scope_prefix = cls.SC_Data.scope_name or ""  # type: ignore
+
+        targets: Dict[Tuple[str, ...], Type[SettingsCollector]] = dict()
+        if scopes is not None:
+            for scope in scopes:
+                scope_id = cls._get_scope_id(scope)
+                if not scope_id:
+                    targets[scope_id] = root
+                elif scope_id in all_scopes:
+                    targets[scope_id] = all_scopes[scope_id]
+        if scope_prefix is not None:
+            prefix_id = cls._get_scope_id(scope_prefix)
+            if not prefix_id:
+                targets[prefix_id] = root
+            prefix_len = len(prefix_id)
+            for scope_id, scope in list(all_scopes.items()):
+                if (
+                    isinstance(scope_id, tuple)
+                    and scope_id[:prefix_len] == prefix_id
+                ):
+                    targets[scope_id] = scope
+
+        sc_settings = root.SC_Settings  # type: ignore
+        for scope in targets.values():
+            loaded_groups = scope.SC_Data.loaded_groups
+            if names is None:
+                for _, sc_value in scope.get_sc_values():
+                    sc_value.clear_cache()
+                for group in loaded_groups:
+                    loaded_groups[group] = None
+            else:
+                for name in names:
+                    scope._get_sc_value(name).clear_cache()
+                    group = getattr(sc_settings, name).group
+                    if group in loaded_groups:
+                        loaded_groups[group] = None
+
+
+class _SC_Override(ContextDecorator):
+    """
+    Context manager and decorator returned by `SettingsCollector.override`.
+    """
+
+    def __init__(
+        self, overrides: Dict[Tuple[Type[SettingsCollector], str], Any],
+    ) -> None:
+        self.overrides = overrides
+        self._token: Any = None
+
+    def _recreate_cm(self) -> _SC_Override:
+        # Each call of a decorated function gets its own instance, so that
+        # concurrent and recursive calls don't mix up their tokens.
+        return type(self)(self.overrides)
+
+    def __call__(self, func: Callable) -> Callable:
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def inner(*args: Any, **kwargs: Any) -> Any:
+                with self._recreate_cm():
+                    return await func(*args, **kwargs)
+            return inner
+        return super().__call__(func)
+
+    def __enter__(self) -> _SC_Override:
+        if self._token is not None:
+            raise RuntimeError("settings override is already active")
+        overrides = _sc_overrides.get()
+        self._token = _sc_overrides.set(
+            self.overrides
+            if overrides is None
+            else {**overrides, **self.overrides},
+        )
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        _sc_overrides.reset(self._token)
+        self._token = None
+
+
+def sc_clear_caches() -> None:
+    """
+    Clear the cached values of all settings collectors and their scopes.
+
+    Like `SettingsCollector.clear_cache` in the root, this only starts a new
+    generation of cached values, so its cost does not depend on the number of
+    settings collectors, their scopes, or their settings.
+    """
+    _sc_generation[0] += 1
+
+
+def sc_collectors() -> List[Type[SettingsCollector]]:
+    """
+    Return all defined settings collectors (without their children scopes).
+    """
+    return sorted(
+        (
+            collector
+            for collector in _SettingsCollectorMeta._collectors
+            if collector is not SettingsCollector
+        ),
+        key=lambda collector: (collector.__module__, collector.__qualname__),
+    )
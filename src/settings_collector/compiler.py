@@ -0,0 +1,102 @@
+"""
+Compilation of loaded settings into a Python module.
+"""
+
+from __future__ import annotations
+
+import ast
+import os
+from typing import Any, Iterable, Optional, Type, TYPE_CHECKING
+
+from .exceptions import SC_ConfigError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .collector import SettingsCollector
+
+
+def _repr_literal(key: str, value: Any) -> str:
+    """
+    Return `value` as a Python literal.
+
+    :raise SC_ConfigError: Raised if `value` cannot be written as a literal.
+    """
+    result = repr(value)
+    try:
+        ast.literal_eval(result)
+    except (ValueError, SyntaxError, TypeError, MemoryError, RecursionError):
+        raise SC_ConfigError(
+            f"setting {repr(key)} has a value of type {type(value).__name__},"
+            f" which cannot be compiled",
+        ) from None
+    return result
+
+
+def sc_compile(
+    settings_collectors: Optional[Iterable[Type[SettingsCollector]]] = None,
+    scopes: Iterable[str] = (),
+) -> str:
+    """
+    Load settings and return the source of a module that serves them.
+
+    Importing the returned module installs the loaded values in
+    `SC_CompiledLoader`, so that no other loaders are needed for the compiled
+    settings.
+
+    :param settings_collectors: The settings collectors to compile. If `None`,
+        all settings collectors are compiled. Each collector's existing scopes
+        are compiled as well.
+    :param scopes: Names of scopes to create (if they don't exist yet) in each
+        settings collector before compiling them.
+    :raise SC_ConfigError: Raised if some value cannot be written as a Python
+        literal.
+    :return: The source code of the module.
+    """
+    from .manager import SC_LoadersManager
+
+    settings, names = SC_LoadersManager.take_snapshot(
+        settings_collectors, scopes,
+    )
+
+    lines = [
+        '"""',
+        "Settings compiled by `python -m settings_collector compile`.",
+        "",
+        "This module was generated automatically, so do not edit it.",
+        '"""',
+        "",
+        "from settings_collector import SC_CompiledLoader",
+        "",
+        "",
+        "NAMES = frozenset({",
+        *(f"    {repr(name)}," for name in sorted(names)),
+        "})",
+        "",
+        "SETTINGS = {",
+        *(
+            f"    {repr(key)}: {_repr_literal(key, settings[key])},"
+            for key in sorted(settings)
+        ),
+        "}",
+        "",
+        "SC_CompiledLoader.install(SETTINGS, NAMES)",
+    ]
+    return "".join(f"{line}\n" for line in lines)
+
+
+def sc_compile_to_file(
+    path: str,
+    settings_collectors: Optional[Iterable[Type[SettingsCollector]]] = None,
+    scopes: Iterable[str] = (),
+) -> None:
+    """
+    Compile settings into the module `path` and its bytecode.
+
+    For arguments, see :py:func:`sc_compile`.
+    """
+    source = sc_compile(settings_collectors, scopes)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        f.write(source)
+    os.replace(tmp_path, path)
+    import py_compile
+    py_compile.compile(path, doraise=True)
@@ -2,9 +2,43 @@
 Base class for settings loading classes.
 """
 
+from contextvars import copy_context
+import os
+import threading
+from time import monotonic
 from typing import Iterable, Any, Optional, Type, Callable
 
 from ..exceptions import SC_ConfigError
+from ..manager import SC_LoadersManager
+
+
+class _SC_LoaderHealth:
+    """
+    State of a loader's circuit breaker and its last known good values.
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        # Number of consecutive failed calls.
+        self.failures = 0
+        # `monotonic()` time until which the loader is skipped.
+        self.open_until = 0.0
+        # The last values successfully loaded for each prefix.
+        self.last_good: dict[str, dict[str, Any]] = dict()
+        # Calls of `load_settings` running in background threads (see
+        # `timeout`), keyed by their arguments.
+        self.calls: dict[tuple[str, tuple[str, ...]], _SC_LoaderCall] = dict()
+
+
+class _SC_LoaderCall:
+    """
+    A call of a loader's `load_settings` running in a background thread.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        # The call's result (wrapped in a tuple) or the exception it raised.
+        self.outcome: Any = None
 
 
 class _SC_LoaderBaseMeta(type):
@@ -16,8 +50,10 @@ class _SC_LoaderBaseMeta(type):
         # Create the class.
         result = super().__new__(metacls, name, bases, namespace, **kwargs)
 
+        # Each class gets its own circuit breaker.
+        result._health = _SC_LoaderHealth()
+
         # Register that class.
-        from ..manager import SC_LoadersManager
         SC_LoadersManager.register_loader(result)
 
         # Return the new class as one normally would in `__new__`.
@@ -52,6 +88,29 @@ class SC_LoaderBase(metaclass=_SC_LoaderBaseMeta):
     # values in Django are traditionally defined as upper-case strings.
     name_case: Optional[Callable[[str], str]] = None
 
+    # The maximum time (in seconds) that loading the settings may take. If
+    # exceeded, the call is treated as a failure (see `failure_threshold`)
+    # and left to finish in the background. `None` means no limit.
+    timeout: Optional[float] = None
+
+    # The number of consecutive failures (timeouts and exceptions other than
+    # those in `no_settings_exceptions`) after which the loader is skipped
+    # for `cooldown` seconds. If `None`, exceptions are raised as usual and
+    # the loader is never skipped. While the loader is failing or skipped, it
+    # provides the values that it last loaded successfully, if it has any;
+    # otherwise, the settings are looked up in the next loader.
+    failure_threshold: Optional[int] = None
+    cooldown: float = 30.0
+
+    # The name of the module without which `get_partition_key` always returns
+    # `None` (e.g., `"flask"`). Until such module is imported, the loader is
+    # not asked for its partition key at all. `None` means that it is always
+    # asked (if it is partitioned).
+    partition_module: Optional[str] = None
+
+    # The circuit breaker's state (set by the metaclass for each class).
+    _health: _SC_LoaderHealth
+
     @classmethod
     def _get_source_name(cls, name: str) -> str:
         """
@@ -66,6 +125,54 @@ class SC_LoaderBase(metaclass=_SC_LoaderBaseMeta):
                 f"name_case must be a callable, not a {type(cls.name_case)}",
             )
 
+    @classmethod
+    def get_source_key(cls, prefix: str, name: str) -> str:
+        """
+        Return the key under which this loader looks up the setting `name`.
+
+        This is used only to describe where the values came from (see
+        `SettingsCollector.explain`), so override it if your loader looks up
+        the settings in some other way.
+
+        :param prefix: The prefix of the settings' names (including the scope).
+        :param name: The name of the setting.
+        """
+        return f"{cls._get_source_name(prefix)}{cls._get_source_name(name)}"
+
+    @classmethod
+    def get_partition_key(cls) -> Any:
+        """
+        Return the object that identifies the currently active source.
+
+        Loaders that read the settings of some object that can differ between
+        calls (for example, the Flask app in whose context the code runs)
+        override this to return that object, or `None` if there is no active
+        one. The settings collectors then cache the values separately for each
+        such object. The object is compared by its identity and a reference to
+        it is kept for as long as the values are cached.
+        """
+        return None
+
+    @classmethod
+    def is_partitioned(cls) -> bool:
+        """
+        Return `True` if this loader overrides `get_partition_key`.
+        """
+        return (
+            cls.get_partition_key.__func__  # type: ignore
+            is not SC_LoaderBase.get_partition_key.__func__  # type: ignore
+        )
+
+    @classmethod
+    def get_watched_paths(cls) -> list[str]:
+        """
+        Return paths of files and directories that hold this loader's settings.
+
+        These are polled by `SC_Watcher`, which clears the caches of the
+        settings collectors that use this loader when any of them changes.
+        """
+        return list()
+
     @classmethod
     def get_settings(
         cls, prefix: str, settings_names: Iterable[str],
@@ -93,15 +200,143 @@ class SC_LoaderBase(metaclass=_SC_LoaderBaseMeta):
 
         prefix = cls._get_source_name(prefix)
 
+        if cls.timeout is None and cls.failure_threshold is None:
+            try:
+                result, success = cls.load_settings(prefix, settings_names)
+            except Exception as e:
+                if isinstance(e, cls. no_settings_exceptions):
+                    return None
+                else:
+                    raise
+            else:
+                return result if success else None
+
+        health = cls._health
+        if health.open_until > monotonic():
+            return cls._get_last_good(prefix, settings_names)
         try:
-            result, success = cls.load_settings(prefix, settings_names)
+            result, success = cls._load_settings_guarded(
+                prefix, settings_names,
+            )
         except Exception as e:
-            if isinstance(e, cls. no_settings_exceptions):
+            if isinstance(e, cls.no_settings_exceptions):
+                cls._record_success()
                 return None
-            else:
+            with health.lock:
+                health.failures += 1
+                if (
+                    cls.failure_threshold is not None
+                    and health.failures >= cls.failure_threshold
+                ):
+                    health.open_until = monotonic() + cls.cooldown
+            if cls.failure_threshold is None and not isinstance(
+                e, TimeoutError,
+            ):
                 raise
-        else:
-            return result if success else None
+            return cls._get_last_good(prefix, settings_names)
+        cls._record_success()
+        if not success:
+            return None
+        with health.lock:
+            health.last_good[prefix] = {
+                **health.last_good.get(prefix, dict()), **result,
+            }
+        return result
+
+    @classmethod
+    def _load_settings_guarded(
+        cls, prefix: str, settings_names: list[str],
+    ) -> tuple[dict[str, Any], bool]:
+        """
+        Return `load_settings(prefix, settings_names)`, respecting `timeout`.
+
+        With `timeout` set, the settings are loaded in a separate (daemon)
+        thread, which is abandoned if it doesn't finish in time. While it
+        runs, the calls with the same arguments wait for its result instead
+        of starting new threads (so, a hanging source doesn't leave behind a
+        new thread on every read).
+
+        :raise TimeoutError: Raised if loading takes longer than `timeout`.
+        """
+        if cls.timeout is None:
+            return cls.load_settings(prefix, settings_names)
+        health = cls._health
+        key = (prefix, tuple(settings_names))
+        with health.lock:
+            call = health.calls.get(key)
+            start = call is None
+            if call is None:
+                call = health.calls[key] = _SC_LoaderCall()
+
+        def target() -> None:
+            try:
+                call.outcome = (cls.load_settings(prefix, settings_names),)
+            except BaseException as e:
+                call.outcome = e
+            finally:
+                with health.lock:
+                    if health.calls.get(key) is call:
+                        del health.calls[key]
+                call.done.set()
+
+        if start:
+            threading.Thread(
+                target=copy_context().run, args=(target,),
+                name=f"settings_collector_{cls.__name__}", daemon=True,
+            ).start()
+        if not call.done.wait(cls.timeout):
+            raise TimeoutError(
+                f"{cls.__name__} took more than {cls.timeout} seconds to load"
+                f" settings",
+            )
+        if isinstance(call.outcome, BaseException):
+            raise call.outcome
+        return call.outcome[0]
+
+    @classmethod
+    def _record_success(cls) -> None:
+        """
+        Reset the circuit breaker after a successful call.
+        """
+        health = cls._health
+        if health.failures:
+            with health.lock:
+                health.failures = 0
+                health.open_until = 0.0
+
+    @classmethod
+    def _get_last_good(
+        cls, prefix: str, settings_names: list[str],
+    ) -> Optional[dict[str, Any]]:
+        """
+        Return the last known good values of `settings_names`.
+
+        :return: A dictionary with those of `settings_names` that were
+            successfully loaded before or `None` if there are none.
+        """
+        last_good = cls._health.last_good.get(prefix)
+        if last_good is None:
+            return None
+        result = {
+            name: last_good[name]
+            for name in settings_names
+            if name in last_good
+        }
+        return result or None
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        Return `False` if this loader is skipped due to repeated failures.
+        """
+        return cls._health.open_until <= monotonic()
+
+    @classmethod
+    def reset_health(cls) -> None:
+        """
+        Close the circuit breaker and forget the last known good values.
+        """
+        cls._health = _SC_LoaderHealth()
 
     @classmethod
     def load_settings(
@@ -170,7 +405,7 @@ class SC_LoaderFromAttribs(SC_LoaderBase):
             1. relevant settings values in a dictionary, and
             2. a Boolean describing the success of the loading.
         """
-        source = cls.get_source()
+        source = SC_LoadersManager.get_source(cls)
         result = dict()
         for name in settings_names:
             try:
@@ -220,7 +455,7 @@ class SC_LoaderFromDict(SC_LoaderBase):
             2. a Boolean describing the success of the loading (success here
                means that at least one value was found and loaded).
         """
-        source = cls.get_source()
+        source = SC_LoadersManager.get_source(cls)
         result = dict()
         for name in settings_names:
             try:
@@ -229,3 +464,149 @@ class SC_LoaderFromDict(SC_LoaderBase):
             except KeyError:
                 pass
         return result, bool(result)
+
+
+class SC_LoaderFromSnapshot(SC_LoaderFromDict):
+    """
+    Base for loaders that serve snapshots of settings loaded by other loaders.
+
+    The snapshots are taken by `SC_LoadersManager.take_snapshot`, while which
+    these loaders are skipped (so that new snapshots are never made from the
+    old ones). Unlike other dictionary-based loaders, these are successful
+    even if they find no values, as long as all the requested settings are in
+    the snapshot (because then we know that they are not defined in any
+    loader). If some are not, the loader provides no settings, so that the
+    other loaders are used instead.
+    """
+
+    @classmethod
+    def get_snapshot(cls) -> Any:
+        """
+        Return dictionary with the snapshot's settings.
+
+        :raise ImportError: Raised if there is no snapshot.
+        """
+        raise NotImplementedError(
+            f"do not use {cls.__name__} directly (use a class that inherits it"
+            f" and has `get_snapshot` properly defined)",
+        )  # pragma: no cover
+
+    @classmethod
+    def is_in_snapshot(cls, name: str) -> bool:
+        """
+        Return `True` if the setting `name` (with the prefix) was loaded into
+        the snapshot, even if no loader provided its value.
+        """
+        raise NotImplementedError(
+            f"do not use {cls.__name__} directly (use a class that inherits it"
+            f" and has `is_in_snapshot` properly defined)",
+        )  # pragma: no cover
+
+    @classmethod
+    def get_source(cls) -> Any:
+        """
+        Return dictionary with settings.
+        """
+        if SC_LoadersManager.is_taking_snapshot():
+            raise ImportError("a snapshot of settings is being taken")
+        return cls.get_snapshot()
+
+    @classmethod
+    def load_settings(
+        cls, prefix: str, settings_names: list[str],
+    ) -> tuple[dict[str, Any], bool]:
+        """
+        Return the relevant settings values in a dictionary.
+
+        :param prefix: A prefix to be added to each name. For example, is some
+            setting's name is `"bar"` and the prefix is `"foo_"` it is loaded
+            from `"foo_bar"` and saved as `"bar"`.
+        :param settings_names: A list of string names to of the variables to
+            load.
+        :return: A tuple containing
+            1. relevant settings values in a dictionary; and
+            2. a Boolean describing the success of the loading.
+        """
+        if not all(
+            cls.is_in_snapshot(f"{prefix}{cls._get_source_name(name)}")
+            for name in settings_names
+        ):
+            return dict(), False
+        result, _ = super().load_settings(prefix, settings_names)
+        return result, True
+
+
+class SC_LoaderFromFile(SC_LoaderFromDict):
+    """
+    Base for settings loader classes that load settings from files.
+
+    The file is parsed when its settings are first needed and then again only
+    when `os.stat` reports that it was changed (i.e., its inode, modification
+    time, or size are different), so the settings that are not cached don't
+    cause the file to be parsed on every read.
+    """
+
+    no_settings_exceptions = (ImportError, FileNotFoundError)
+
+    # Path to the settings file. If not set (or the file doesn't exist), the
+    # loader will provide no settings.
+    path: Optional[str] = None
+
+    # Separator used to join the keys of nested tables (so, `{"a": {"b": 1}}`
+    # becomes `{"a": {"b": 1}, "a__b": 1}`). This should be the same as
+    # `SC_Config.sep` of settings collectors that use this loader.
+    sep: str = "__"
+
+    # Cached settings and the key that they are valid for.
+    _cache: Optional[tuple[tuple[Any, ...], dict[str, Any]]] = None
+
+    @classmethod
+    def parse(cls, content: bytes) -> dict[str, Any]:
+        """
+        Return settings parsed from the file's `content`.
+        """
+        raise NotImplementedError(
+            f"do not use {cls.__name__} directly (use a class that inherits it"
+            f" and has `parse` properly defined)",
+        )  # pragma: no cover
+
+    @classmethod
+    def _flatten(
+        cls, data: dict[str, Any], prefix: str, result: dict[str, Any],
+    ) -> dict[str, Any]:
+        """
+        Add values from `data` to `result` with nested keys joined by `sep`.
+        """
+        for key, value in data.items():
+            name = f"{prefix}{key}"
+            result[name] = value
+            if isinstance(value, dict):
+                cls._flatten(value, f"{name}{cls.sep}", result)
+        return result
+
+    @classmethod
+    def get_watched_paths(cls) -> list[str]:
+        """
+        Return paths of files and directories that hold this loader's settings.
+        """
+        return [] if cls.path is None else [cls.path]
+
+    @classmethod
+    def get_source(cls) -> dict[str, Any]:
+        """
+        Return dictionary with settings, parsing the file only if it changed.
+        """
+        path = cls.path
+        if path is None:
+            raise FileNotFoundError(f"{cls.__name__}.path is not set")
+        stat = os.stat(path)
+        cache_key = (
+            path, cls.sep, stat.st_ino, stat.st_mtime_ns, stat.st_size,
+        )
+        cache = cls._cache
+        if cache is None or cache[0] != cache_key:
+            with open(path, "rb") as f:
+                content = f.read()
+            cache = (cache_key, cls._flatten(cls.parse(content), "", dict()))
+            cls._cache = cache
+        return cache[1]
@@ -5,6 +5,7 @@ Note: I never used Bottle. This was made based on reading the docs. Ping me
 if it's wrong, please.
 """
 
+import sys
 from typing import Any
 
 from .base import SC_LoaderFromDict
@@ -15,6 +16,16 @@ class SC_BottleLoader(SC_LoaderFromDict):
     Loader that grabs settings from Bottle's config.
     """
 
+    partition_module = "bottle"
+
+    @classmethod
+    def get_partition_key(cls) -> Any:
+        """
+        Return the default Bottle app (or `None` if Bottle is not used).
+        """
+        bottle = sys.modules.get("bottle")
+        return None if bottle is None else bottle.default_app()
+
     @classmethod
     def get_source(cls) -> Any:
         """
@@ -6,6 +6,7 @@ if it's wrong, please.
 """
 
 from copy import deepcopy
+import sys
 from typing import Any
 
 from .base import SC_LoaderFromDict
@@ -18,6 +19,18 @@ class SC_CherryPyLoader(SC_LoaderFromDict):
 
     no_settings_exceptions = (ImportError, AttributeError)
 
+    partition_module = "cherrypy"
+
+    @classmethod
+    def get_partition_key(cls) -> Any:
+        """
+        Return the current CherryPy app (or `None` if there is none).
+        """
+        cherrypy = sys.modules.get("cherrypy")
+        if cherrypy is None:
+            return None
+        return getattr(cherrypy.request, "app", None)
+
     @classmethod
     def get_source(cls) -> Any:
         """
@@ -0,0 +1,62 @@
+"""
+Loader that grabs settings from a module generated at build time.
+"""
+
+from typing import Any, FrozenSet, Mapping, Optional
+
+from .base import SC_LoaderFromSnapshot
+
+
+class SC_CompiledLoader(SC_LoaderFromSnapshot):
+    """
+    Loader that grabs settings from a module generated at build time.
+
+    The module is generated by `python -m settings_collector compile` (see
+    `sc_compile`) and importing it installs its settings in this loader. Its
+    priority is just below that of `SC_SharedMemoryLoader`, so the compiled
+    settings are used instead of the other loaders for the settings that were
+    compiled.
+    """
+
+    priority = 171928
+    enabled = False
+
+    # The compiled settings and the names of all compiled settings (including
+    # those that had no values).
+    settings: Optional[Mapping[str, Any]] = None
+    names: FrozenSet[str] = frozenset()
+
+    @classmethod
+    def install(
+        cls, settings: Mapping[str, Any], names: FrozenSet[str],
+    ) -> None:
+        """
+        Serve `settings` (called by the generated modules).
+
+        :param settings: The values keyed by settings' names (including the
+            prefixes and the scopes).
+        :param names: The names (with the prefixes and the scopes) of all
+            compiled settings.
+        """
+        from ..collector import sc_clear_caches
+
+        cls.settings = settings
+        cls.names = names
+        cls.enabled = True
+        sc_clear_caches()
+
+    @classmethod
+    def get_snapshot(cls) -> Any:
+        """
+        Return dictionary with the compiled settings.
+        """
+        if cls.settings is None:
+            raise ImportError("no compiled settings are installed")
+        return cls.settings
+
+    @classmethod
+    def is_in_snapshot(cls, name: str) -> bool:
+        """
+        Return `True` if the setting `name` (with the prefix) was compiled.
+        """
+        return name in cls.names
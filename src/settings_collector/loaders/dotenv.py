@@ -0,0 +1,144 @@
+"""
+Loader that grabs settings from a `.env` file.
+"""
+
+from typing import Any
+
+from .base import SC_LoaderFromFile
+
+
+# Escape sequences recognised in double-quoted values.
+_ESCAPES = {
+    "n": "\n", "r": "\r", "t": "\t", "\\": "\\", '"': '"', "'": "'", "$": "$",
+}
+
+
+def _skip_line(text: str, idx: int) -> int:
+    """
+    Return the index of the first character after the end of the current line.
+    """
+    idx = text.find("\n", idx)
+    return len(text) if idx < 0 else idx + 1
+
+
+def _parse_double_quoted(text: str, idx: int) -> tuple[str, int]:
+    """
+    Return the value of a double-quoted string and the index after its end.
+
+    :param idx: The index of the first character after the opening quote.
+    """
+    parts: list[str] = list()
+    start = idx
+    length = len(text)
+    while idx < length:
+        char = text[idx]
+        if char == '"':
+            parts.append(text[start:idx])
+            return "".join(parts), idx + 1
+        if char == "\\" and idx + 1 < length:
+            parts.append(text[start:idx])
+            escaped = text[idx + 1]
+            parts.append(_ESCAPES.get(escaped, f"\\{escaped}"))
+            idx += 2
+            start = idx
+        else:
+            idx += 1
+    raise ValueError("unterminated double-quoted value")
+
+
+def _parse_dotenv(text: str) -> dict[str, str]:
+    """
+    Return the variables defined in `text` in a single pass over it.
+
+    The format follows the usual conventions of `.env` files:
+
+    * empty lines and lines starting with `#` are ignored, as are the lines
+      without `=`;
+    * names can be prefixed with `export `;
+    * values in single quotes are taken literally;
+    * values in double quotes support escape sequences (`\\n`, `\\t`, `\\"`,
+      etc.);
+    * quoted values can span multiple lines;
+    * unquoted values are stripped and anything after ` #` is a comment.
+    """
+    result: dict[str, str] = dict()
+    length = len(text)
+    idx = 0
+    while idx < length:
+        char = text[idx]
+        if char in " \t\r\n":
+            idx += 1
+            continue
+        if char == "#":
+            idx = _skip_line(text, idx)
+            continue
+
+        # Name.
+        eol = text.find("\n", idx)
+        if eol < 0:
+            eol = length
+        eq = text.find("=", idx, eol)
+        if eq < 0:
+            idx = eol + 1
+            continue
+        name = text[idx:eq].strip()
+        if name.startswith("export") and name[6:7] in (" ", "\t"):
+            name = name[7:].lstrip()
+        idx = eq + 1
+        while idx < length and text[idx] in " \t":
+            idx += 1
+
+        # Value.
+        quote = text[idx] if idx < length else ""
+        if quote == "'":
+            end = text.find("'", idx + 1)
+            if end < 0:
+                raise ValueError(
+                    f"unterminated single-quoted value of {repr(name)}",
+                )
+            value = text[idx + 1:end]
+            idx = _skip_line(text, end + 1)
+        elif quote == '"':
+            try:
+                value, end = _parse_double_quoted(text, idx + 1)
+            except ValueError as e:
+                raise ValueError(f"{e} of {repr(name)}") from None
+            idx = _skip_line(text, end)
+        else:
+            eol = text.find("\n", idx)
+            if eol < 0:
+                eol = length
+            value = text[idx:eol]
+            comment = value.find(" #")
+            if comment >= 0:
+                value = value[:comment]
+            value = value.strip()
+            idx = eol + 1
+
+        if name:
+            result[name] = value
+    return result
+
+
+class SC_DotEnvLoader(SC_LoaderFromFile):
+    """
+    Loader that grabs settings from a `.env` file.
+
+    Just like `SC_EnvironLoader`, this one is disabled by default, because
+    the files are read from the current working directory unless `path` is
+    changed. Its priority is below that of `SC_EnvironLoader`, so that the
+    actual environment variables override those from the file when
+    `load_all` is set.
+    """
+
+    priority = -171929
+    enabled = False
+    name_case = str.upper
+    path = ".env"
+
+    @classmethod
+    def parse(cls, content: bytes) -> dict[str, Any]:
+        """
+        Return settings parsed from the file's `content`.
+        """
+        return _parse_dotenv(content.decode("utf-8-sig"))
@@ -2,6 +2,7 @@
 Loader that grabs settings from Flask's config.
 """
 
+import sys
 from typing import Any
 
 from .base import SC_LoaderFromDict
@@ -14,10 +15,25 @@ class SC_FlaskLoader(SC_LoaderFromDict):
 
     name_case = str.upper
 
+    partition_module = "flask"
+
+    @classmethod
+    def get_partition_key(cls) -> Any:
+        """
+        Return the current Flask app (or `None` if there is none).
+        """
+        flask = sys.modules.get("flask")
+        if flask is None or not flask.has_app_context():
+            return None
+        return flask.current_app._get_current_object()
+
     @classmethod
     def get_source(cls) -> Any:
         """
         Return dictionary that with settings.
         """
-        from flask import current_app  # type: ignore
-        return current_app.config  # pragma: no cover
+        from flask import current_app, has_app_context  # type: ignore
+        if not has_app_context():
+            # There is no app (and no config) outside of an app context.
+            return dict()
+        return current_app.config
@@ -0,0 +1,214 @@
+"""
+Loader that grabs settings from a JSON-over-HTTP config service.
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+from typing import Any, Optional, TYPE_CHECKING
+from urllib.parse import urlencode, urlsplit
+
+from .base import SC_LoaderBase
+
+if TYPE_CHECKING:  # pragma: no cover
+    import http.client
+
+
+class SC_HTTPLoader(SC_LoaderBase):
+    """
+    Loader that grabs settings from a JSON-over-HTTP config service.
+
+    All the requested settings are fetched in a single request:
+
+    ```
+    GET <url>?key=<prefix><name1>&key=<prefix><name2>&...
+    ```
+
+    to which the service responds with a JSON object mapping the found keys to
+    their values (the keys that are not defined are simply omitted). A `404`
+    response means that there are no settings at all.
+
+    The connections are kept alive and reused, and the responses with an
+    `ETag` header are cached, so that repeated loads are revalidated with
+    `If-None-Match` and the service can reply with a body-less `304`.
+
+    The loader is disabled by default. To use it, enable it and set its `url`.
+    """
+
+    enabled = False
+
+    # The URL of the service's endpoint (`http` or `https`). If `None`, the
+    # loader provides no settings.
+    url: Optional[str] = None
+
+    # Additional headers sent with each request (for example,
+    # `{"Authorization": "Bearer ..."}`).
+    headers: dict[str, str] = dict()
+
+    # Socket timeout (in seconds) of each request. See also `timeout` for
+    # limiting the time that the whole load may take.
+    request_timeout: float = 10.0
+
+    # The maximum number of idle connections kept for reuse per host.
+    pool_size: int = 4
+
+    # The maximum number of cached responses (the oldest ones are dropped).
+    max_cached_responses: int = 256
+
+    # Idle connections by scheme and host.
+    _pools: dict[tuple[str, str], list[http.client.HTTPConnection]] = dict()
+    _pools_lock = threading.Lock()
+    # Cached responses by scheme, host, and request target, with their ETags.
+    _responses: dict[tuple[str, str, str], tuple[str, dict[str, Any]]] = (
+        dict()
+    )
+
+    @classmethod
+    def _get_connection(
+        cls, scheme: str, netloc: str,
+    ) -> tuple[http.client.HTTPConnection, bool]:
+        """
+        Return a connection to `netloc` and whether it is a reused one.
+        """
+        with cls._pools_lock:
+            pool = cls._pools.get((scheme, netloc))
+            if pool:
+                return pool.pop(), True
+        # Imported here, as it's not needed while the loader is disabled.
+        import http.client
+        connection_class = (
+            http.client.HTTPSConnection
+            if scheme == "https"
+            else http.client.HTTPConnection
+        )
+        return connection_class(netloc, timeout=cls.request_timeout), False
+
+    @classmethod
+    def _release_connection(
+        cls, scheme: str, netloc: str, conn: http.client.HTTPConnection,
+    ) -> None:
+        """
+        Return `conn` to the pool (or close it if the pool is full).
+        """
+        with cls._pools_lock:
+            pool = cls._pools.setdefault((scheme, netloc), list())
+            if len(pool) < cls.pool_size:
+                pool.append(conn)
+                return
+        conn.close()
+
+    @classmethod
+    def close_connections(cls) -> None:
+        """
+        Close all idle connections.
+        """
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            for conn in pool:
+                conn.close()
+
+    @classmethod
+    def _request(
+        cls,
+        scheme: str,
+        netloc: str,
+        target: str,
+        headers: dict[str, str],
+        method: str = "GET",
+        body: Optional[bytes] = None,
+    ) -> tuple[int, Optional[str], bytes]:
+        """
+        Send a request and return the status, the ETag, and the body.
+
+        A request that fails on a reused connection (which the server might
+        have closed in the meantime) is retried once on a new one.
+        """
+        import http.client
+        while True:
+            conn, reused = cls._get_connection(scheme, netloc)
+            try:
+                conn.request(method, target, body=body, headers=headers)
+                response = conn.getresponse()
+                data = response.read()
+            except (http.client.HTTPException, OSError):
+                conn.close()
+                if reused:
+                    continue
+                raise
+            if response.will_close:
+                conn.close()
+            else:
+                cls._release_connection(scheme, netloc, conn)
+            return response.status, response.getheader("ETag"), data
+
+    @classmethod
+    def _fetch(cls, keys: list[str]) -> dict[str, Any]:
+        """
+        Return the values of `keys` that are defined in the service.
+
+        :raise ConnectionError: Raised if the service responds with an
+            unexpected status.
+        """
+        parts = urlsplit(cls.url)
+        path = parts.path or "/"
+        query = urlencode([("key", key) for key in keys])
+        if parts.query:
+            query = f"{parts.query}&{query}"
+        target = f"{path}?{query}"
+        headers = {"Accept": "application/json", **cls.headers}
+        cache_key = (parts.scheme, parts.netloc, target)
+        cached = cls._responses.get(cache_key)
+        if cached is not None:
+            headers["If-None-Match"] = cached[0]
+        status, etag, body = cls._request(
+            parts.scheme, parts.netloc, target, headers,
+        )
+        if status == 304 and cached is not None:
+            return cached[1]
+        if status == 404:
+            return dict()
+        if status != 200:
+            raise ConnectionError(
+                f"{cls.url} responded with status {status}",
+            )
+        data = json.loads(body)
+        if not isinstance(data, dict):
+            raise ValueError(f"{cls.url} did not respond with an object")
+        if etag is not None:
+            responses = cls._responses
+            responses.pop(cache_key, None)
+            while len(responses) >= cls.max_cached_responses > 0:
+                responses.pop(next(iter(responses)), None)
+            responses[cache_key] = (etag, data)
+        return data
+
+    @classmethod
+    def load_settings(
+        cls, prefix: str, settings_names: list[str],
+    ) -> tuple[dict[str, Any], bool]:
+        """
+        Return the relevant settings values in a dictionary.
+
+        :param prefix: A prefix to be added to each name.
+        :param settings_names: A list of string names to of the variables to
+            load.
+        :return: A tuple containing
+            1. relevant settings values in a dictionary; and
+            2. a Boolean describing the success of the loading (success here
+               means that at least one value was found and loaded).
+        """
+        if cls.url is None or not settings_names:
+            return dict(), False
+        keys = [
+            f"{prefix}{cls._get_source_name(name)}" for name in settings_names
+        ]
+        data = cls._fetch(keys)
+        result = {
+            name: data[key]
+            for name, key in zip(settings_names, keys)
+            if key in data
+        }
+        return result, bool(result)
@@ -0,0 +1,36 @@
+"""
+Loader that grabs settings from an INI file.
+"""
+
+from configparser import ConfigParser
+from typing import Any
+
+from .base import SC_LoaderFromFile
+
+
+class SC_INILoader(SC_LoaderFromFile):
+    """
+    Loader that grabs settings from an INI file.
+
+    The loader is disabled by default. To use it, set `SC_INILoader.path` to
+    the path of the file and `SC_INILoader.enabled` to `True`. The values
+    from `[DEFAULT]` section are top-level settings, while the other sections
+    are treated as nested tables (so, `foo` in section `[bar]` is loaded as
+    `bar__foo`). As usual with INI files, all values are strings and the
+    values from `[DEFAULT]` are also visible in all other sections.
+    """
+
+    enabled = False
+
+    @classmethod
+    def parse(cls, content: bytes) -> dict[str, Any]:
+        """
+        Return settings parsed from the file's `content`.
+        """
+        parser = ConfigParser(interpolation=None)
+        parser.optionxform = str  # type: ignore
+        parser.read_string(content.decode("utf-8"))
+        result: dict[str, Any] = dict(parser.defaults())
+        for section in parser.sections():
+            result[section] = dict(parser.items(section))
+        return result
@@ -0,0 +1,26 @@
+"""
+Loader that grabs settings from a JSON file.
+"""
+
+import json
+from typing import Any
+
+from .base import SC_LoaderFromFile
+
+
+class SC_JSONLoader(SC_LoaderFromFile):
+    """
+    Loader that grabs settings from a JSON file.
+
+    The loader is disabled by default. To use it, set `SC_JSONLoader.path` to
+    the path of the file and `SC_JSONLoader.enabled` to `True`.
+    """
+
+    enabled = False
+
+    @classmethod
+    def parse(cls, content: bytes) -> dict[str, Any]:
+        """
+        Return settings parsed from the file's `content`.
+        """
+        return json.loads(content)
@@ -0,0 +1,270 @@
+"""
+Loader that grabs settings from a Redis-compatible key-value store.
+"""
+
+import threading
+from typing import Any, Optional
+from urllib.parse import unquote, urlsplit
+
+from .base import SC_LoaderBase
+
+
+class _SC_RESPError(ConnectionError):
+    """
+    Error reply sent by the server.
+    """
+
+
+class _SC_RESPConnection:
+    """
+    A minimal client connection speaking the Redis serialisation protocol.
+    """
+
+    def __init__(self, host: str, port: int, timeout: float) -> None:
+        # Imported here, as it's not needed while the loader is disabled.
+        import socket
+        self.sock = socket.create_connection((host, port), timeout=timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+
+    @staticmethod
+    def encode(*args: Any) -> bytes:
+        """
+        Return a command (given by its arguments) encoded as a RESP array.
+        """
+        parts = [b"*%d\r\n" % len(args)]
+        for arg in args:
+            if not isinstance(arg, bytes):
+                arg = str(arg).encode("utf-8")
+            parts.append(b"$%d\r\n%s\r\n" % (len(arg), arg))
+        return b"".join(parts)
+
+    def read_reply(self) -> Any:
+        """
+        Read and return one reply.
+
+        :raise _SC_RESPError: Raised if the reply is an error.
+        :raise ConnectionError: Raised if the connection was closed.
+        """
+        line = self.reader.readline()
+        if not line.endswith(b"\r\n"):
+            raise ConnectionError("connection closed by the server")
+        kind, data = line[:1], line[1:-2]
+        if kind == b"+":
+            return data.decode("utf-8")
+        if kind == b"-":
+            raise _SC_RESPError(data.decode("utf-8", "replace"))
+        if kind == b":":
+            return int(data)
+        if kind == b"$":
+            size = int(data)
+            if size < 0:
+                return None
+            value = self.reader.read(size + 2)
+            if len(value) != size + 2:
+                raise ConnectionError("connection closed by the server")
+            return value[:-2]
+        if kind == b"*":
+            size = int(data)
+            if size < 0:
+                return None
+            return [self.read_reply() for _ in range(size)]
+        raise ConnectionError(f"unexpected reply: {line!r}")
+
+    def execute(self, *commands: tuple[Any, ...]) -> list[Any]:
+        """
+        Send all `commands` at once and return their replies.
+        """
+        self.sock.sendall(
+            b"".join(self.encode(*command) for command in commands),
+        )
+        # Read all the replies, even if some are errors, so that the
+        # connection stays usable.
+        replies: list[Any] = list()
+        error = None
+        for _ in commands:
+            try:
+                replies.append(self.read_reply())
+            except _SC_RESPError as e:
+                if error is None:
+                    error = e
+                replies.append(None)
+        if error is not None:
+            raise error
+        return replies
+
+    def close(self) -> None:
+        self.reader.close()
+        self.sock.close()
+
+
+class SC_RedisLoader(SC_LoaderBase):
+    """
+    Loader that grabs settings from a Redis-compatible key-value store.
+
+    Each setting is stored as a string under the key `<key_prefix><name>`,
+    where the name includes the prefix and the scope, and all the requested
+    settings are fetched with a single `MGET` (or, for many settings, several
+    of them sent in one pipeline). The protocol is implemented by the loader
+    itself, so no client library is needed.
+
+    The loader is disabled by default. To use it, enable it and set its `url`
+    (`redis://[[username]:password@]host[:port][/db]`).
+    """
+
+    enabled = False
+
+    # The URL of the server. If `None`, the loader provides no settings.
+    url: Optional[str] = None
+
+    # A prefix added to all keys (for example, `"settings:"`).
+    key_prefix: str = ""
+
+    # If `True`, values are returned as `bytes`; otherwise, they are decoded
+    # as UTF-8 strings.
+    binary: bool = False
+
+    # The maximum number of keys in one `MGET` command.
+    batch_size: int = 512
+
+    # Socket timeout (in seconds) of each connection.
+    request_timeout: float = 10.0
+
+    # The maximum number of idle connections kept for reuse.
+    pool_size: int = 4
+
+    # Idle connections by URL.
+    _pools: dict[str, list[_SC_RESPConnection]] = dict()
+    _pools_lock = threading.Lock()
+
+    @classmethod
+    def _connect(cls, url: str) -> _SC_RESPConnection:
+        """
+        Return a new connection to the server at `url`.
+        """
+        parts = urlsplit(url)
+        if parts.scheme != "redis":
+            raise ValueError(f"unsupported URL scheme: {parts.scheme}")
+        conn = _SC_RESPConnection(
+            parts.hostname or "localhost", parts.port or 6379,
+            cls.request_timeout,
+        )
+        commands: list[tuple[Any, ...]] = list()
+        if parts.password is not None:
+            password = unquote(parts.password)
+            if parts.username:
+                commands.append(("AUTH", unquote(parts.username), password))
+            else:
+                commands.append(("AUTH", password))
+        db = parts.path.strip("/")
+        if db:
+            commands.append(("SELECT", int(db)))
+        if commands:
+            try:
+                conn.execute(*commands)
+            except BaseException:
+                conn.close()
+                raise
+        return conn
+
+    @classmethod
+    def _get_connection(cls, url: str) -> tuple[_SC_RESPConnection, bool]:
+        """
+        Return a connection to `url` and whether it is a reused one.
+        """
+        with cls._pools_lock:
+            pool = cls._pools.get(url)
+            if pool:
+                return pool.pop(), True
+        return cls._connect(url), False
+
+    @classmethod
+    def _release_connection(cls, url: str, conn: _SC_RESPConnection) -> None:
+        """
+        Return `conn` to the pool (or close it if the pool is full).
+        """
+        with cls._pools_lock:
+            pool = cls._pools.setdefault(url, list())
+            if len(pool) < cls.pool_size:
+                pool.append(conn)
+                return
+        conn.close()
+
+    @classmethod
+    def close_connections(cls) -> None:
+        """
+        Close all idle connections.
+        """
+        with cls._pools_lock:
+            pools = list(cls._pools.values())
+            cls._pools.clear()
+        for pool in pools:
+            for conn in pool:
+                conn.close()
+
+    @classmethod
+    def _execute(cls, url: str, *commands: tuple[Any, ...]) -> list[Any]:
+        """
+        Run `commands` in one pipeline and return their replies.
+
+        Pipelines that fail on a reused connection (which the server might
+        have closed in the meantime) are retried on another one.
+        """
+        while True:
+            conn, reused = cls._get_connection(url)
+            try:
+                replies = conn.execute(*commands)
+            except _SC_RESPError:
+                cls._release_connection(url, conn)
+                raise
+            except OSError as e:
+                conn.close()
+                if reused and not isinstance(e, TimeoutError):
+                    continue
+                raise
+            except BaseException:
+                conn.close()
+                raise
+            cls._release_connection(url, conn)
+            return replies
+
+    @classmethod
+    def get_source_key(cls, prefix: str, name: str) -> str:
+        """
+        Return the key under which this loader looks up the setting `name`.
+        """
+        return f"{cls.key_prefix}{super().get_source_key(prefix, name)}"
+
+    @classmethod
+    def load_settings(
+        cls, prefix: str, settings_names: list[str],
+    ) -> tuple[dict[str, Any], bool]:
+        """
+        Return the relevant settings values in a dictionary.
+
+        :param prefix: A prefix to be added to each name.
+        :param settings_names: A list of string names to of the variables to
+            load.
+        :return: A tuple containing
+            1. relevant settings values in a dictionary; and
+            2. a Boolean describing the success of the loading (success here
+               means that at least one value was found and loaded).
+        """
+        url = cls.url
+        if url is None or not settings_names:
+            return dict(), False
+        keys = [
+            f"{cls.key_prefix}{prefix}{cls._get_source_name(name)}"
+            for name in settings_names
+        ]
+        batch_size = max(cls.batch_size, 1)
+        replies = cls._execute(url, *(
+            ("MGET", *keys[start:start + batch_size])
+            for start in range(0, len(keys), batch_size)
+        ))
+        result = dict()
+        values = (value for reply in replies for value in reply)
+        for name, value in zip(settings_names, values):
+            if value is not None:
+                result[name] = value if cls.binary else value.decode("utf-8")
+        return result, bool(result)
@@ -0,0 +1,129 @@
+"""
+Loader that grabs settings from a directory of files (one file per secret).
+"""
+
+import os
+import stat
+from typing import Any, Type
+
+from .base import SC_LoaderFromDict
+
+
+class _SC_SecretsSource:
+    """
+    Read-only dictionary-like view of the files in a secrets directory.
+
+    The files are read only when they are requested and then again only if
+    their inode, modification time, or size change.
+    """
+
+    def __init__(self, loader: Type["SC_SecretsLoader"], path: str) -> None:
+        self.loader = loader
+        self.path = path
+
+    def __getitem__(self, name: str) -> Any:
+        if (
+            not name
+            or name.startswith(".")
+            or os.sep in name
+            or (os.altsep is not None and os.altsep in name)
+        ):
+            raise KeyError(name)
+        path = os.path.join(self.path, name)
+        try:
+            file_stat = os.stat(path)
+        except (FileNotFoundError, NotADirectoryError):
+            raise KeyError(name) from None
+        if not stat.S_ISREG(file_stat.st_mode):
+            raise KeyError(name)
+        cache_key = (
+            file_stat.st_ino, file_stat.st_mtime_ns, file_stat.st_size,
+        )
+        cache = self.loader._cache
+        try:
+            cached_key, value = cache[path]
+        except KeyError:
+            pass
+        else:
+            if cached_key == cache_key:
+                return value
+        value = self.loader._read(path)
+        cache[path] = (cache_key, value)
+        return value
+
+
+class SC_SecretsLoader(SC_LoaderFromDict):
+    """
+    Loader that grabs settings from a directory of files.
+
+    This is how Docker and Kubernetes provide secrets: each one is a file,
+    with its name being the setting's name and its content being the value.
+    The loader is disabled by default.
+    """
+
+    no_settings_exceptions = (ImportError, FileNotFoundError)
+    enabled = False
+
+    # The directory with secrets' files.
+    path: str = "/run/secrets"
+
+    # If `True`, values are returned as `bytes`; otherwise, they are decoded
+    # as UTF-8 strings.
+    binary: bool = False
+
+    # Remove one trailing newline from each value (many tools add it when
+    # creating secrets).
+    strip_newline: bool = True
+
+    # Cached values by paths of their files, with the key they are valid for.
+    _cache: dict[str, tuple[tuple[int, int, int], Any]] = dict()
+
+    @classmethod
+    def _decode(cls, data: bytes) -> Any:
+        """
+        Return the value from the file's raw `data`.
+        """
+        end = len(data)
+        if cls.strip_newline and data.endswith(b"\n"):
+            end -= 2 if data.endswith(b"\r\n") else 1
+        if cls.binary:
+            # Slicing copies the data, so it's done only if something's cut.
+            return data if end == len(data) else data[:end]
+        with memoryview(data)[:end] as value:
+            return str(value, "utf-8")
+
+    @classmethod
+    def _read(cls, path: str) -> Any:
+        """
+        Return the value stored in the file `path`.
+        """
+        with open(path, "rb") as f:
+            return cls._decode(f.read())
+
+    @classmethod
+    def get_watched_paths(cls) -> list[str]:
+        """
+        Return paths of files and directories that hold this loader's settings.
+
+        These are the secrets' directory and the files that were already read
+        from it (the directory changes when files are added, removed, or
+        replaced with the atomic swaps used by Kubernetes).
+        """
+        dir_prefix = os.path.join(cls.path, "")
+        return [
+            cls.path,
+            *sorted(
+                path for path in list(cls._cache)
+                if path.startswith(dir_prefix)
+            ),
+        ]
+
+    @classmethod
+    def get_source(cls) -> Any:
+        """
+        Return dictionary-like object with settings.
+        """
+        path = cls.path
+        if not os.path.isdir(path):
+            raise FileNotFoundError(f"secrets directory {path} not found")
+        return _SC_SecretsSource(cls, path)
@@ -0,0 +1,52 @@
+"""
+Loader that grabs settings from a snapshot in shared memory.
+"""
+
+from typing import Any, Optional, TYPE_CHECKING
+
+from .base import SC_LoaderFromSnapshot
+
+if TYPE_CHECKING:  # pragma: no cover
+    from ..shared import SC_SharedStore
+
+
+class SC_SharedMemoryLoader(SC_LoaderFromSnapshot):
+    """
+    Loader that grabs settings from a snapshot in shared memory.
+
+    This loader is disabled until some `SC_SharedStore` is installed (see
+    `SC_SharedStore.install`). Its priority is the highest, so the snapshot is
+    used instead of all other loaders for the settings included in it.
+    """
+
+    priority = 171929
+    enabled = False
+
+    # The store that holds the snapshot.
+    store: Optional["SC_SharedStore"] = None
+
+    @classmethod
+    def _get_store(cls) -> "SC_SharedStore":
+        """
+        Return the installed store.
+
+        :raise ImportError: Raised if no store is installed.
+        """
+        store = cls.store
+        if store is None:
+            raise ImportError("no shared settings store is installed")
+        return store
+
+    @classmethod
+    def get_snapshot(cls) -> Any:
+        """
+        Return dictionary with the snapshot's settings.
+        """
+        return cls._get_store().get_snapshot()
+
+    @classmethod
+    def is_in_snapshot(cls, name: str) -> bool:
+        """
+        Return `True` if the setting `name` (with the prefix) was published.
+        """
+        return cls._get_store().is_published(name)
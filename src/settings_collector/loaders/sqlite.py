@@ -0,0 +1,279 @@
+"""
+Loader that grabs settings from a SQLite database.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Any, Iterable, Mapping, Optional, TYPE_CHECKING
+from urllib.parse import quote
+
+from .base import SC_LoaderBase
+
+if TYPE_CHECKING:  # pragma: no cover
+    import sqlite3
+
+
+class _SC_SQLiteState(threading.local):
+    """
+    Connection and cached values of one thread.
+    """
+
+    def __init__(self) -> None:
+        self.conn: Optional[sqlite3.Connection] = None
+        self.key: Optional[tuple[str, str]] = None
+        self.data_version: Optional[int] = None
+        # Cached values by keys (`_missing` for the keys that are not in the
+        # table).
+        self.values: dict[str, Any] = dict()
+
+
+_missing = object()
+
+
+class SC_SQLiteLoader(SC_LoaderBase):
+    """
+    Loader that grabs settings from a table in a SQLite database.
+
+    The table has two columns: `key` (the primary key) holds the setting's
+    name (with the prefix and the scope, e.g., `"prefix1__scope1__foo"`) and
+    `value` holds its value (of any type that SQLite supports). The values can
+    be stored with `set_values` or by any other program.
+
+    Each thread uses its own connection. The values are cached and read again
+    only after the database was changed (which is checked with the cheap
+    `PRAGMA data_version`), so even the settings with `no_cache=True` don't
+    cause a query on every read.
+
+    The loader is disabled by default. To use it, enable it and set its
+    `path`.
+    """
+
+    no_settings_exceptions = (ImportError, FileNotFoundError)
+    enabled = False
+
+    # Path to the database file. If not set (or the file doesn't exist), the
+    # loader provides no settings.
+    path: Optional[str] = None
+
+    # The name of the table with settings.
+    table: str = "settings"
+
+    # If more settings than this are loaded at once (for example, by a greedy
+    # load of a whole scope), they are fetched with one range scan of the
+    # primary key's index by their common prefix, instead of one indexed
+    # lookup per setting.
+    range_scan_threshold: int = 8
+
+    _state = _SC_SQLiteState()
+
+    @classmethod
+    def _quote_table(cls) -> str:
+        """
+        Return the table's name quoted for use in SQL statements.
+        """
+        table = cls.table.replace('"', '""')
+        return f'"{table}"'
+
+    @classmethod
+    def _get_state(cls) -> _SC_SQLiteState:
+        """
+        Return this thread's state with a connection to the database.
+
+        The cached values are dropped if the database has changed since they
+        were read.
+        """
+        path = cls.path
+        if path is None:
+            raise FileNotFoundError(f"{cls.__name__}.path is not set")
+        state = cls._state
+        key = (path, cls.table)
+        if state.conn is None or state.key != key:
+            cls.close()
+            if not os.path.exists(path):
+                raise FileNotFoundError(f"database {path} not found")
+            # Imported here, as it's not needed while the loader is disabled.
+            import sqlite3
+            state.conn = sqlite3.connect(
+                f"file:{quote(os.path.abspath(path))}?mode=rw", uri=True,
+                isolation_level=None,
+            )
+            state.key = key
+        data_version = state.conn.execute("PRAGMA data_version").fetchone()[0]
+        if data_version != state.data_version:
+            state.values.clear()
+            state.data_version = data_version
+        return state
+
+    @classmethod
+    def close(cls) -> None:
+        """
+        Close this thread's connection.
+        """
+        state = cls._state
+        if state.conn is not None:
+            state.conn.close()
+        state.conn = None
+        state.key = None
+        state.data_version = None
+        state.values.clear()
+
+    @classmethod
+    def has_changed(cls) -> bool:
+        """
+        Return `True` if the database has changed since it was last read.
+
+        This checks only the changes made by other connections (including
+        those in other threads and processes).
+        """
+        state = cls._state
+        if state.conn is None:
+            return False
+        old_version = state.data_version
+        return cls._get_state().data_version != old_version
+
+    @classmethod
+    def refresh(cls) -> bool:
+        """
+        Clear caches of the settings collectors using this loader if needed.
+
+        :return: `True` if the database has changed since it was last read.
+        """
+        from ..manager import SC_LoadersManager
+        if cls.has_changed():
+            SC_LoadersManager.clear_loader_caches(cls)
+            return True
+        return False
+
+    @classmethod
+    def get_watched_paths(cls) -> list[str]:
+        """
+        Return paths of files and directories that hold this loader's settings.
+        """
+        if cls.path is None:
+            return list()
+        return [cls.path, f"{cls.path}-wal"]
+
+    @classmethod
+    def _fetch(cls, state: _SC_SQLiteState, keys: list[str]) -> None:
+        """
+        Read the values of `keys` into `state.values`.
+        """
+        conn = state.conn
+        assert conn is not None
+        table = cls._quote_table()
+        if len(keys) > cls.range_scan_threshold:
+            prefix = os.path.commonprefix(keys)
+            if prefix:
+                # The smallest string greater than all those that start with
+                # `prefix`.
+                end = f"{prefix[:-1]}{chr(ord(prefix[-1]) + 1)}"
+                rows = conn.execute(
+                    f"SELECT key, value FROM {table}"
+                    f" WHERE key >= ? AND key < ?",
+                    (prefix, end),
+                )
+            else:
+                rows = conn.execute(f"SELECT key, value FROM {table}")
+            wanted = set(keys)
+            for key, value in rows:
+                if key in wanted:
+                    state.values[key] = value
+        else:
+            statement = f"SELECT value FROM {table} WHERE key = ?"
+            for key in keys:
+                row = conn.execute(statement, (key,)).fetchone()
+                if row is not None:
+                    state.values[key] = row[0]
+        for key in keys:
+            state.values.setdefault(key, _missing)
+
+    @classmethod
+    def load_settings(
+        cls, prefix: str, settings_names: list[str],
+    ) -> tuple[dict[str, Any], bool]:
+        """
+        Return the relevant settings values in a dictionary.
+
+        :param prefix: A prefix to be added to each name.
+        :param settings_names: A list of string names to of the variables to
+            load.
+        :return: A tuple containing
+            1. relevant settings values in a dictionary; and
+            2. a Boolean describing the success of the loading (success here
+               means that at least one value was found and loaded).
+        """
+        import sqlite3
+        state = cls._get_state()
+        keys = [
+            f"{prefix}{cls._get_source_name(name)}" for name in settings_names
+        ]
+        uncached = [key for key in keys if key not in state.values]
+        if uncached:
+            try:
+                cls._fetch(state, uncached)
+            except sqlite3.OperationalError as e:
+                if str(e).startswith("no such table"):
+                    return dict(), False
+                raise
+        result = dict()
+        for name, key in zip(settings_names, keys):
+            value = state.values[key]
+            if value is not _missing:
+                result[name] = value
+        return result, bool(result)
+
+    @classmethod
+    def _connect_for_writing(cls) -> sqlite3.Connection:
+        """
+        Return a new connection to the database, creating it if needed.
+        """
+        path = cls.path
+        if path is None:
+            raise FileNotFoundError(f"{cls.__name__}.path is not set")
+        import sqlite3
+        conn = sqlite3.connect(path, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            f"CREATE TABLE IF NOT EXISTS {cls._quote_table()}"
+            f" (key TEXT PRIMARY KEY, value) WITHOUT ROWID",
+        )
+        return conn
+
+    @classmethod
+    def set_values(cls, values: Mapping[str, Any]) -> None:
+        """
+        Store `values` in the database (creating it and the table if needed).
+
+        :param values: A dictionary associating keys (i.e., settings' names
+            with the prefix and the scope) with their values.
+        """
+        conn = cls._connect_for_writing()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    f"INSERT INTO {cls._quote_table()} (key, value)"
+                    f" VALUES (?, ?)"
+                    f" ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+                    values.items(),
+                )
+        finally:
+            conn.close()
+
+    @classmethod
+    def delete_values(cls, keys: Iterable[str]) -> None:
+        """
+        Remove the values with the given `keys` from the database.
+        """
+        conn = cls._connect_for_writing()
+        try:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                conn.executemany(
+                    f"DELETE FROM {cls._quote_table()} WHERE key = ?",
+                    ((key,) for key in keys),
+                )
+        finally:
+            conn.close()
@@ -0,0 +1,30 @@
+"""
+Loader that grabs settings from a TOML file.
+"""
+
+from typing import Any
+
+from .base import SC_LoaderFromFile
+
+
+class SC_TOMLLoader(SC_LoaderFromFile):
+    """
+    Loader that grabs settings from a TOML file.
+
+    The loader is disabled by default. To use it, set `SC_TOMLLoader.path` to
+    the path of the file and `SC_TOMLLoader.enabled` to `True`. This requires
+    Python 3.11+ (for `tomllib`) or `tomli` package.
+    """
+
+    enabled = False
+
+    @classmethod
+    def parse(cls, content: bytes) -> dict[str, Any]:
+        """
+        Return settings parsed from the file's `content`.
+        """
+        try:
+            import tomllib
+        except ImportError:  # pragma: no cover
+            import tomli as tomllib  # type: ignore
+        return tomllib.loads(content.decode("utf-8"))
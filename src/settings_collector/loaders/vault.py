@@ -0,0 +1,302 @@
+"""
+Loader that grabs settings from a Vault-style secret store.
+"""
+
+import json
+import threading
+from time import monotonic
+from typing import Any, Optional
+from urllib.parse import quote, urlsplit
+
+from .http import SC_HTTPLoader
+from ..manager import SC_LoadersManager
+
+
+_missing = object()
+
+
+class _SC_Lease:
+    """
+    A secret's value with its lease.
+    """
+
+    def __init__(
+        self,
+        value: Any,
+        duration: float,
+        renew_fraction: float,
+        lease_id: Optional[str] = None,
+        renewable: bool = False,
+    ) -> None:
+        self.value = value
+        self.lease_id = lease_id
+        self.renewable = renewable
+        # Prefixes and names with which the secret was loaded.
+        self.consumers: set[tuple[str, str]] = set()
+        self.extend(duration, renew_fraction)
+
+    def extend(self, duration: float, renew_fraction: float) -> None:
+        """
+        Set the lease to expire `duration` seconds from now.
+        """
+        now = monotonic()
+        self.expires = now + duration
+        self.renew_at = now + duration * renew_fraction
+
+
+class SC_VaultLoader(SC_HTTPLoader):
+    """
+    Loader that grabs settings from a Vault-style secret store.
+
+    Each setting is a secret at `<url>/v1/<mount>/<name>`, where the name
+    includes the prefix and the scope, with the value in its `field`. Both
+    KV version 1 and 2 responses are supported.
+
+    The secrets come with leases. Each secret is cached until its lease
+    expires and it is renewed in a background thread shortly before that
+    (after `renew_fraction` of the lease's duration), so reading the settings
+    never waits on the secret store (except for the first read of each
+    secret). If a renewed secret has a different value (for example, because
+    it was rotated), the cached values of only the settings using it are
+    cleared.
+
+    The loader is disabled by default. To use it, enable it and set its `url`
+    and `token`.
+    """
+
+    # The address of the secret store (e.g., `"https://vault:8200"`). If
+    # `None`, the loader provides no settings.
+    url: Optional[str] = None
+
+    # The token sent in the `X-Vault-Token` header.
+    token: Optional[str] = None
+
+    # The path under which the secrets are mounted.
+    mount: str = "secret"
+
+    # The field of each secret that holds the setting's value. If `None`, the
+    # whole secret's data (a dictionary) is the value.
+    field: Optional[str] = "value"
+
+    # The duration (in seconds) used for the secrets that come without a
+    # lease (and for caching the fact that a secret does not exist, which is
+    # not renewed, but read again when it's next needed after this time).
+    default_lease_duration: float = 300.0
+
+    # The part of a lease's duration after which it is renewed.
+    renew_fraction: float = 0.8
+
+    # The delay (in seconds) before retrying a failed renewal.
+    retry_interval: float = 5.0
+
+    # Cached secrets by their keys.
+    _leases: dict[str, _SC_Lease] = dict()
+    _leases_condition = threading.Condition()
+    _renewer: Optional[threading.Thread] = None
+    _stopping = False
+
+    @classmethod
+    def _vault_request(
+        cls, method: str, path: str, data: Optional[dict[str, Any]] = None,
+    ) -> tuple[int, dict[str, Any]]:
+        """
+        Send a request to the secret store and return its status and data.
+        """
+        assert cls.url is not None
+        parts = urlsplit(cls.url)
+        headers = {"Accept": "application/json", **cls.headers}
+        if cls.token is not None:
+            headers["X-Vault-Token"] = cls.token
+        body = None
+        if data is not None:
+            body = json.dumps(data).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+        status, _, response = cls._request(
+            parts.scheme, parts.netloc,
+            f"{parts.path.rstrip('/')}/v1/{path}", headers, method, body,
+        )
+        if status == 404:
+            return status, dict()
+        if status != 200:
+            raise ConnectionError(
+                f"{cls.url} responded with status {status}",
+            )
+        return status, json.loads(response)
+
+    @classmethod
+    def _read_secret(cls, key: str) -> _SC_Lease:
+        """
+        Read the secret `key` from the store.
+        """
+        mount = cls.mount.strip("/")
+        status, response = cls._vault_request(
+            "GET", f"{mount}/{quote(key, safe='')}",
+        )
+        if status == 404:
+            return _SC_Lease(
+                _missing, cls.default_lease_duration, cls.renew_fraction,
+            )
+        data = response.get("data") or dict()
+        if isinstance(data.get("data"), dict) and "metadata" in data:
+            # KV version 2.
+            data = data["data"]
+        if cls.field is None:
+            value = data
+        else:
+            value = data.get(cls.field, _missing)
+        return _SC_Lease(
+            value,
+            response.get("lease_duration") or cls.default_lease_duration,
+            cls.renew_fraction,
+            response.get("lease_id") or None,
+            bool(response.get("renewable")),
+        )
+
+    @classmethod
+    def _renew(cls, key: str, lease: _SC_Lease) -> None:
+        """
+        Renew `lease` of the secret `key` (or read the secret again).
+
+        The lease is dropped instead if none of the settings that were loaded
+        from it are used anymore.
+        """
+        with cls._leases_condition:
+            consumers = tuple(lease.consumers)
+        unused = {
+            (prefix, name)
+            for prefix, name in consumers
+            if not SC_LoadersManager.is_loader_setting_used(cls, prefix, name)
+        }
+        if unused:
+            with cls._leases_condition:
+                lease.consumers.difference_update(unused)
+                if not lease.consumers:
+                    if cls._leases.get(key) is lease:
+                        del cls._leases[key]
+                    return
+        if lease.renewable and lease.lease_id:
+            _, response = cls._vault_request(
+                "PUT", "sys/leases/renew", {"lease_id": lease.lease_id},
+            )
+            duration = response.get("lease_duration")
+            if duration:
+                lease.extend(duration, cls.renew_fraction)
+                return
+        new_lease = cls._read_secret(key)
+        with cls._leases_condition:
+            new_lease.consumers = lease.consumers
+            cls._leases[key] = new_lease
+            # The readers add to the set while holding the lock.
+            consumers = tuple(lease.consumers)
+        if new_lease.value != lease.value:
+            changed: dict[str, list[str]] = dict()
+            for prefix, name in consumers:
+                changed.setdefault(prefix, list()).append(name)
+            for prefix, names in changed.items():
+                SC_LoadersManager.invalidate_loader_settings(
+                    cls, prefix, names,
+                )
+
+    @classmethod
+    def _run_renewals(cls) -> None:
+        """
+        Renew the leases as they come due (run in a background thread).
+        """
+        while True:
+            with cls._leases_condition:
+                if cls._stopping:
+                    return
+                now = monotonic()
+                due = list()
+                next_renewal: Optional[float] = None
+                for key, lease in list(cls._leases.items()):
+                    if lease.value is _missing:
+                        # The secrets that don't exist are not renewed, but
+                        # only dropped once they expire.
+                        if lease.expires <= now:
+                            del cls._leases[key]
+                            continue
+                        renew_at = lease.expires
+                    elif lease.renew_at <= now:
+                        due.append((key, lease))
+                        continue
+                    else:
+                        renew_at = lease.renew_at
+                    if next_renewal is None or renew_at < next_renewal:
+                        next_renewal = renew_at
+                if not due:
+                    cls._leases_condition.wait(
+                        None if next_renewal is None else next_renewal - now,
+                    )
+                    continue
+            for key, lease in due:
+                try:
+                    cls._renew(key, lease)
+                except Exception:
+                    # Keep using the current value until its lease expires.
+                    lease.renew_at = monotonic() + cls.retry_interval
+
+    @classmethod
+    def _start_renewals(cls) -> None:
+        """
+        Start the background thread renewing the leases (if not running).
+        """
+        if cls._renewer is None or not cls._renewer.is_alive():
+            cls._stopping = False
+            cls._renewer = threading.Thread(
+                target=cls._run_renewals,
+                name=f"settings_collector_{cls.__name__}", daemon=True,
+            )
+            cls._renewer.start()
+        else:
+            cls._leases_condition.notify()
+
+    @classmethod
+    def stop_renewals(cls) -> None:
+        """
+        Stop the background thread renewing the leases.
+        """
+        with cls._leases_condition:
+            cls._stopping = True
+            cls._leases_condition.notify()
+            renewer = cls._renewer
+            cls._renewer = None
+        if renewer is not None and renewer is not threading.current_thread():
+            renewer.join()
+
+    @classmethod
+    def load_settings(
+        cls, prefix: str, settings_names: list[str],
+    ) -> tuple[dict[str, Any], bool]:
+        """
+        Return the relevant settings values in a dictionary.
+
+        :param prefix: A prefix to be added to each name.
+        :param settings_names: A list of string names to of the variables to
+            load.
+        :return: A tuple containing
+            1. relevant settings values in a dictionary; and
+            2. a Boolean describing the success of the loading (success here
+               means that at least one value was found and loaded).
+        """
+        if cls.url is None or not settings_names:
+            return dict(), False
+        result = dict()
+        now = monotonic()
+        for name in settings_names:
+            key = f"{prefix}{cls._get_source_name(name)}"
+            lease = cls._leases.get(key)
+            if lease is None or lease.expires <= now:
+                new_lease = cls._read_secret(key)
+                with cls._leases_condition:
+                    if lease is not None:
+                        new_lease.consumers = lease.consumers
+                    lease = cls._leases[key] = new_lease
+                    cls._start_renewals()
+            consumer = (prefix, name)
+            if consumer not in lease.consumers:
+                with cls._leases_condition:
+                    lease.consumers.add(consumer)
+            if lease.value is not _missing:
+                result[name] = lease.value
+        return result, bool(result)
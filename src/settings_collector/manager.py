@@ -4,15 +4,41 @@ A class to register and manage all loaders.
 
 from __future__ import annotations
 
-from typing import Type, Optional, Iterable, Dict, Any, TYPE_CHECKING
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+import sys
+import threading
+from time import perf_counter
+from typing import (
+    Type, Optional, Iterable, Iterator, Dict, Any, FrozenSet, List, Tuple,
+    TYPE_CHECKING,
+)
+from weakref import WeakSet
 
 from .exceptions import SC_ConfigError, SC_NotALoader
+from .metrics import sc_metrics_record_loader_call
 
 if TYPE_CHECKING:  # pragma: no cover
+    from concurrent.futures import ThreadPoolExecutor
     from .collector import SettingsCollector
     from .loaders.base import SC_LoaderBase
 
 
+# Sources fetched in the current load cycle (`None` outside of load cycles),
+# with the exceptions that their loaders raised instead of returning them.
+_sc_load_cycle: ContextVar[
+    Optional[Dict[Type[Any], Tuple[Any, Optional[Exception]]]]
+] = ContextVar("sc_load_cycle", default=None)
+
+
+# Set while a snapshot of loaded settings is being taken (see
+# `SC_LoadersManager.take_snapshot`), so that the loaders serving snapshots
+# don't serve the old ones instead.
+_sc_taking_snapshot: ContextVar[bool] = ContextVar(
+    "sc_taking_snapshot", default=False,
+)
+
+
 class SC_LoadersManager:
     """
     A class to register and manage all loaders.
@@ -20,7 +46,29 @@ class SC_LoadersManager:
 
     loader_name_prefix: str = "SC_"
     loader_name_suffix: str = "Loader"
+    # The group of package entry points used to advertise third-party loaders.
+    # Each entry point's name is the loader's name and its value points to the
+    # loader class (for example, `MyFramework = "pkg.sc:SC_MyFrameworkLoader"`).
+    entry_points_group: str = "settings_collector.loaders"
     _loaders: Dict[str, Type[SC_LoaderBase]] = dict()
+    # Entry points that were discovered, but not yet loaded (`None` until the
+    # discovery runs for the first time).
+    _entry_points: Optional[Dict[str, Any]] = None
+    # Root settings collectors that have used each loader (i.e., those whose
+    # caches might hold values that came from it).
+    _consumers: Dict[Type[SC_LoaderBase], WeakSet] = dict()
+    # Loaders that partition their sources (see
+    # `SC_LoaderBase.get_partition_key`).
+    _partitioned_loaders: Dict[str, Type[SC_LoaderBase]] = dict()
+    # The modules that some partitioned loaders need (see
+    # `SC_LoaderBase.partition_module`) and whether there are any partitioned
+    # loaders that don't need one.
+    _partition_modules: FrozenSet[str] = frozenset()
+    _unconditional_partitions: bool = False
+    # Thread pools for loading settings in parallel, keyed by their sizes
+    # (see `load_workers` in `SettingsCollector`'s config).
+    _executors: Dict[int, ThreadPoolExecutor] = dict()
+    _executors_lock = threading.Lock()
     last_successful_loader: Optional[Type[SC_LoaderBase]] = None
 
     @classmethod
@@ -64,6 +112,104 @@ class SC_LoadersManager:
             pass
         else:
             cls._loaders[loader_name] = loader_class
+            if loader_class.is_partitioned():
+                cls._partitioned_loaders[loader_name] = loader_class
+            else:
+                cls._partitioned_loaders.pop(loader_name, None)
+            cls._partition_modules = frozenset(
+                loader_class.partition_module
+                for loader_class in cls._partitioned_loaders.values()
+                if loader_class.partition_module is not None
+            )
+            cls._unconditional_partitions = any(
+                loader_class.partition_module is None
+                for loader_class in cls._partitioned_loaders.values()
+            )
+
+    @classmethod
+    def get_partition(cls) -> Optional[Tuple[Any, ...]]:
+        """
+        Return the objects that identify the currently active sources.
+
+        :return: A tuple of partition keys of all enabled loaders that
+            partition their sources and currently have an active one (for
+            example, the Flask app in whose context the code runs), or `None`
+            if there are no such loaders.
+        """
+        # This runs on every read of a cached value, so the loaders are not
+        # even asked for their keys before their frameworks are imported.
+        modules = sys.modules
+        if (
+            not cls._unconditional_partitions
+            and modules.keys().isdisjoint(cls._partition_modules)
+        ):
+            return None
+        result = None
+        for loader_class in cls._partitioned_loaders.values():
+            if loader_class.enabled and (
+                loader_class.partition_module is None
+                or loader_class.partition_module in modules
+            ):
+                key = loader_class.get_partition_key()
+                if key is not None:
+                    result = (key,) if result is None else result + (key,)
+        return result
+
+    @classmethod
+    def _get_entry_points(cls) -> Dict[str, Any]:
+        """
+        Return entry points of the loaders that were not yet imported.
+
+        The discovery itself only reads packages' metadata and it runs only
+        once, the first time that some loader plan is needed.
+        """
+        if cls._entry_points is None:
+            from importlib.metadata import entry_points
+            cls._entry_points = {
+                entry_point.name: entry_point
+                for entry_point in entry_points(group=cls.entry_points_group)
+                if entry_point.name not in cls._loaders
+            }
+        return cls._entry_points
+
+    @classmethod
+    def _load_entry_points(cls, loaders_names: Iterable[str]) -> None:
+        """
+        Import and register loaders advertised as `loaders_names` entry points.
+
+        Loaders that fail to import (usually because they belong to a
+        framework that is not installed) are silently dropped, just like the
+        built-in loaders are skipped when their framework is missing.
+
+        :raise SC_NotALoader: Raised when an entry point does not point to a
+            loader class.
+        :raise SC_ConfigError: Raised when an entry point's name differs from
+            the name of the loader that it points to.
+        """
+        entry_points = cls._get_entry_points()
+        for loader_name in [
+            loader_name
+            for loader_name in loaders_names
+            if loader_name in entry_points
+        ]:
+            entry_point = entry_points.pop(loader_name)
+            try:
+                loader_class = entry_point.load()
+            except ImportError:
+                continue
+            if not (
+                isinstance(loader_class, type) and cls.is_loader(loader_class)
+            ):
+                raise SC_NotALoader(entry_point.value)
+            # Loaders register themselves when their class is created, but
+            # the class might have been created before `_loaders` was reset
+            # (for example, in tests).
+            cls.register_loader(loader_class)
+            if cls._loaders.get(loader_name) is not loader_class:
+                raise SC_ConfigError(
+                    f"entry point {repr(loader_name)} points to loader"
+                    f" {repr(cls.get_loader_name(loader_class))}",
+                )
 
     @classmethod
     def _get_loaders(
@@ -93,8 +239,12 @@ class SC_LoadersManager:
                 else set()
             )
             if settings_collector.SC_Config.exclude:
-                include_loaders = set(cls._loaders) - include_loaders
-            else:
+                include_loaders = (
+                    set(cls._loaders) | set(cls._get_entry_points())
+                ) - include_loaders
+            # Plugins are imported only when some loader plan includes them.
+            cls._load_entry_points(include_loaders)
+            if not settings_collector.SC_Config.exclude:
                 unknown_loaders = include_loaders - set(cls._loaders)
                 if unknown_loaders and not include_loaders - unknown_loaders:
                     raise SC_ConfigError(
@@ -116,11 +266,45 @@ class SC_LoadersManager:
                 ''' -- Captain Jack Sparrow'''
             )
 
+    @classmethod
+    def _get_routes(
+        cls,
+        settings_collector: Type[SettingsCollector],
+        settings_names: Iterable[str],
+    ) -> Dict[Optional[FrozenSet[str]], List[str]]:
+        """
+        Return settings' names grouped by the loaders that they are routed to.
+
+        :param settings_collector: A `SettingsCollector` (sub)class for which
+            the settings are being loaded.
+        :param settings_names: An iterable of string names of the settings.
+        :return: A dictionary associating sets of loaders' names (or `None`
+            for "all the loaders used by the collector") with lists of names
+            of the settings that are to be looked up only in those loaders.
+        """
+        group_loaders = settings_collector.SC_Config.group_loaders or dict()
+        sc_settings = settings_collector.SC_Settings  # type: ignore
+        result: Dict[Optional[FrozenSet[str]], List[str]] = dict()
+        for name in settings_names:
+            sc_setting = getattr(sc_settings, name, None)
+            if sc_setting is None:
+                route = None
+            elif sc_setting.loaders is not None:
+                route = frozenset(sc_setting.loaders)
+            elif sc_setting.group in group_loaders:
+                route = frozenset(group_loaders[sc_setting.group])
+            else:
+                route = None
+            result.setdefault(route, list()).append(name)
+        return result
+
     @classmethod
     def get_settings(
         cls,
         settings_collector: Type[SettingsCollector],
         settings_names: Optional[Iterable[str]] = None,
+        *,
+        sources: Optional[Dict[str, Type[SC_LoaderBase]]] = None,
     ) -> Dict[str, Any]:
         """
         Load and return settings values as a dictionary.
@@ -129,6 +313,8 @@ class SC_LoadersManager:
             the settings are being loaded.
         :param settings_names: Either `None` (meaning "all settings") or an
             iterable of string names of the settings to load).
+        :param sources: If given, this dictionary is populated with the
+            loaders that provided the values (keyed by settings' names).
         :raise SC_ConfigError: Raised when attempting to use only unknown
             loaders (i.e., none of the `loaders` exist and `settings.exclude`
             is set to `False`). The logic here is that you may settings.exclude
@@ -137,21 +323,430 @@ class SC_LoadersManager:
             include only those loaders not available (in this package or in the
             project using it), then the whole thing becomes useless, and that's
             likely an error in the configuration of the settings collector.
+            The same applies to the loaders to which some settings are routed.
         :return: A dictionary associating settings' names with their values.
         """
-        result = dict()
+        if settings_names is None:
+            settings_names = settings_collector.get_settings_names()
+            if not settings_names:
+                # Without any defined settings, the loaders are asked for all
+                # of theirs.
+                return cls._load_settings(
+                    settings_collector, None, None, sources,
+                )
+        routes = cls._get_routes(settings_collector, settings_names)
+        if len(routes) == 1:
+            route, names = routes.popitem()
+            return cls._load_settings(
+                settings_collector, names, route, sources,
+            )
+        result: Dict[str, Any] = dict()
+        for route, names in routes.items():
+            result.update(
+                cls._load_settings(settings_collector, names, route, sources),
+            )
+        return result
+
+    @classmethod
+    def _load_settings(
+        cls,
+        settings_collector: Type[SettingsCollector],
+        settings_names: Optional[List[str]],
+        route: Optional[FrozenSet[str]] = None,
+        sources: Optional[Dict[str, Type[SC_LoaderBase]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Load and return settings values as a dictionary.
+
+        For arguments, see :py:meth:`get_settings`.
+
+        :param route: A set of names of the loaders to use (if `None`, all the
+            loaders used by `settings_collector` are used).
+        """
+        result: Dict[str, Any] = dict()
+        if settings_names is not None and not settings_names:
+            return result
+        route_loaders = None
+        if route is not None:
+            cls._load_entry_points(route)
+            route_loaders = {
+                cls._loaders[loader_name]
+                for loader_name in route
+                if loader_name in cls._loaders
+            }
+            if not route_loaders:
+                raise SC_ConfigError(
+                    f"attempting to use only unknown loaders:"
+                    f" {', '.join(sorted(route))}",
+                )
         prefix = settings_collector.get_scope_prefix()
         load_all = settings_collector.SC_Config.load_all
-        for settings_loader in cls._get_loaders(
-            settings_collector, reverse=not load_all,
-        ):
-            settings_values = settings_loader.get_settings(
-                prefix, settings_names,
+        root = settings_collector.SC_Data.root  # type: ignore
+        settings_loaders = [
+            settings_loader
+            for settings_loader in cls._get_loaders(
+                settings_collector, reverse=not load_all,
+            )
+            if route_loaders is None or settings_loader in route_loaders
+        ]
+        if load_all:
+            # The loaders are asked in descending priority, but those with the
+            # same priority in the reverse order of their registration (so,
+            # the last registered one wins, just like with updating the values
+            # in ascending priority).
+            settings_loaders.reverse()
+        load_workers = settings_collector.SC_Config.load_workers
+        if load_all and load_workers and len(settings_loaders) > 1:
+            return cls._load_settings_in_parallel(
+                settings_loaders, root, prefix, settings_names, load_workers,
+                sources,
+            )
+        # With `load_all`, each loader is asked only for the names that the
+        # previous ones didn't provide.
+        unresolved = settings_names
+        successful_loader = None
+        for settings_loader in settings_loaders:
+            settings_values = cls._call_loader(
+                settings_loader, root, prefix, unresolved,
             )
             if settings_values is not None:
-                cls.last_successful_loader = settings_loader
-                if load_all:
-                    result.update(settings_values)
-                else:
+                if not load_all:
+                    cls.last_successful_loader = settings_loader
+                    if sources is not None:
+                        sources.update(
+                            (name, settings_loader) for name in settings_values
+                        )
                     return settings_values
+                if successful_loader is None:
+                    successful_loader = settings_loader
+                for name in (
+                    settings_values if unresolved is None else unresolved
+                ):
+                    if name not in result and name in settings_values:
+                        result[name] = settings_values[name]
+                        if sources is not None:
+                            sources[name] = settings_loader
+                if unresolved is not None:
+                    unresolved = [
+                        name for name in unresolved if name not in result
+                    ]
+                    if not unresolved:
+                        break
+        if successful_loader is not None:
+            cls.last_successful_loader = successful_loader
+        return result
+
+    @classmethod
+    def _load_settings_in_parallel(
+        cls,
+        settings_loaders: List[Type[SC_LoaderBase]],
+        root: Type[SettingsCollector],
+        prefix: str,
+        settings_names: Optional[List[str]],
+        load_workers: int,
+        sources: Optional[Dict[str, Type[SC_LoaderBase]]] = None,
+    ) -> Dict[str, Any]:
+        """
+        Load settings from all `settings_loaders` concurrently.
+
+        Each loader is asked for all the settings and runs in a thread pool
+        (in a copy of the current context, so that load cycles and similar
+        work as usual). The results are merged in descending priority of the
+        loaders, just like in sequential loading.
+
+        :param settings_loaders: Loaders to use, in the order of precedence.
+        :param root: The root of the settings collector being loaded.
+        :param load_workers: The maximum number of threads in the pool.
+        """
+        executor = cls._get_executor(load_workers)
+        futures = [
+            executor.submit(
+                copy_context().run,
+                cls._call_loader, settings_loader, root, prefix,
+                settings_names,
+            )
+            for settings_loader in settings_loaders
+        ]
+        result: Dict[str, Any] = dict()
+        successful_loader = None
+        for settings_loader, future in zip(settings_loaders, futures):
+            settings_values = future.result()
+            if settings_values is None:
+                continue
+            if successful_loader is None:
+                successful_loader = settings_loader
+            for name in (
+                settings_values if settings_names is None else settings_names
+            ):
+                if name not in result and name in settings_values:
+                    result[name] = settings_values[name]
+                    if sources is not None:
+                        sources[name] = settings_loader
+        if successful_loader is not None:
+            cls.last_successful_loader = successful_loader
         return result
+
+    @classmethod
+    def _get_executor(cls, load_workers: int) -> ThreadPoolExecutor:
+        """
+        Return the thread pool with `load_workers` threads (created if needed).
+        """
+        with cls._executors_lock:
+            try:
+                return cls._executors[load_workers]
+            except KeyError:
+                # Imported here, as parallel loading is off by default.
+                from concurrent.futures import ThreadPoolExecutor
+                executor = cls._executors[load_workers] = ThreadPoolExecutor(
+                    max_workers=load_workers,
+                    thread_name_prefix="settings_collector",
+                )
+                return executor
+
+    @classmethod
+    def _call_loader(
+        cls,
+        settings_loader: Type[SC_LoaderBase],
+        root: Type[SettingsCollector],
+        prefix: str,
+        settings_names: Optional[List[str]],
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Return `settings_loader.get_settings(prefix, settings_names)`.
+
+        This also keeps track of which root settings collectors use which
+        loaders and records the loaders' metrics.
+        """
+        try:
+            consumers = cls._consumers[settings_loader]
+        except KeyError:
+            consumers = cls._consumers.setdefault(settings_loader, WeakSet())
+        consumers.add(root)
+        start = perf_counter()
+        result = settings_loader.get_settings(prefix, settings_names)
+        sc_metrics_record_loader_call(
+            settings_loader, perf_counter() - start, result is not None,
+        )
+        return result
+
+    @classmethod
+    @contextmanager
+    def load_cycle(cls) -> Iterator[None]:
+        """
+        Share loaders' sources between all settings loaded in this context.
+
+        Normally, each loader fetches its source (by calling its `get_source`
+        method) whenever some settings collector or scope loads settings from
+        it. Inside a load cycle, each loader's source is fetched only once (or
+        its failure to provide one is recorded, also only once) and then used
+        by all the collectors and scopes that load their settings in the same
+        cycle. This is meant for warming up or reloading the settings of many
+        collectors at once, so the sources are not expected to change while
+        the cycle lasts.
+
+        Load cycles can be nested, in which case the inner ones simply use the
+        sources fetched in the outermost one.
+        """
+        if _sc_load_cycle.get() is not None:
+            yield
+            return
+        token = _sc_load_cycle.set(dict())
+        try:
+            yield
+        finally:
+            _sc_load_cycle.reset(token)
+
+    @classmethod
+    def get_source(cls, loader_class: Type[Any]) -> Any:
+        """
+        Return the source of `loader_class`, shared within a load cycle.
+
+        Outside of load cycles (see :py:meth:`load_cycle`), this just returns
+        `loader_class.get_source()`.
+
+        :raise Exception: Raised whatever `loader_class.get_source` raises
+            (those from its `no_settings_exceptions` are recorded and raised
+            again on each call in the same load cycle).
+        """
+        cycle = _sc_load_cycle.get()
+        if cycle is None:
+            return loader_class.get_source()
+        try:
+            source, exception = cycle[loader_class]
+        except KeyError:
+            try:
+                source, exception = loader_class.get_source(), None
+            except loader_class.no_settings_exceptions as e:
+                source, exception = None, e
+            cycle[loader_class] = (source, exception)
+        if exception is not None:
+            raise exception.with_traceback(None)
+        return source
+
+    @classmethod
+    def warm_up(
+        cls,
+        settings_collectors: Optional[
+            Iterable[Type[SettingsCollector]]
+        ] = None,
+    ) -> None:
+        """
+        Load all the settings of `settings_collectors` in one load cycle.
+
+        :param settings_collectors: The settings collectors to load. If
+            `None`, all settings collectors are loaded. Each collector's
+            existing scopes are loaded as well.
+        :raise ValueError: Raised if some setting without a default value is
+            not defined.
+        """
+        from .collector import sc_collectors
+
+        if settings_collectors is None:
+            settings_collectors = sc_collectors()
+        with cls.load_cycle():
+            for settings_collector in settings_collectors:
+                for scope in settings_collector.iter_scopes():
+                    scope.get_settings()
+
+    @classmethod
+    def take_snapshot(
+        cls,
+        settings_collectors: Optional[
+            Iterable[Type[SettingsCollector]]
+        ] = None,
+        scopes: Iterable[str] = (),
+    ) -> Tuple[Dict[str, Any], FrozenSet[str]]:
+        """
+        Load the settings of `settings_collectors` as the loaders provide them.
+
+        This is used to make snapshots that are then served by loaders like
+        `SC_SharedMemoryLoader` and `SC_CompiledLoader`, which are skipped
+        while a snapshot is being taken. The settings are loaded in one load
+        cycle.
+
+        The settings routed to some loaders (by `SC_Setting(loaders=...)` or by
+        `group_loaders` config) are included in the snapshot, but they are
+        always loaded only by the loaders to which they are routed, so they
+        are never served from the snapshot (unless they are routed to the
+        snapshot's loader).
+
+        :param settings_collectors: The settings collectors to load. If
+            `None`, all settings collectors are loaded. Each collector's
+            existing scopes are loaded as well.
+        :param scopes: Names of scopes to create (if they don't exist yet) in
+            each settings collector before loading them.
+        :return: A tuple containing
+            1. the loaded values (before casting, inheritance, and falling back
+               to defaults), keyed by the settings' names prefixed with their
+               scopes' prefixes (i.e., `f"{prefix}{name}"`, without applying
+               the loaders' `name_case`); and
+            2. the names (with the prefixes) of all loaded settings, including
+               those that no loader provided.
+        """
+        from .collector import sc_collectors
+
+        if settings_collectors is None:
+            settings_collectors = sc_collectors()
+        scopes = list(scopes)
+        settings: Dict[str, Any] = dict()
+        loaded_names = set()
+        token = _sc_taking_snapshot.set(True)
+        try:
+            with cls.load_cycle():
+                for settings_collector in settings_collectors:
+                    for scope_name in scopes:
+                        settings_collector.get_scope(scope_name)
+                    for scope in settings_collector.iter_scopes():
+                        names = scope.get_settings_names()
+                        if not names:
+                            continue
+                        prefix = scope.get_scope_prefix()
+                        values = cls.get_settings(scope, names)
+                        for name, value in values.items():
+                            settings[f"{prefix}{name}"] = value
+                        loaded_names.update(
+                            f"{prefix}{name}" for name in names
+                        )
+        finally:
+            _sc_taking_snapshot.reset(token)
+        return settings, frozenset(loaded_names)
+
+    @staticmethod
+    def is_taking_snapshot() -> bool:
+        """
+        Return `True` if a snapshot is being taken in this context.
+        """
+        return _sc_taking_snapshot.get()
+
+    @classmethod
+    def clear_loader_caches(cls, loader_class: Type[SC_LoaderBase]) -> None:
+        """
+        Clear caches of all settings collectors that have used `loader_class`.
+        """
+        for settings_collector in list(cls._consumers.get(loader_class, ())):
+            settings_collector.clear_cache()
+
+    @classmethod
+    def invalidate_loader_settings(
+        cls,
+        loader_class: Type[SC_LoaderBase],
+        prefix: str,
+        settings_names: Iterable[str],
+    ) -> None:
+        """
+        Clear cached values of some settings that came from `loader_class`.
+
+        This is meant for loaders that find out that only some of their values
+        have changed (for example, when secrets are rotated).
+
+        :param loader_class: The loader whose values have changed.
+        :param prefix: The prefix (including the scope) with which the loader
+            loaded the settings, as passed to its `load_settings` method.
+        :param settings_names: The names of the settings that have changed.
+        """
+        settings_names = set(settings_names)
+        for scope in cls._iter_loader_scopes(loader_class, prefix):
+            names = settings_names.intersection(scope.get_settings_names())
+            if names:
+                scope.SC_Data.root.invalidate(  # type: ignore
+                    names=names, scopes=[scope.SC_Data.scope_name],
+                )
+
+    @classmethod
+    def is_loader_setting_used(
+        cls, loader_class: Type[SC_LoaderBase], prefix: str, name: str,
+    ) -> bool:
+        """
+        Return `True` if some existing scope has loaded `name` from a loader.
+
+        This is meant for loaders that keep their values up to date in the
+        background (for example, by renewing leases of secrets), so that they
+        can stop doing that for the settings that are no longer used.
+
+        :param loader_class: The loader that loaded the setting.
+        :param prefix: The prefix (including the scope) with which the loader
+            loaded the setting, as passed to its `load_settings` method.
+        :param name: The name of the setting.
+        """
+        return any(
+            name in scope.get_settings_names()
+            for scope in cls._iter_loader_scopes(loader_class, prefix)
+        )
+
+    @classmethod
+    def _iter_loader_scopes(
+        cls, loader_class: Type[SC_LoaderBase], prefix: str,
+    ) -> Iterator[Type[SettingsCollector]]:
+        """
+        Return a generator of existing scopes that use `loader_class`.
+
+        Only the scopes whose prefix (as passed to the loader) is `prefix` are
+        included.
+        """
+        for settings_collector in list(cls._consumers.get(loader_class, ())):
+            for scope in settings_collector.iter_scopes():
+                scope_prefix = loader_class._get_source_name(
+                    scope.get_scope_prefix(),
+                )
+                if scope_prefix == prefix:
+                    yield scope
@@ -0,0 +1,253 @@
+"""
+Metrics of loaders and settings collectors in Prometheus text format.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from typing import Any, Callable, Dict, Iterable, List, Tuple, Type
+
+
+# The content type of the text returned by `sc_metrics_text`.
+SC_METRICS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Upper bounds of the buckets of loaders' latency histograms (in seconds).
+SC_METRICS_BUCKETS: Tuple[float, ...] = (
+    0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+    1.0, 2.5, 5.0, 10.0,
+)
+
+
+class _SC_LoaderStats:
+    """
+    Statistics of the calls of one loader.
+    """
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.unavailable = 0
+        self.duration = 0.0
+        # Number of calls in each bucket (the last one is for those that took
+        # longer than the largest bucket's bound).
+        self.buckets = [0] * (len(SC_METRICS_BUCKETS) + 1)
+
+
+_sc_loader_stats: Dict[Type[Any], _SC_LoaderStats] = dict()
+
+
+def sc_metrics_record_loader_call(
+    loader_class: Type[Any], duration: float, success: bool,
+) -> None:
+    """
+    Record a call of `loader_class.get_settings`.
+
+    This is called by `SC_LoadersManager`, so there is no need to call it
+    directly.
+
+    :param loader_class: The loader that was called.
+    :param duration: The time (in seconds) that the call took.
+    :param success: `False` if the loader provided no settings.
+    """
+    try:
+        stats = _sc_loader_stats[loader_class]
+    except KeyError:
+        stats = _sc_loader_stats[loader_class] = _SC_LoaderStats()
+    stats.calls += 1
+    if not success:
+        stats.unavailable += 1
+    stats.duration += duration
+    stats.buckets[bisect_left(SC_METRICS_BUCKETS, duration)] += 1
+
+
+def sc_metrics_reset() -> None:
+    """
+    Reset all the counters (mostly useful in tests).
+    """
+    from .collector import sc_collectors
+
+    _sc_loader_stats.clear()
+    for settings_collector in sc_collectors():
+        for scope in settings_collector.iter_scopes():
+            for _, sc_value in scope.get_sc_values():
+                sc_value.hits = 0
+                sc_value.misses = 0
+
+
+def _escape(value: str) -> str:
+    """
+    Return `value` escaped for use as a label value.
+    """
+    return (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+    )
+
+
+def _format_value(value: float) -> str:
+    """
+    Return `value` formatted as a sample value.
+    """
+    if isinstance(value, int):
+        return str(value)
+    return repr(float(value))
+
+
+class _SC_MetricsWriter:
+    """
+    Auxiliary class for writing metrics in Prometheus text format.
+    """
+
+    prefix = "settings_collector_"
+
+    def __init__(self) -> None:
+        self.lines: List[str] = list()
+
+    def metric(
+        self,
+        name: str,
+        metric_type: str,
+        description: str,
+        samples: Iterable[Tuple[str, Dict[str, str], float]],
+    ) -> None:
+        """
+        Add a metric with its samples.
+
+        :param samples: An iterable of tuples `(suffix, labels, value)`,
+            where `suffix` is added to the metric's name (for example,
+            `"_bucket"` for histograms).
+        """
+        name = f"{self.prefix}{name}"
+        self.lines.append(f"# HELP {name} {description}")
+        self.lines.append(f"# TYPE {name} {metric_type}")
+        for suffix, labels, value in samples:
+            labels_str = ",".join(
+                f'{label}="{_escape(label_value)}"'
+                for label, label_value in labels.items()
+            )
+            if labels_str:
+                labels_str = f"{{{labels_str}}}"
+            self.lines.append(
+                f"{name}{suffix}{labels_str} {_format_value(value)}",
+            )
+
+    def get_text(self) -> str:
+        return "".join(f"{line}\n" for line in self.lines)
+
+
+def sc_metrics_text() -> str:
+    """
+    Return metrics of loaders and settings collectors in Prometheus format.
+
+    The metrics include the numbers of loaders' calls, the numbers of those
+    calls that provided no settings, and the latency histograms of the calls,
+    as well as the numbers of cache hits and misses, the cache hit ratio, the
+    number of scopes, and the number of cached values of each settings
+    collector.
+    """
+    from .collector import sc_collectors
+    from .manager import SC_LoadersManager
+
+    writer = _SC_MetricsWriter()
+
+    loaders = sorted(
+        (
+            (SC_LoadersManager.get_loader_name(loader_class), stats)
+            for loader_class, stats in list(_sc_loader_stats.items())
+        ),
+        key=lambda it: it[0],
+    )
+    writer.metric(
+        "loader_calls_total", "counter", "Number of calls of each loader.",
+        (("", {"loader": name}, stats.calls) for name, stats in loaders),
+    )
+    writer.metric(
+        "loader_unavailable_total", "counter",
+        "Number of calls of each loader that provided no settings.",
+        (("", {"loader": name}, stats.unavailable) for name, stats in loaders),
+    )
+
+    def histogram_samples() -> Iterable[Tuple[str, Dict[str, str], float]]:
+        for name, stats in loaders:
+            count = 0
+            for bound, bucket in zip(SC_METRICS_BUCKETS, stats.buckets):
+                count += bucket
+                yield "_bucket", {"loader": name, "le": repr(bound)}, count
+            yield "_bucket", {"loader": name, "le": "+Inf"}, stats.calls
+            yield "_sum", {"loader": name}, stats.duration
+            yield "_count", {"loader": name}, stats.calls
+
+    writer.metric(
+        "loader_duration_seconds", "histogram",
+        "Duration of the calls of each loader.",
+        histogram_samples(),
+    )
+
+    # Settings collectors with the same module and name (e.g., created by
+    # the same function) share their series.
+    totals: Dict[str, List[int]] = dict()
+    for settings_collector in sc_collectors():
+        name = (
+            f"{settings_collector.__module__}"
+            f".{settings_collector.__qualname__}"
+        )
+        total = totals.setdefault(name, [0, 0, 0, 0])
+        for scope in settings_collector.iter_scopes():
+            total[2] += 1
+            for _, sc_value in scope.get_sc_values():
+                total[0] += sc_value.hits
+                total[1] += sc_value.misses
+                total[3] += sc_value.is_cached()
+        # The root isn't counted as a scope.
+        total[2] -= 1
+    collectors = [(name, *total) for name, total in totals.items()]
+
+    def collector_samples(
+        get_value: Callable[[Tuple[str, int, int, int, int]], float],
+    ) -> Iterable[Tuple[str, Dict[str, str], float]]:
+        return (
+            ("", {"collector": item[0]}, get_value(item))
+            for item in collectors
+        )
+
+    writer.metric(
+        "cache_hits_total", "counter",
+        "Number of settings' reads served from the cache.",
+        collector_samples(lambda item: item[1]),
+    )
+    writer.metric(
+        "cache_misses_total", "counter",
+        "Number of settings' reads that needed loading.",
+        collector_samples(lambda item: item[2]),
+    )
+    writer.metric(
+        "cache_hit_ratio", "gauge",
+        "Ratio of settings' reads served from the cache.",
+        collector_samples(
+            lambda item: item[1] / (item[1] + item[2]) if item[1] else 0.0,
+        ),
+    )
+    writer.metric(
+        "scopes", "gauge", "Number of scopes of each settings collector.",
+        collector_samples(lambda item: item[3]),
+    )
+    writer.metric(
+        "cached_values", "gauge",
+        "Number of cached values of each settings collector.",
+        collector_samples(lambda item: item[4]),
+    )
+
+    return writer.get_text()
+
+
+def sc_metrics_app(environ: Dict[str, Any], start_response: Callable) -> Any:
+    """
+    WSGI app that serves `sc_metrics_text`.
+
+    This can be mounted on any path of an existing WSGI app (for example,
+    using `werkzeug.middleware.dispatcher.DispatcherMiddleware`).
+    """
+    body = sc_metrics_text().encode("utf-8")
+    start_response("200 OK", [
+        ("Content-Type", SC_METRICS_CONTENT_TYPE),
+        ("Content-Length", str(len(body))),
+    ])
+    return [body]
@@ -0,0 +1,35 @@
+"""
+Description of where a setting's value came from.
+"""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple, Optional, Type
+
+
+class SC_Provenance(NamedTuple):
+    """
+    Description of where a setting's value came from.
+
+    This is returned by `SettingsCollector.explain`.
+    """
+
+    # The loader that provided the value (`None` if the default value was
+    # used or if the value was overridden).
+    loader: Optional[Type[Any]]
+    # The name under which the loader found the value (for example, the name
+    # of an environment variable).
+    source_key: Optional[str]
+    # The scope in which the value was found (the root for defaults).
+    scope: Type[Any]
+    # `True` if the default value was used (either because the value was not
+    # found anywhere or because its casting failed).
+    default: bool
+    # `True` if the value was found, but its casting failed, so the default
+    # was used instead (see `default_on_error` argument of `SC_Setting`).
+    cast_fallback: bool
+    # The time (in seconds) that the loads which resolved the value took.
+    duration: float
+    # `True` if the value was set by `SettingsCollector.override` or
+    # `sc_patch` (in which case the other fields describe that scope only).
+    overridden: bool = False
@@ -5,7 +5,7 @@ Class that defines an individual setting to be collected.
 from __future__ import annotations
 
 from copy import deepcopy
-from typing import Optional, Dict, Type, Any
+from typing import Optional, Dict, Iterable, Type, Any
 
 from .undef import SC_undef
 
@@ -24,6 +24,8 @@ class SC_Setting:
         no_cache: bool = False,
         value_type: Optional[Type[Any]] = None,
         default_on_error: bool = True,
+        group: Optional[str] = None,
+        loaders: Optional[Iterable[str]] = None,
     ) -> None:
         """
         Initialise class instance.
@@ -37,11 +39,21 @@ class SC_Setting:
             will be `int(value_fetched_from_settings)`.
         :param default_on_error: Fall back to `default` when casting fails due
             to invalid data.
+        :param group: The name of the group of settings that are loaded
+            together (i.e., when one of them is requested, all of the others
+            are loaded as well). If `None`, the setting belongs to the default
+            group, which is loaded together only if `greedy_load` is set.
+        :param loaders: The names of the loaders in which this setting is
+            looked up. If `None`, the setting is looked up in the loaders set
+            for its group in collector's `group_loaders` config or, if there
+            are none, in all the loaders used by the collector.
         """
         self.default = default
         self.no_cache = no_cache
         self.value_type = value_type
         self.default_on_error = default_on_error
+        self.group = group
+        self.loaders = None if loaders is None else tuple(loaders)
         self.name: Optional[str] = None
 
     def __copy__(self) -> SC_Setting:
@@ -50,6 +62,8 @@ class SC_Setting:
             no_cache=self.no_cache,
             value_type=self.value_type,
             default_on_error=self.default_on_error,
+            group=self.group,
+            loaders=self.loaders,
         )
 
     def __deepcopy__(self, memo: Dict[int, Any]) -> SC_Setting:
@@ -62,5 +76,7 @@ class SC_Setting:
                 no_cache=deepcopy(self.no_cache),
                 value_type=deepcopy(self.value_type),
                 default_on_error=deepcopy(self.default_on_error),
+                group=deepcopy(self.group),
+                loaders=deepcopy(self.loaders),
             )
             return result
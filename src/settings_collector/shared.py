@@ -0,0 +1,416 @@
+"""
+Snapshot of loaded settings shared between processes.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+import marshal
+import struct
+import sys
+from typing import (
+    Any, Callable, Dict, Iterable, Iterator, Optional, Type, FrozenSet,
+    TYPE_CHECKING,
+)
+
+from .exceptions import SC_ConfigError
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .collector import SettingsCollector
+
+
+class _SC_StaleSnapshot(Exception):
+    """
+    Raised when a snapshot was overwritten while it was being read.
+    """
+
+
+class _SC_Snapshot(Mapping):
+    """
+    Read-only view of one snapshot in a shared memory block.
+
+    The values are decoded only when they are looked up (so, each process
+    keeps only the values that it uses, in its settings collectors' caches).
+    """
+
+    def __init__(self, store: SC_SharedStore, generation: int) -> None:
+        """
+        Initialise class instance.
+
+        :raise _SC_StaleSnapshot: Raised if the snapshot was overwritten while
+            it was being read.
+        """
+        self.store = store
+        self.generation = generation
+        self._offset = store._get_slot_offset(generation)
+        self._count, self._table_offset, self.names = self._read(
+            self._read_header,
+        )
+
+    def is_intact(self) -> bool:
+        """
+        Return `True` if the snapshot was not overwritten (even partially).
+        """
+        # Each snapshot is overwritten by the second one published after it,
+        # which starts by setting the generation to this one's plus three.
+        return self.store.generation < self.generation + 3
+
+    def _read(self, read: Callable[..., Any], *args: Any) -> Any:
+        """
+        Return `read(*args)`, making sure that it didn't read garbage.
+
+        :raise _SC_StaleSnapshot: Raised if the snapshot was overwritten while
+            it was being read.
+        """
+        try:
+            result = read(*args)
+        except Exception:
+            if self.is_intact():
+                raise
+            raise _SC_StaleSnapshot() from None
+        if not self.is_intact():
+            raise _SC_StaleSnapshot()
+        return result
+
+    def _read_header(self) -> tuple[int, int, FrozenSet[str]]:
+        """
+        Return the number of values, the offset of their table, and names.
+        """
+        store = self.store
+        buf = store.shm.buf
+        count, names_size = store._slot_header.unpack_from(
+            buf, self._offset,
+        )
+        start = self._offset + store._slot_header.size
+        names = (
+            frozenset(marshal.loads(buf[start:start + names_size]))
+            if names_size
+            else frozenset()
+        )
+        return count, start + names_size, names
+
+    def _read_entry(self, index: int) -> tuple[bytes, int, int]:
+        """
+        Return the key, the offset, and the size of the value number `index`.
+        """
+        store = self.store
+        buf = store.shm.buf
+        key_offset, key_size, value_offset, value_size = (
+            store._entry.unpack_from(
+                buf, self._table_offset + index * store._entry.size,
+            )
+        )
+        key_offset += self._offset
+        return (
+            bytes(buf[key_offset:key_offset + key_size]),
+            self._offset + value_offset,
+            value_size,
+        )
+
+    def _read_value(self, key: str) -> Any:
+        """
+        Return the value for `key` (found by binary search of the keys).
+        """
+        key_bytes = key.encode("utf-8")
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            entry_key, value_offset, value_size = self._read_entry(middle)
+            if entry_key < key_bytes:
+                low = middle + 1
+            elif entry_key > key_bytes:
+                high = middle
+            else:
+                return marshal.loads(
+                    self.store.shm.buf[value_offset:value_offset + value_size],
+                )
+        raise KeyError(key)
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._read(self._read_value, key)
+        except _SC_StaleSnapshot:
+            # Some new snapshot has overwritten this one, so the newest one
+            # is used instead.
+            return self.store.get_snapshot()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._count):
+            yield self._read(self._read_entry, index)[0].decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._count
+
+
+class SC_SharedStore:
+    """
+    Snapshot of loaded settings in shared memory.
+
+    This is meant for pre-fork servers (like Gunicorn): the master process
+    creates the store and publishes the snapshot, so the workers don't have to
+    run the loaders themselves. A typical use is this:
+
+    ```python
+    # In the master process (before the workers are forked):
+    store = SC_SharedStore.create()
+    store.publish()
+
+    # In each worker (after the fork):
+    store.install()
+
+    # In each worker, whenever you want to pick up a new snapshot (for
+    # example, at the beginning of each request):
+    store.refresh()
+    ```
+
+    The snapshot holds the values as they were provided by the loaders (so,
+    before casting, inheritance, and falling back to defaults), keyed by the
+    names that include the prefixes, and the names of all published settings
+    (so that the workers know that a missing value is really not defined, and
+    that the settings that were not published have to be loaded by the other
+    loaders). The
+    workers read it through `SC_SharedMemoryLoader`, which decodes only the
+    values that are looked up, straight from the shared memory.
+
+    The values are serialised with `marshal`, which (unlike `pickle`) cannot
+    run any code when decoding them, so they can be only of the basic types
+    (`None`, Booleans, numbers, strings, bytes, and tuples, lists, sets, and
+    dictionaries of those).
+
+    The memory starts with a header holding the generation counter and the
+    size of the two slots that follow it. Each snapshot is written in the
+    slot not used by the previous one, so the workers keep reading the
+    previous snapshot while the new one is being written. The generation is
+    odd while a snapshot is being written, and the readers retry the reads
+    of snapshots that were overwritten while they were reading them.
+
+    The serialised snapshot consists of a header (the number of values and
+    the size of the serialised names), the names, a table of offsets
+    and sizes of the keys and their values (sorted by the keys), and then the
+    keys and values themselves.
+    """
+
+    _header = struct.Struct("<QQ")
+    _generation = struct.Struct("<Q")
+    _slot_header = struct.Struct("<II")
+    _entry = struct.Struct("<IIII")
+
+    def __init__(self, shm: Any, *, owner: bool = False) -> None:
+        """
+        Initialise class instance.
+
+        Use `create` or `attach` instead of calling this directly.
+
+        :param shm: A `multiprocessing.shared_memory.SharedMemory` instance.
+        :param owner: If `True`, this store created `shm` (so, it is the one
+            that should eventually unlink it).
+        """
+        self.shm = shm
+        self.owner = owner
+        self.slot_size = self._header.unpack_from(shm.buf, 0)[1]
+        self._snapshot: Optional[_SC_Snapshot] = None
+
+    @classmethod
+    def create(
+        cls, name: Optional[str] = None, size: int = 1 << 20,
+    ) -> SC_SharedStore:
+        """
+        Create a new shared memory block and return a store using it.
+
+        :param name: The name of the shared memory block (if `None`, a unique
+            name is generated).
+        :param size: The maximum size of a serialised snapshot. The block
+            holds two of them (the published one and the one being written).
+        """
+        from multiprocessing import shared_memory
+        shm = shared_memory.SharedMemory(
+            name=name, create=True, size=cls._header.size + 2 * size,
+        )
+        cls._header.pack_into(shm.buf, 0, 0, size)
+        cls._slot_header.pack_into(shm.buf, cls._header.size, 0, 0)
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> SC_SharedStore:
+        """
+        Return a store using an existing shared memory block.
+
+        This is needed only in processes that did not inherit the store (for
+        example, those that were not forked from the one that created it).
+        """
+        from multiprocessing import shared_memory
+        if sys.version_info >= (3, 13):  # pragma: no cover
+            shm = shared_memory.SharedMemory(name=name, track=False)
+        else:
+            shm = shared_memory.SharedMemory(name=name)
+            # Prevent the resource tracker from removing the block when this
+            # process exits (the creator is the one who should do that).
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(
+                shm._name, "shared_memory",  # type: ignore
+            )
+        return cls(shm)
+
+    @property
+    def name(self) -> str:
+        """
+        The name of the shared memory block.
+        """
+        return self.shm.name
+
+    @property
+    def generation(self) -> int:
+        """
+        The generation of the currently published snapshot.
+        """
+        return self._generation.unpack_from(self.shm.buf, 0)[0]
+
+    def _get_slot_offset(self, generation: int) -> int:
+        """
+        Return the offset of the slot holding the snapshot `generation`.
+        """
+        return self._header.size + (generation // 2 % 2) * self.slot_size
+
+    def _serialise(
+        self, snapshot: Dict[str, Any], names: Iterable[str],
+    ) -> bytes:
+        """
+        Return `snapshot` and `names` serialised as described in the class.
+
+        :raise SC_ConfigError: Raised if some value cannot be serialised.
+        """
+        entries = list()
+        for key, value in snapshot.items():
+            try:
+                entries.append((key.encode("utf-8"), marshal.dumps(value)))
+            except ValueError:
+                raise SC_ConfigError(
+                    f"setting {repr(key)} has a value of type"
+                    f" {type(value).__name__}, which cannot be shared",
+                ) from None
+        entries.sort()
+        names_data = marshal.dumps(tuple(sorted(names)))
+        data_offset = (
+            self._slot_header.size
+            + len(names_data)
+            + self._entry.size * len(entries)
+        )
+        table = bytearray()
+        data = bytearray()
+        for key, value in entries:
+            key_offset = data_offset + len(data)
+            data += key
+            table += self._entry.pack(
+                key_offset, len(key), key_offset + len(key), len(value),
+            )
+            data += value
+        return b"".join((
+            self._slot_header.pack(len(entries), len(names_data)),
+            names_data,
+            table,
+            data,
+        ))
+
+    def publish(
+        self,
+        collectors: Optional[Iterable[Type[SettingsCollector]]] = None,
+    ) -> int:
+        """
+        Load settings for `collectors` and publish them as a new snapshot.
+
+        :param collectors: The settings collectors to load. If `None`, all
+            settings collectors are loaded. Each collector's existing scopes
+            are loaded as well.
+        :raise SC_ConfigError: Raised if some value cannot be serialised or if
+            the snapshot does not fit in the shared memory block.
+        :return: The generation of the new snapshot.
+        """
+        from .manager import SC_LoadersManager
+
+        snapshot, names = SC_LoadersManager.take_snapshot(collectors)
+        payload = self._serialise(snapshot, names)
+        if len(payload) > self.slot_size:
+            raise SC_ConfigError(
+                f"settings snapshot has {len(payload)} bytes, which is more"
+                f" than {self.slot_size} available in shared memory block"
+                f" {repr(self.name)}",
+            )
+        buf = self.shm.buf
+        generation = self.generation
+        generation += 2 - generation % 2
+        self._generation.pack_into(buf, 0, generation - 1)
+        offset = self._get_slot_offset(generation)
+        buf[offset:offset + len(payload)] = payload
+        self._generation.pack_into(buf, 0, generation)
+        return generation
+
+    def get_snapshot(self) -> _SC_Snapshot:
+        """
+        Return the last completely published snapshot.
+
+        The returned mapping decodes the values only when they are looked up.
+        """
+        while True:
+            generation = self.generation
+            # While a new snapshot is being written, the previous one is used.
+            generation -= generation % 2
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.generation == generation:
+                return snapshot
+            try:
+                self._snapshot = _SC_Snapshot(self, generation)
+            except _SC_StaleSnapshot:  # pragma: no cover
+                continue
+            return self._snapshot
+
+    def is_published(self, name: str) -> bool:
+        """
+        Return `True` if the setting `name` (with the prefix) was published.
+        """
+        return name in self.get_snapshot().names
+
+    def refresh(self) -> bool:
+        """
+        Clear settings collectors' caches if a new snapshot was published.
+
+        :return: `True` if a new snapshot was published since the last check.
+        """
+        generation = self.generation
+        generation -= generation % 2
+        if (
+            self._snapshot is not None
+            and self._snapshot.generation == generation
+        ):
+            return False
+        from .collector import sc_collectors
+        self.get_snapshot()
+        for collector in sc_collectors():
+            collector.clear_cache()
+        return True
+
+    def install(self) -> None:
+        """
+        Make `SC_SharedMemoryLoader` read settings from this store.
+        """
+        from .loaders.shared import SC_SharedMemoryLoader
+        SC_SharedMemoryLoader.store = self
+        SC_SharedMemoryLoader.enabled = True
+
+    def close(self) -> None:
+        """
+        Close the shared memory block, unlinking it if this store created it.
+        """
+        from .loaders.shared import SC_SharedMemoryLoader
+        if SC_SharedMemoryLoader.store is self:
+            SC_SharedMemoryLoader.store = None
+            SC_SharedMemoryLoader.enabled = False
+        self._snapshot = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+    def __enter__(self) -> SC_SharedStore:
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
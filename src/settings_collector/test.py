@@ -2,7 +2,8 @@
 Testing functions for Settings Collector.
 """
 
-from typing import Tuple, Any
+from contextlib import contextmanager
+from typing import Tuple, Any, Callable, Iterator, Type
 
 from settings_collector import SC_LoadersManager
 from settings_collector import SettingsCollector, SC_Setting
@@ -120,3 +121,66 @@ def sc_test_run(verbose: bool = True):
         report = ["Success: all tests have passed."]
 
     print("\n".join(report))
+
+
+@contextmanager
+def sc_patch(
+    settings_collector: Type[SettingsCollector], **settings_values: Any,
+) -> Iterator[None]:
+    """
+    Patch settings' values for the duration of the context.
+
+    This is meant for tests. Unlike `SettingsCollector.override`, the values
+    are changed for all threads (for example, also for a server running in a
+    background thread), and unlike setting the values and later clearing the
+    cache, only the patched values are touched and restored, so no settings
+    need to be reloaded afterwards. It can also be used as a decorator and it
+    can be nested (including patching the same settings again):
+
+    ```python
+    with sc_patch(my_settings, foo=17), sc_patch(my_settings("x"), foo=19):
+        ...
+    ```
+
+    :param settings_collector: The settings collector (or its scope) whose
+        settings are patched.
+    :param settings_values: Settings' names and their values. The values are
+        cast just like those loaded from the loaders.
+    :raise AttributeError: Raised if some of the names are not settings.
+    """
+    sc_values = {
+        name: settings_collector._get_sc_value(name)  # type: ignore
+        for name in settings_values
+    }
+    pinned = list()
+    try:
+        for name, value in settings_values.items():
+            sc_value = sc_values[name]
+            pinned.append((sc_value, sc_value.pin(value)))
+        yield
+    finally:
+        for sc_value, previous in reversed(pinned):
+            sc_value.unpin(previous)
+
+
+def sc_patch_fixture(
+    settings_collector: Type[SettingsCollector], **settings_values: Any,
+) -> Callable:
+    """
+    Return a pytest fixture that patches settings' values (see `sc_patch`).
+
+    ```python
+    foo_17 = sc_patch_fixture(my_settings, foo=17)
+
+    def test_something(foo_17):
+        ...
+    ```
+    """
+    import pytest
+
+    @pytest.fixture
+    def fixture() -> Iterator[None]:
+        with sc_patch(settings_collector, **settings_values):
+            yield
+
+    return fixture
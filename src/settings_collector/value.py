@@ -4,9 +4,11 @@ Class for getting, setting, and holding the actual settings' values.
 
 from __future__ import annotations
 
-from typing import Any, Optional, Type, TYPE_CHECKING
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple, Type, TYPE_CHECKING
 
 from .exceptions import SC_ConfigError
+from .manager import SC_LoadersManager
 from .setting import SC_Setting
 from .undef import SC_undef
 
@@ -15,6 +17,17 @@ if TYPE_CHECKING:
     from .collector import SettingsCollector  # pragma: no cover
 
 
+# Values overridden in the current context (`None` if there are none), keyed
+# by settings collectors (or scopes) and settings' names.
+_sc_overrides: ContextVar[
+    Optional[Dict[Tuple[Type[SettingsCollector], str], Any]]
+] = ContextVar("sc_overrides", default=None)
+
+
+# Process-wide generation of cached values (see `sc_clear_caches`).
+_sc_generation = [0]
+
+
 class SC_DefaultValue:
     """
     Internal class used to represent default value without setting it.
@@ -26,16 +39,55 @@ class SC_Value:
     A class for holding actual values for settings.
     """
 
-    def __init__(self, sc_setting: SC_Setting):
+    def __init__(
+        self,
+        sc_setting: SC_Setting,
+        generation: Optional[List[int]] = None,
+    ) -> None:
+        """
+        Initialise class instance.
+
+        :param sc_setting: The definition of the setting.
+        :param generation: The generation counter (a list holding one integer)
+            shared by all the values of a settings collector and its scopes.
+            When it changes, all of those values are reloaded on their next
+            read. If `None`, a new counter is created.
+        """
         self.sc_setting = sc_setting
         self.value_is_set = False
         self.value = None
+        self.generation = [0] if generation is None else generation
+        # Generations (the collector's and the process-wide one) at the time
+        # when the value was cached.
+        self.cached_generation: Optional[Tuple[int, int]] = None
+        # Values cached separately for each partition of the loaders' sources
+        # (see `SC_LoaderBase.get_partition_key`), keyed by the ids of the
+        # partition keys. Each item holds the keys themselves as well, so that
+        # their ids are not reused while the value is cached.
+        self.partitions: Dict[
+            Tuple[int, ...], Tuple[Tuple[Any, ...], Any, Tuple[int, int]]
+        ] = dict()
+        # A value set by `pin` (wrapped in a tuple) or `None` if not pinned.
+        self.pinned: Optional[Tuple[Any]] = None
+        # The last load of this setting in this scope: the loader that
+        # provided the value (`None` if it wasn't found), the prefix used, and
+        # the time that the load took in seconds (see `SettingsCollector.
+        # explain`). This is `None` if the value was not loaded since the
+        # cache was cleared.
+        self.source: Optional[Tuple[Optional[Type[Any]], str, float]] = None
+        # `True` if the last value loaded in this scope failed to cast and the
+        # default was used instead.
+        self.cast_fallback = False
+        # Numbers of reads served from the cache and of those that needed
+        # loading (see `sc_metrics_text`).
+        self.hits = 0
+        self.misses = 0
 
     def clone(self) -> SC_Value:
         """
         Return `SC_Value` configured for the same `SC_Setting`.
         """
-        return type(self)(self.sc_setting)
+        return type(self)(self.sc_setting, self.generation)
 
     def _get_default_value(self) -> Any:
         """
@@ -58,21 +110,34 @@ class SC_Value:
             `self.default_on_error` is not `True`.
         :return: Value cast to the given type.
         """
+        return self._cast(value)[0]
+
+    def _cast(self, value: Optional[Any]) -> Tuple[Any, bool]:
+        """
+        Return `value` with proper type casting and the fallback flag.
+
+        For arguments and exceptions, see :py:meth:`cast`.
+
+        :return: A tuple containing
+            1. the value cast to the given type; and
+            2. a Boolean which is `True` if the casting failed, so the default
+               value was used instead.
+        """
         if value == SC_DefaultValue:
-            return self._get_default_value()
+            return self._get_default_value(), False
         if self.sc_setting.value_type is None:
-            return value
+            return value, False
 
         has_correct_type = isinstance(value, self.sc_setting.value_type)
 
         if has_correct_type:
-            return value
+            return value, False
         else:
             try:
-                return self.sc_setting.value_type(value)
+                return self.sc_setting.value_type(value), False
             except Exception as ex:
                 if self.sc_setting.default_on_error:
-                    return self._get_default_value()
+                    return self._get_default_value(), True
                 else:
                     raise TypeError(
                         "invalid value {value} for setting {setting_name}"
@@ -93,10 +158,22 @@ class SC_Value:
                 "there be bug: setting not assigned its name",
             )
 
-        if not self.sc_setting.no_cache and self.value_is_set:
+        overrides = _sc_overrides.get()
+        if overrides is not None:
+            try:
+                return overrides[(settings_collector, self.sc_setting.name)]
+            except KeyError:
+                pass
+
+        try:
             # Not a reloadble setting and we already had the value cached, so
             # we can just return it.
-            return self.value
+            result = self.get_cached()
+        except KeyError:
+            self.misses += 1
+        else:
+            self.hits += 1
+            return result
 
         # Get the value.
         parent_collector = settings_collector.SC_Data.parent  # type: ignore
@@ -104,7 +181,7 @@ class SC_Value:
 
         # Return it or fall back to parent.
         try:
-            self.value = self.cast(values[self.sc_setting.name])
+            value = values[self.sc_setting.name]
         except KeyError:
             if parent_collector:
                 sc_value = getattr(
@@ -114,8 +191,75 @@ class SC_Value:
             else:
                 return self._get_default_value()
         else:
+            return self._set_loaded(value)
+
+    def get_cached(self, clear_stale: bool = True) -> Any:
+        """
+        Return the cached value (for the current partition, if any).
+
+        :param clear_stale: If `True`, a stale cached value (i.e., one cached
+            before the last clearing of the cache) is removed.
+        :raise KeyError: Raised if the value is not cached.
+        """
+        if self.pinned is not None:
+            return self.pinned[0]
+        if not self.sc_setting.no_cache:
+            partition = SC_LoadersManager.get_partition()
+            generation = (self.generation[0], _sc_generation[0])
+            if partition is None:
+                if self.value_is_set:
+                    if self.cached_generation == generation:
+                        return self.value
+                    if clear_stale:
+                        self.clear_value()
+            else:
+                partition_id = tuple(map(id, partition))
+                try:
+                    _, value, cached_generation = self.partitions[partition_id]
+                except KeyError:
+                    pass
+                else:
+                    if cached_generation == generation:
+                        return value
+                    if clear_stale:
+                        del self.partitions[partition_id]
+        raise KeyError(self.sc_setting.name)
+
+    def is_cached(self) -> bool:
+        """
+        Return `True` if the value is cached (so, it can be used as it is).
+
+        Unlike :py:meth:`get_cached`, this doesn't change the cache.
+        """
+        try:
+            self.get_cached(clear_stale=False)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def _cache(self, value: Any) -> None:
+        """
+        Cache `value` (for the current partition, if any).
+        """
+        partition = SC_LoadersManager.get_partition()
+        generation = (self.generation[0], _sc_generation[0])
+        if partition is None:
+            self.value = value
             self.value_is_set = True
-            return self.value
+            self.cached_generation = generation
+        else:
+            self.partitions[tuple(map(id, partition))] = (
+                partition, value, generation,
+            )
+
+    def _set_loaded(self, value: Any) -> Any:
+        """
+        Cast and cache the value loaded from settings and return it.
+        """
+        result, self.cast_fallback = self._cast(value)
+        self._cache(result)
+        return result
 
     def setter(
         self, settings_collector: Type[SettingsCollector], value: Any,
@@ -123,13 +267,46 @@ class SC_Value:
         """
         Set the value for the setting unless it's an auto-reloading one.
         """
-        self.value = self.cast(value)
-        if not self.sc_setting.no_cache:
-            self.value_is_set = True
+        value, self.cast_fallback = self._cast(value)
+        if self.sc_setting.no_cache:
+            self.value = value
+        else:
+            self._cache(value)
 
-    def clear_cache(self) -> None:
+    def pin(self, value: Any) -> Optional[Tuple[Any]]:
         """
-        Invalidate any cache that this value might hold.
+        Make this setting return `value` until `unpin` is called.
+
+        Unlike setting the value, this works for `no_cache` settings as well
+        and it survives clearing the cache, while the cached value itself is
+        left intact (so, there is nothing to reload once the pin is removed).
+
+        :param value: The value to use (it is cast just like the loaded ones).
+        :return: The previous pin, to be passed to `unpin`.
+        """
+        result = self.pinned
+        self.pinned = (self.cast(value),)
+        return result
+
+    def unpin(self, pinned: Optional[Tuple[Any]] = None) -> None:
+        """
+        Restore the pin returned by `pin` (by default, remove the pin).
+        """
+        self.pinned = pinned
+
+    def clear_value(self) -> None:
+        """
+        Forget the cached value (but not those cached for partitions).
         """
         self.value = None
         self.value_is_set = False
+        self.cached_generation = None
+        self.source = None
+        self.cast_fallback = False
+
+    def clear_cache(self) -> None:
+        """
+        Invalidate any cache that this value might hold.
+        """
+        self.clear_value()
+        self.partitions.clear()
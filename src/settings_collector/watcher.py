@@ -0,0 +1,145 @@
+"""
+Watcher that clears caches when loaders' files change.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple, Type
+
+from .loaders.base import SC_LoaderBase
+from .manager import SC_LoadersManager
+
+
+StatKeyType = Optional[Tuple[int, int, int]]
+
+
+class SC_Watcher:
+    """
+    Watcher that clears caches when loaders' files change.
+
+    The watcher polls `os.stat` of the paths returned by loaders'
+    `get_watched_paths` (for example, the files of `SC_JSONLoader` or
+    `SC_DotEnvLoader` and the directory of `SC_SecretsLoader`) and, when some
+    of them change, it clears the caches of the settings collectors that have
+    used the loader in question. This way, settings can be cached and still
+    pick up the changes, without paying the loaders' cost on every read (as
+    it happens with `no_cache=True`).
+
+    The polling can run in a background thread (see `start` and `stop`), in
+    an asyncio task (see `run_async`), or it can be triggered manually (see
+    `check`).
+    """
+
+    def __init__(
+        self,
+        interval: float = 1.0,
+        loaders: Optional[Iterable[Type[SC_LoaderBase]]] = None,
+    ) -> None:
+        """
+        Initialise class instance.
+
+        :param interval: The number of seconds between two checks.
+        :param loaders: Loaders to watch. If `None`, all registered loaders
+            that are enabled are watched.
+        """
+        self.interval = interval
+        self.loaders = None if loaders is None else list(loaders)
+        self._stats: Dict[Tuple[Type[SC_LoaderBase], str], StatKeyType] = (
+            dict()
+        )
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+    @staticmethod
+    def _get_stat_key(path: str) -> StatKeyType:
+        """
+        Return a key describing the state of `path` (`None` if it's missing).
+        """
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+    def _get_loaders(self) -> List[Type[SC_LoaderBase]]:
+        """
+        Return the loaders to watch.
+        """
+        if self.loaders is not None:
+            return self.loaders
+        return [
+            loader
+            for loader in list(SC_LoadersManager._loaders.values())
+            if loader.enabled
+        ]
+
+    def check(self) -> List[Type[SC_LoaderBase]]:
+        """
+        Check watched paths and clear caches for those that have changed.
+
+        The first check for each path only records its state.
+
+        :return: A list of loaders whose paths have changed.
+        """
+        changed: List[Type[SC_LoaderBase]] = list()
+        stats: Dict[Tuple[Type[SC_LoaderBase], str], StatKeyType] = dict()
+        for loader in self._get_loaders():
+            loader_changed = False
+            for path in loader.get_watched_paths():
+                key = (loader, path)
+                stats[key] = stat_key = self._get_stat_key(path)
+                try:
+                    previous_stat_key = self._stats[key]
+                except KeyError:
+                    continue
+                if stat_key != previous_stat_key:
+                    loader_changed = True
+            if loader_changed:
+                changed.append(loader)
+        self._stats = stats
+        for loader in changed:
+            SC_LoadersManager.clear_loader_caches(loader)
+        return changed
+
+    def _run(self) -> None:
+        """
+        Check watched paths periodically until stopped.
+        """
+        while True:
+            self.check()
+            if self._stop_event.wait(self.interval):
+                break
+
+    def start(self) -> threading.Thread:
+        """
+        Start watching in a background (daemon) thread.
+        """
+        if self._thread is None or not self._thread.is_alive():
+            self._stop_event.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="SC_Watcher", daemon=True,
+            )
+            self._thread.start()
+        return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """
+        Stop the background thread started by `start`.
+        """
+        self._stop_event.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    async def run_async(self) -> None:
+        """
+        Check watched paths periodically (until cancelled) in asyncio loop.
+
+        Use it as `asyncio.create_task(watcher.run_async())`.
+        """
+        import asyncio
+        while True:
+            self.check()
+            await asyncio.sleep(self.interval)
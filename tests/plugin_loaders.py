@@ -0,0 +1,26 @@
+"""
+Loaders advertised through (mocked) entry points.
+
+This module must never be imported directly by the tests. It is imported by
+`SC_LoadersManager` when some collector's loader plan needs it.
+"""
+
+from typing import Any
+
+from settings_collector import SC_LoaderFromDict
+
+
+PLUGIN_LOADER_SETTINGS = {"plugin__foo": "plugged"}
+
+
+class SC_PluginLoader(SC_LoaderFromDict):
+
+    @classmethod
+    def get_source(cls) -> Any:
+        """
+        Return dictionary that with settings.
+        """
+        return PLUGIN_LOADER_SETTINGS
+
+
+NOT_A_LOADER = {"foo": "bar"}
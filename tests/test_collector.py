@@ -1,10 +1,13 @@
+import asyncio
+import threading
 import unittest.mock
 
 from settings_collector import (
-    SettingsCollector, SC_WeirdBugError, SC_LoaderBase, SC_ConfigError,
+    SettingsCollector, SC_Setting, SC_WeirdBugError, SC_LoaderBase,
+    SC_ConfigError, SC_EnvironLoader, sc_clear_caches, sc_patch,
 )
 
-from tests.utils import TestsBase
+from tests.utils import TestsBase, patch_env
 
 
 class TestBasicFunctionality(TestsBase):
@@ -37,3 +40,323 @@ class TestBasicFunctionality(TestsBase):
                 else:
                     with self.assertRaises(result):
                         SC_LoaderBase._get_source_name(source_name)
+
+
+class TestGetMany(TestsBase):
+
+    def test_get_many(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                greedy_load = False
+            foo = SC_Setting("foo")
+            bar = SC_Setting(value_type=int)
+            baz = SC_Setting("baz", no_cache=True)
+            qux = SC_Setting("qux")
+
+        with patch_env(bar="17", x__foo="x foo", x__y__baz="xy baz"):
+            with unittest.mock.patch.object(
+                SC_EnvironLoader, "get_settings",
+                wraps=SC_EnvironLoader.get_settings,
+            ) as mock_get_settings:
+                result = my_settings("x__y").get_many(
+                    ["qux", "foo", "bar", "baz"],
+                )
+                self.assertEqual(
+                    result,
+                    {"qux": "qux", "foo": "x foo", "bar": 17, "baz": "xy baz"},
+                )
+                self.assertEqual(list(result), ["qux", "foo", "bar", "baz"])
+                # One loader call per scope: "x__y", "x", and root.
+                self.assertEqual(mock_get_settings.call_count, 3)
+                self.assertEqual(
+                    list(mock_get_settings.call_args_list[0].args[1]),
+                    ["qux", "foo", "bar", "baz"],
+                )
+                self.assertEqual(
+                    list(mock_get_settings.call_args_list[1].args[1]),
+                    ["qux", "foo", "bar"],
+                )
+                self.assertEqual(
+                    list(mock_get_settings.call_args_list[2].args[1]),
+                    ["qux", "bar"],
+                )
+
+            # The root's loaded values are cached now (but the defaults are
+            # not, just like when the settings are fetched one by one).
+            with unittest.mock.patch.object(
+                SC_EnvironLoader, "get_settings",
+                wraps=SC_EnvironLoader.get_settings,
+            ) as mock_get_settings:
+                self.assertEqual(
+                    my_settings.get_many(["foo", "bar", "qux"]),
+                    {"foo": "foo", "bar": 17, "qux": "qux"},
+                )
+                self.assertEqual(mock_get_settings.call_count, 1)
+                self.assertEqual(
+                    list(mock_get_settings.call_args.args[1]), ["foo", "qux"],
+                )
+
+    def test_get_many_greedy(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+            bar = SC_Setting()
+
+        with patch_env(foo="food"):
+            with self.assertRaises(ValueError):
+                my_settings.get_many(["foo"])
+        with patch_env(foo="food", bar="bard"):
+            self.assertEqual(
+                my_settings.get_many(("foo", "bar")),
+                {"foo": "food", "bar": "bard"},
+            )
+
+    def test_get_many_invalid_name(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+
+        for name in ("bar", "SC_Config"):
+            with self.assertRaises(AttributeError):
+                my_settings.get_many(["foo", name])
+
+
+class TestGroups(TestsBase):
+
+    def _get_loaded_names(self, collector, name):
+        with unittest.mock.patch.object(
+            SC_EnvironLoader, "get_settings",
+            wraps=SC_EnvironLoader.get_settings,
+        ) as mock_get_settings:
+            getattr(collector, name)
+        calls = mock_get_settings.call_args_list
+        return [list(call.args[1]) for call in calls]
+
+    def test_groups(self):
+        for greedy_load in (True, False):
+            with self.subTest(greedy_load=greedy_load):
+
+                class my_settings(SettingsCollector):
+                    class SC_Config:
+                        pass
+                    SC_Config.greedy_load = greedy_load
+                    host = SC_Setting("localhost", group="db")
+                    port = SC_Setting(5432, group="db", value_type=int)
+                    ttl = SC_Setting(60, group="cache")
+                    foo = SC_Setting("foo")
+                    bar = SC_Setting("bar")
+
+                with patch_env(port="5433"):
+                    self.assertEqual(
+                        self._get_loaded_names(my_settings, "host"),
+                        [["host", "port"]],
+                    )
+                    self.assertEqual(my_settings.port, 5433)
+                    self.assertEqual(
+                        self._get_loaded_names(my_settings, "foo"),
+                        [["bar", "foo"] if greedy_load else ["foo"]],
+                    )
+                    self.assertEqual(
+                        self._get_loaded_names(my_settings, "ttl"),
+                        [["ttl"]],
+                    )
+                    self.assertEqual(
+                        self._get_loaded_names(my_settings, "bar"),
+                        [] if greedy_load else [["bar"]],
+                    )
+
+    def test_groups_in_scopes(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                greedy_load = False
+            host = SC_Setting("localhost", group="db")
+            port = SC_Setting(5432, group="db")
+            foo = SC_Setting("foo")
+
+        scope = my_settings("x")
+        with patch_env(x__host="x host"):
+            self.assertEqual(
+                self._get_loaded_names(scope, "port"),
+                [["host", "port"], ["host", "port"]],
+            )
+            self.assertEqual(self._get_loaded_names(scope, "host"), [])
+            self.assertEqual(scope.host, "x host")
+            self.assertEqual(scope.port, 5432)
+
+    def test_groups_after_clearing(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                greedy_load = False
+            host = SC_Setting("localhost", group="db")
+            port = SC_Setting(5432, group="db")
+            user = SC_Setting("root", group="db")
+
+        group = [["host", "port", "user"]]
+        for clear in (
+            my_settings.clear_cache,
+            sc_clear_caches,
+            lambda: my_settings.invalidate(names=["port"]),
+            my_settings.invalidate,
+        ):
+            self.assertEqual(
+                self._get_loaded_names(my_settings, "port"), group,
+            )
+            self.assertEqual(self._get_loaded_names(my_settings, "user"), [])
+            clear()
+            self.assertEqual(
+                self._get_loaded_names(my_settings, "port"), group,
+            )
+            self.assertEqual(self._get_loaded_names(my_settings, "host"), [])
+            clear()
+
+        scope = my_settings("x")
+        with patch_env(x__host="x host", x__port="1", x__user="x user"):
+            self.assertEqual(self._get_loaded_names(scope, "port"), group)
+            scope.clear_cache()
+            self.assertEqual(self._get_loaded_names(scope, "user"), group)
+            self.assertEqual(self._get_loaded_names(scope, "host"), [])
+
+
+class TestOverride(TestsBase):
+
+    def _get_collector(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+            bar = SC_Setting(19, value_type=int)
+            baz = SC_Setting("baz", no_cache=True)
+
+        return my_settings
+
+    def test_override(self):
+        my_settings = self._get_collector()
+        with patch_env(foo="food", x__foo="x food"):
+            self.assertEqual(my_settings.foo, "food")
+            with my_settings.override(foo="fool", bar="17", baz="bazaar"):
+                self.assertEqual(my_settings.foo, "fool")
+                self.assertEqual(my_settings.bar, 17)
+                self.assertEqual(my_settings.baz, "bazaar")
+                self.assertEqual(
+                    my_settings.get_many(["foo", "bar"]),
+                    {"foo": "fool", "bar": 17},
+                )
+                # Scopes with their own values are not affected, while the
+                # others inherit the overridden values.
+                self.assertEqual(my_settings("x").foo, "x food")
+                self.assertEqual(my_settings("x").bar, 17)
+                with my_settings.override(foo="fooled"):
+                    self.assertEqual(my_settings.foo, "fooled")
+                    self.assertEqual(my_settings.bar, 17)
+                self.assertEqual(my_settings.foo, "fool")
+            # The cached value was never touched.
+            self.assertTrue(my_settings.SC_Values.foo.value_is_set)
+            self.assertEqual(my_settings.foo, "food")
+            self.assertEqual(my_settings.bar, 19)
+
+    def test_override_decorator(self):
+        my_settings = self._get_collector()
+
+        @my_settings.override(foo="fool")
+        def get_foo(depth=0):
+            return (my_settings.foo, depth and get_foo(depth - 1))
+
+        @my_settings.override(bar=17)
+        async def get_bar():
+            await asyncio.sleep(0)
+            return my_settings.bar
+
+        self.assertEqual(get_foo(2), ("fool", ("fool", ("fool", 0))))
+        self.assertEqual(my_settings.foo, "foo")
+        self.assertEqual(asyncio.run(get_bar()), 17)
+        self.assertEqual(my_settings.bar, 19)
+
+    def test_override_isolation(self):
+        my_settings = self._get_collector()
+        started = threading.Event()
+        checked = threading.Event()
+        result = list()
+
+        def other_thread():
+            started.wait()
+            result.append(my_settings.foo)
+            checked.set()
+
+        thread = threading.Thread(target=other_thread)
+        thread.start()
+        with my_settings.override(foo="fool"):
+            started.set()
+            checked.wait()
+        thread.join()
+        self.assertEqual(result, ["foo"])
+
+        async def task(value):
+            with my_settings.override(foo=value):
+                await asyncio.sleep(0)
+                return my_settings.foo
+
+        async def main():
+            return await asyncio.gather(task("a"), task("b"))
+
+        self.assertEqual(asyncio.run(main()), ["a", "b"])
+
+    def test_override_invalid_name(self):
+        my_settings = self._get_collector()
+        with self.assertRaises(AttributeError):
+            my_settings.override(qux=17)
+
+
+class TestExplain(TestsBase):
+
+    def test_explain(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "sct"
+            foo = SC_Setting("foo")
+            bar = SC_Setting(19, value_type=int)
+            baz = SC_Setting("baz", no_cache=True)
+            qux = SC_Setting("qux")
+
+        with patch_env(
+            sct__a__foo="a foo", sct__a__b__bar="seventeen", sct__baz="bard",
+        ):
+            scope = my_settings("a__b")
+            provenance = scope.explain("foo")
+            self.assertIs(provenance.loader, SC_EnvironLoader)
+            self.assertEqual(provenance.source_key, "SCT__A__FOO")
+            self.assertIs(provenance.scope, my_settings("a"))
+            self.assertFalse(provenance.default)
+            self.assertFalse(provenance.cast_fallback)
+            self.assertFalse(provenance.overridden)
+            self.assertGreater(provenance.duration, 0)
+
+            provenance = scope.explain("bar")
+            self.assertIs(provenance.loader, SC_EnvironLoader)
+            self.assertEqual(provenance.source_key, "SCT__A__B__BAR")
+            self.assertIs(provenance.scope, scope)
+            self.assertTrue(provenance.default)
+            self.assertTrue(provenance.cast_fallback)
+
+            provenance = scope.explain("baz")
+            self.assertEqual(provenance.source_key, "SCT__BAZ")
+            self.assertIs(provenance.scope, my_settings)
+
+            provenance = scope.explain("qux")
+            self.assertIsNone(provenance.loader)
+            self.assertIsNone(provenance.source_key)
+            self.assertIs(provenance.scope, my_settings)
+            self.assertTrue(provenance.default)
+            self.assertFalse(provenance.cast_fallback)
+
+            # Cached values are described without loading them again.
+            with unittest.mock.patch.object(
+                SC_EnvironLoader, "get_settings",
+            ) as mock_get_settings:
+                self.assertIs(my_settings.explain("qux").scope, my_settings)
+                mock_get_settings.assert_not_called()
+
+            with my_settings.override(qux="quux"):
+                provenance = scope.explain("qux")
+                self.assertTrue(provenance.overridden)
+                self.assertIs(provenance.scope, my_settings)
+            with sc_patch(scope, foo="fool"):
+                self.assertTrue(scope.explain("foo").overridden)
+
+        with self.assertRaises(AttributeError):
+            my_settings.explain("quux")
@@ -0,0 +1,157 @@
+import contextlib
+import importlib.util
+import io
+import os
+import tempfile
+import unittest.mock
+
+from settings_collector import (
+    SettingsCollector, SC_Setting, SC_CompiledLoader, SC_ConfigError,
+    SC_LoadersManager, SC_SharedMemoryLoader, SC_SharedStore, sc_compile,
+    sc_compile_to_file,
+)
+from settings_collector.__main__ import main
+
+from tests.utils import TestsBase, patch_env
+
+
+class _compiled_settings(SettingsCollector):
+    class SC_Config:
+        prefix = "compiled"
+    foo = SC_Setting("foo")
+    bar = SC_Setting("bar")
+
+
+class TestCompiler(TestsBase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.patch(SC_CompiledLoader, "settings", None)
+        self.patch(SC_CompiledLoader, "names", frozenset())
+        self.patch(SC_CompiledLoader, "enabled", False)
+        super().setUp()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        _compiled_settings.clear_cache()
+        super().tearDown()
+
+    def _import(self, path):
+        spec = importlib.util.spec_from_file_location("_sc_compiled", path)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        return module
+
+    def test_compile(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "app"
+            foo = SC_Setting("foo")
+            bar = SC_Setting("bar")
+            baz = SC_Setting("baz")
+
+        with patch_env(app__foo="env foo", app__x__bar="x bar"):
+            self.assertEqual(my_settings.foo, "env foo")
+            source = sc_compile([my_settings], scopes=["x"])
+        self.assertIn("\n    'app__foo': 'env foo',\n", source)
+        self.assertIn("\n    'app__x__bar': 'x bar',\n", source)
+
+        path = os.path.join(self.tmp_dir.name, "compiled_settings.py")
+        with open(path, "w") as f:
+            f.write(source)
+        module = self._import(path)
+        self.assertEqual(module.NAMES, frozenset({
+            f"app__{scope}{name}"
+            for scope in ("", "x__") for name in ("foo", "bar", "baz")
+        }))
+        self.assertTrue(SC_CompiledLoader.enabled)
+
+        # The compiled values are used even without the environment.
+        with patch_env():
+            self.assertEqual(my_settings.foo, "env foo")
+            self.assertEqual(my_settings.bar, "bar")
+            self.assertEqual(my_settings("x").bar, "x bar")
+            self.assertEqual(my_settings("x").foo, "env foo")
+            # Scopes that were not compiled are loaded as usual.
+            self.assertEqual(my_settings("y").bar, "bar")
+            # New modules are not compiled from the old ones.
+            self.assertNotIn("env foo", sc_compile([my_settings]))
+
+    def test_not_compiled_collector(self):
+        class compiled_settings(SettingsCollector):
+            foo = SC_Setting("default foo")
+
+        class other_settings(SettingsCollector):
+            bar = SC_Setting("default bar")
+
+        with patch_env(foo="env foo"):
+            SC_CompiledLoader.install(*SC_LoadersManager.take_snapshot(
+                [compiled_settings],
+            ))
+        # Both collectors have the same (empty) prefix, but only the settings
+        # that were compiled are served by the compiled loader.
+        with patch_env(bar="env bar"):
+            self.assertEqual(compiled_settings.foo, "env foo")
+            self.assertEqual(other_settings.bar, "env bar")
+
+    def test_not_literal(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+
+        with unittest.mock.patch(
+            "settings_collector.SC_LoadersManager.get_settings",
+            return_value={"foo": object()},
+        ), self.assertRaises(SC_ConfigError):
+            sc_compile([my_settings])
+
+    def test_skip_shared_memory(self):
+        store = SC_SharedStore.create(size=4096)
+        self.addCleanup(store.close)
+        with patch_env(compiled__foo="shared foo"):
+            store.publish([_compiled_settings])
+        with unittest.mock.patch.multiple(
+            SC_SharedMemoryLoader, store=store, enabled=True,
+        ), patch_env(compiled__foo="env foo"):
+            _compiled_settings.clear_cache()
+            self.assertEqual(_compiled_settings.foo, "shared foo")
+            source = sc_compile([_compiled_settings])
+        self.assertIn("\n    'compiled__foo': 'env foo',\n", source)
+
+    def test_compile_to_file(self):
+        path = os.path.join(self.tmp_dir.name, "compiled_settings.py")
+        with patch_env(compiled__foo="env foo"):
+            sc_compile_to_file(path, [_compiled_settings])
+        self.assertTrue(os.listdir(os.path.join(
+            self.tmp_dir.name, "__pycache__",
+        )))
+        self._import(path)
+        with patch_env():
+            self.assertEqual(_compiled_settings.foo, "env foo")
+
+    def test_main(self):
+        path = os.path.join(self.tmp_dir.name, "compiled_settings.py")
+        with patch_env(compiled__bar="env bar"):
+            self.assertEqual(main([
+                "compile", "-m", "tests.test_compiler",
+                "-c", "tests.test_compiler._compiled_settings",
+                "-s", "x", "-o", path,
+            ]), 0)
+            stdout = io.StringIO()
+            with contextlib.redirect_stdout(stdout):
+                main([
+                    "compile", "-c", "tests.test_compiler._compiled_settings",
+                ])
+        with open(path) as f:
+            source = f.read()
+        self.assertEqual(stdout.getvalue(), source)
+        self.assertIn("\n    'compiled__bar': 'env bar',\n", source)
+        self.assertIn("\n    'compiled__x__bar',\n", source)
+
+    def test_main_error(self):
+        stderr = io.StringIO()
+        with contextlib.redirect_stderr(stderr), self.assertRaises(
+            SystemExit,
+        ) as cm:
+            main(["compile", "-c", "tests.test_compiler._missing"])
+        self.assertEqual(cm.exception.code, 1)
+        self.assertIn("has no attribute '_missing'", stderr.getvalue())
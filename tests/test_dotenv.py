@@ -0,0 +1,108 @@
+import os
+import tempfile
+import textwrap
+import unittest.mock
+
+from settings_collector import SettingsCollector, SC_Setting, SC_DotEnvLoader
+from settings_collector.loaders.dotenv import _parse_dotenv
+
+from tests.utils import TestsBase, patch_env
+
+
+class TestDotEnvParser(TestsBase):
+
+    def test_parse(self):
+        text = textwrap.dedent(
+            """\
+            # A comment
+            FOO=bar
+              SPACED = spaced value   # and a comment
+            export EXPORTED=yes
+            exported_not=no
+            EMPTY=
+            SINGLE='literal \\n # not a comment'
+            DOUBLE="line\\nbreak \\"quoted\\" \\\\ \\x"
+            MULTI="first
+            second"
+            HASH=value#not-a-comment
+            NO_EQUALS_SIGN
+            LAST=no newline"""
+        )
+        self.assertEqual(
+            _parse_dotenv(text),
+            {
+                "FOO": "bar",
+                "SPACED": "spaced value",
+                "EXPORTED": "yes",
+                "exported_not": "no",
+                "EMPTY": "",
+                "SINGLE": "literal \\n # not a comment",
+                "DOUBLE": 'line\nbreak "quoted" \\ \\x',
+                "MULTI": "first\nsecond",
+                "HASH": "value#not-a-comment",
+                "LAST": "no newline",
+            },
+        )
+
+    def test_parse_crlf(self):
+        self.assertEqual(
+            _parse_dotenv('A=1\r\nB="2"\r\n'),
+            {"A": "1", "B": "2"},
+        )
+
+    def test_unterminated(self):
+        for text in ("A='open", 'A="open', 'A="open\\"'):
+            with self.assertRaises(ValueError):
+                _parse_dotenv(text)
+
+
+class TestDotEnvLoader(TestsBase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, ".env")
+        self.patch(SC_DotEnvLoader, "path", self.path)
+        self.patch(SC_DotEnvLoader, "_cache", None)
+        self.patch(SC_DotEnvLoader, "enabled", True)
+        super().setUp()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def write(self, content: str, mtime_ns: int) -> None:
+        with open(self.path, "w") as f:
+            f.write(content)
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+    def test_loader(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "app"
+            foo = SC_Setting("default", no_cache=True)
+            port = SC_Setting(value_type=int)
+
+        self.write("APP__FOO=food\nexport APP__PORT=8080\n", 1_000_000_000)
+        with patch_env(), unittest.mock.patch.object(
+            SC_DotEnvLoader, "parse", wraps=SC_DotEnvLoader.parse,
+        ) as mock_parse:
+            self.assertEqual(my_settings.port, 8080)
+            self.assertEqual(my_settings.foo, "food")
+            self.assertEqual(my_settings.foo, "food")
+            self.assertEqual(mock_parse.call_count, 1)
+
+            self.write("APP__FOO=fool\nexport APP__PORT=8080\n", 2_000_000_000)
+            self.assertEqual(my_settings.foo, "fool")
+            self.assertEqual(mock_parse.call_count, 2)
+
+    def test_environ_priority(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                load_all = True
+            foo = SC_Setting("default")
+            bar = SC_Setting("default")
+
+        self.write("FOO=from file\nBAR=from file\n", 1_000_000_000)
+        with patch_env(foo="from environ"):
+            self.assertEqual(my_settings.foo, "from environ")
+            self.assertEqual(my_settings.bar, "from file")
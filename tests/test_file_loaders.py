@@ -0,0 +1,155 @@
+import os
+import tempfile
+import textwrap
+import unittest.mock
+
+from settings_collector import (
+    SettingsCollector, SC_Setting, SC_JSONLoader, SC_TOMLLoader, SC_INILoader,
+)
+
+from tests.utils import TestsBase, patch_env
+
+
+class FileLoaderTestsBase(TestsBase):
+
+    loader_class = SC_JSONLoader
+    suffix = ".json"
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, f"settings{self.suffix}")
+        self.patch(self.loader_class, "path", self.path)
+        self.patch(self.loader_class, "_cache", None)
+        self.patch(self.loader_class, "enabled", True)
+        super().setUp()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def write(self, content: str, mtime_ns: int = 1_000_000_000) -> None:
+        with open(self.path, "w") as f:
+            f.write(textwrap.dedent(content))
+        os.utime(self.path, ns=(mtime_ns, mtime_ns))
+
+
+class TestJSONLoader(FileLoaderTestsBase):
+
+    def test_nested(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "app"
+            foo = SC_Setting("default")
+            bar = SC_Setting("default")
+            port = SC_Setting(value_type=int)
+
+        self.write(
+            """\
+            {"app": {"foo": "food", "port": "8080", "x": {"foo": "scoped"}}}
+            """,
+        )
+        with patch_env():
+            self.assertEqual(my_settings.foo, "food")
+            self.assertEqual(my_settings.bar, "default")
+            self.assertEqual(my_settings.port, 8080)
+            self.assertEqual(my_settings("x").foo, "scoped")
+
+    def test_missing_file(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("default")
+
+        with patch_env():
+            self.assertEqual(my_settings.foo, "default")
+        with unittest.mock.patch.object(SC_JSONLoader, "path", None):
+            self.assertIsNone(SC_JSONLoader.get_settings("", ["foo"]))
+
+    def test_parsed_once(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("default", no_cache=True)
+
+        self.write('{"foo": "food"}')
+        with patch_env(), unittest.mock.patch.object(
+            SC_JSONLoader, "parse", wraps=SC_JSONLoader.parse,
+        ) as mock_parse:
+            for _ in range(3):
+                self.assertEqual(my_settings.foo, "food")
+            self.assertEqual(mock_parse.call_count, 1)
+
+            # Same size, but different modification time.
+            self.write('{"foo": "fool"}', 2_000_000_000)
+            self.assertEqual(my_settings.foo, "fool")
+            self.assertEqual(mock_parse.call_count, 2)
+
+            # Same modification time, but different size.
+            self.write('{"foo": "foot!"}', 2_000_000_000)
+            self.assertEqual(my_settings.foo, "foot!")
+            self.assertEqual(mock_parse.call_count, 3)
+
+    def test_invalid_file(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("default")
+
+        self.write('{"foo": ')
+        with patch_env():
+            with self.assertRaises(ValueError):
+                my_settings.foo
+
+
+class TestTOMLLoader(FileLoaderTestsBase):
+
+    loader_class = SC_TOMLLoader
+    suffix = ".toml"
+
+    def test_nested(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "app"
+            foo = SC_Setting("default")
+            port = SC_Setting(value_type=int)
+            db = SC_Setting()
+
+        self.write(
+            """\
+            [app]
+            foo = "food"
+            port = 8080
+
+            [app.x]
+            foo = "scoped"
+
+            [app.db]
+            host = "localhost"
+            """,
+        )
+        with patch_env():
+            self.assertEqual(my_settings.foo, "food")
+            self.assertEqual(my_settings.port, 8080)
+            self.assertEqual(my_settings.db, {"host": "localhost"})
+            self.assertEqual(my_settings("x").foo, "scoped")
+
+
+class TestINILoader(FileLoaderTestsBase):
+
+    loader_class = SC_INILoader
+    suffix = ".ini"
+
+    def test_sections(self):
+        class my_settings(SettingsCollector):
+            fOO = SC_Setting("default")
+            port = SC_Setting(value_type=int)
+
+        self.write(
+            """\
+            [DEFAULT]
+            fOO = food
+            port = 8080
+
+            [x]
+            fOO = scoped
+            """,
+        )
+        with patch_env():
+            self.assertEqual(my_settings.fOO, "food")
+            self.assertEqual(my_settings.port, 8080)
+            self.assertEqual(my_settings("x").fOO, "scoped")
+            self.assertEqual(my_settings("y").fOO, "food")
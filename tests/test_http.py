@@ -0,0 +1,187 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import threading
+import time
+import unittest.mock
+from urllib.parse import parse_qs, urlsplit
+
+from settings_collector import SettingsCollector, SC_Setting, SC_HTTPLoader
+
+from tests.utils import TestsBase
+
+
+class _ConfigService(ThreadingHTTPServer):
+    """
+    A stand-in for a JSON-over-HTTP config service.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _ConfigHandler)
+        self.values = dict()
+        self.version = 0
+        # Latency (in seconds) added to each response.
+        self.delay = 0.0
+        # Tuples `(keys, client port, If-None-Match header, status)`.
+        self.requests = list()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}/config"
+
+
+class _ConfigHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        server = self.server
+        time.sleep(server.delay)
+        parts = urlsplit(self.path)
+        keys = parse_qs(parts.query).get("key", [])
+        etag = f'"{server.version}-{",".join(keys)}"'
+        if_none_match = self.headers.get("If-None-Match")
+        if parts.path != "/config":
+            status, body = 404, b""
+        elif if_none_match == etag:
+            status, body = 304, b""
+        else:
+            status = 200
+            body = json.dumps({
+                key: server.values[key]
+                for key in keys
+                if key in server.values
+            }).encode("utf-8")
+        server.requests.append(
+            (keys, self.client_address[1], if_none_match, status),
+        )
+        self.send_response(status)
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class TestHTTPLoader(TestsBase):
+
+    def setUp(self):
+        self.server = _ConfigService()
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,), daemon=True,
+        )
+        self.server_thread.start()
+        self.patch(SC_HTTPLoader, "url", self.server.url)
+        self.patch(SC_HTTPLoader, "enabled", True)
+        self.patch(SC_HTTPLoader, "_pools", dict())
+        self.patch(SC_HTTPLoader, "_responses", dict())
+        SC_HTTPLoader.reset_health()
+        super().setUp()
+
+    def tearDown(self):
+        SC_HTTPLoader.close_connections()
+        SC_HTTPLoader.reset_health()
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def _get_settings(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "app"
+                loaders = ("HTTP",)
+                exclude = False
+            foo = SC_Setting("foo")
+            bar = SC_Setting("bar")
+            baz = SC_Setting("baz")
+
+        return my_settings
+
+    def test_loader(self):
+        self.server.values = {"app__foo": "http foo", "app__bar": "http bar"}
+        my_settings = self._get_settings()
+        self.assertEqual(my_settings.foo, "http foo")
+        self.assertEqual(my_settings.bar, "http bar")
+        self.assertEqual(my_settings.baz, "baz")
+        # All the settings were fetched in one request.
+        self.assertEqual(
+            [request[0] for request in self.server.requests],
+            [["app__bar", "app__baz", "app__foo"]],
+        )
+        self.assertEqual(
+            SC_HTTPLoader.get_source_key("app__", "foo"), "app__foo",
+        )
+
+    def test_scopes(self):
+        self.server.values = {"app__foo": "foo", "app__x__foo": "x foo"}
+        my_settings = self._get_settings()
+        self.assertEqual(my_settings("x").foo, "x foo")
+        self.assertEqual(my_settings("y").foo, "foo")
+
+    def test_keep_alive_and_etags(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "app"
+                loaders = ("HTTP",)
+                exclude = False
+            foo = SC_Setting("foo")
+
+        self.server.values = {"app__foo": "http foo"}
+        for _ in range(3):
+            self.assertEqual(my_settings.foo, "http foo")
+            my_settings.clear_cache()
+        self.server.version += 1
+        self.server.values = {"app__foo": "new foo"}
+        self.assertEqual(my_settings.foo, "new foo")
+
+        requests = self.server.requests
+        self.assertEqual(len(requests), 4)
+        # One connection was used for all the requests.
+        self.assertEqual(len({request[1] for request in requests}), 1)
+        self.assertEqual(
+            [request[3] for request in requests], [200, 304, 304, 200],
+        )
+        self.assertIsNone(requests[0][2])
+        self.assertEqual(requests[1][2], requests[2][2])
+
+    def test_stale_connection(self):
+        self.server.values = {"app__foo": "http foo"}
+        my_settings = self._get_settings()
+        self.assertEqual(my_settings.foo, "http foo")
+        # The server drops the idle connection.
+        for pool in SC_HTTPLoader._pools.values():
+            for conn in pool:
+                conn.sock.close()
+        my_settings.clear_cache()
+        self.assertEqual(my_settings.foo, "http foo")
+        self.assertEqual(len(self.server.requests), 2)
+
+    def test_not_found(self):
+        my_settings = self._get_settings()
+        with unittest.mock.patch.object(
+            SC_HTTPLoader, "url", f"{self.server.url}/missing",
+        ):
+            self.assertEqual(my_settings.foo, "foo")
+        with unittest.mock.patch.object(SC_HTTPLoader, "url", None):
+            my_settings.clear_cache()
+            self.assertEqual(my_settings.foo, "foo")
+        self.assertEqual(len(self.server.requests), 1)
+
+    @unittest.mock.patch.object(SC_HTTPLoader, "timeout", 0.1)
+    @unittest.mock.patch.object(SC_HTTPLoader, "failure_threshold", 1)
+    def test_latency(self):
+        self.server.values = {"app__foo": "http foo"}
+        my_settings = self._get_settings()
+        self.assertEqual(my_settings.foo, "http foo")
+        my_settings.clear_cache()
+        self.server.values = {"app__foo": "new foo"}
+        self.server.version += 1
+        self.server.delay = 0.5
+        start = time.perf_counter()
+        # The slow service is skipped and its last good value is used.
+        self.assertEqual(my_settings.foo, "http foo")
+        self.assertLess(time.perf_counter() - start, 0.4)
+        self.assertFalse(SC_HTTPLoader.is_available())
@@ -1,6 +1,10 @@
+import threading
+from typing import Any
 import unittest.mock
 
-from settings_collector import SettingsCollector
+from settings_collector import (
+    SettingsCollector, SC_Setting, SC_LoaderBase, SC_EnvironLoader,
+)
 
 # WARNING: `tests.custom_loaders` must be imported even if you don't use
 # anything from it. That gets the mock loaders created and registered.
@@ -8,7 +12,32 @@ from tests.custom_loaders import (
     MOCK_LOADER_SETTINGS, SC_MockLoader, MockLoaderException,
     SC_TestAttrLoader,
 )
-from tests.utils import TestsBase
+from tests.utils import TestsBase, patch_env
+
+
+class _TestFlakyLoader(SC_LoaderBase):
+
+    values = {"foo": "flaky foo", "bar": "flaky bar"}
+    # Set to make `load_settings` block until the event is set.
+    block: threading.Event = None
+    # Set to make `load_settings` raise this exception.
+    error: Exception = None
+    calls = 0
+
+    @classmethod
+    def load_settings(
+        cls, prefix: str, settings_names: list[str],
+    ) -> tuple[dict[str, Any], bool]:
+        cls.calls += 1
+        if cls.block is not None:
+            cls.block.wait()
+        if cls.error is not None:
+            raise cls.error
+        return {
+            name: cls.values[name]
+            for name in settings_names
+            if name in cls.values
+        }, True
 
 
 class TestLoaderBase(TestsBase):
@@ -140,3 +169,127 @@ class TestLoaderPriority(TestsBase):
         self.assertEqual(my_settings.low_only, "low default")
         self.assertEqual(my_settings.high_only, "high")
         self.assertEqual(my_settings.neither, "neither default")
+
+
+class TestLoaderHealth(TestsBase):
+
+    def setUp(self):
+        super().setUp()
+        _TestFlakyLoader.reset_health()
+        _TestFlakyLoader.block = None
+        _TestFlakyLoader.error = None
+        _TestFlakyLoader.calls = 0
+
+    def tearDown(self):
+        if _TestFlakyLoader.block is not None:
+            _TestFlakyLoader.block.set()
+        super().tearDown()
+
+    @unittest.mock.patch.object(_TestFlakyLoader, "timeout", 0.05)
+    def test_timeout(self):
+        self.assertEqual(
+            _TestFlakyLoader.get_settings("", ["foo"]), {"foo": "flaky foo"},
+        )
+        _TestFlakyLoader.block = threading.Event()
+        # The last known good values are used for the settings that have them.
+        self.assertEqual(
+            _TestFlakyLoader.get_settings("", ["foo", "bar"]),
+            {"foo": "flaky foo"},
+        )
+        self.assertIsNone(_TestFlakyLoader.get_settings("", ["bar"]))
+        self.assertIsNone(_TestFlakyLoader.get_settings("x_", ["foo"]))
+        # Without `failure_threshold`, the loader is never skipped.
+        self.assertTrue(_TestFlakyLoader.is_available())
+        self.assertEqual(_TestFlakyLoader.calls, 4)
+
+    @unittest.mock.patch.object(_TestFlakyLoader, "timeout", 0.01)
+    def test_timeout_reuses_call(self):
+        _TestFlakyLoader.block = threading.Event()
+        for _ in range(20):
+            self.assertIsNone(_TestFlakyLoader.get_settings("", ["foo"]))
+        self.assertEqual(
+            len([
+                thread
+                for thread in threading.enumerate()
+                if thread.name == "settings_collector__TestFlakyLoader"
+            ]),
+            1,
+        )
+        self.assertEqual(_TestFlakyLoader.calls, 1)
+        # The hanging call's result is given to the calls waiting for it.
+        with unittest.mock.patch.object(_TestFlakyLoader, "timeout", 1.0):
+            threading.Timer(0.05, _TestFlakyLoader.block.set).start()
+            self.assertEqual(
+                _TestFlakyLoader.get_settings("", ["foo"]),
+                {"foo": "flaky foo"},
+            )
+        self.assertEqual(_TestFlakyLoader.calls, 1)
+        self.assertEqual(_TestFlakyLoader._health.calls, dict())
+
+    @unittest.mock.patch.object(_TestFlakyLoader, "timeout", 1.0)
+    def test_timeout_exception(self):
+        _TestFlakyLoader.error = RuntimeError("Oops!")
+        with self.assertRaises(RuntimeError):
+            _TestFlakyLoader.get_settings("", ["foo"])
+        _TestFlakyLoader.error = ImportError()
+        self.assertIsNone(_TestFlakyLoader.get_settings("", ["foo"]))
+
+    @unittest.mock.patch.object(_TestFlakyLoader, "failure_threshold", 2)
+    @unittest.mock.patch.object(_TestFlakyLoader, "cooldown", 10.0)
+    def test_circuit_breaker(self):
+        self.assertEqual(
+            _TestFlakyLoader.get_settings("", ["foo"]), {"foo": "flaky foo"},
+        )
+        _TestFlakyLoader.error = RuntimeError("Oops!")
+        now = 100.0
+        with unittest.mock.patch(
+            "settings_collector.loaders.base.monotonic", lambda: now,
+        ):
+            for _ in range(2):
+                self.assertTrue(_TestFlakyLoader.is_available())
+                self.assertEqual(
+                    _TestFlakyLoader.get_settings("", ["foo"]),
+                    {"foo": "flaky foo"},
+                )
+            self.assertFalse(_TestFlakyLoader.is_available())
+            self.assertEqual(
+                _TestFlakyLoader.get_settings("", ["foo", "bar"]),
+                {"foo": "flaky foo"},
+            )
+            self.assertEqual(_TestFlakyLoader.calls, 3)
+
+            # After the cool-down, the loader is tried again (and skipped
+            # right away if it's still failing).
+            now += 10.0
+            self.assertTrue(_TestFlakyLoader.is_available())
+            self.assertIsNone(_TestFlakyLoader.get_settings("", ["bar"]))
+            self.assertFalse(_TestFlakyLoader.is_available())
+            self.assertEqual(_TestFlakyLoader.calls, 4)
+
+            now += 10.0
+            _TestFlakyLoader.error = None
+            self.assertEqual(
+                _TestFlakyLoader.get_settings("", ["bar"]),
+                {"bar": "flaky bar"},
+            )
+            self.assertTrue(_TestFlakyLoader.is_available())
+            self.assertEqual(_TestFlakyLoader._health.failures, 0)
+
+    @unittest.mock.patch.object(_TestFlakyLoader, "failure_threshold", 1)
+    @unittest.mock.patch.object(_TestFlakyLoader, "timeout", 0.05)
+    @unittest.mock.patch.object(_TestFlakyLoader, "priority", 1)
+    def test_next_loader(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                loaders = ("Flaky", "Environ")
+                exclude = False
+            foo = SC_Setting("foo", no_cache=True)
+
+        _TestFlakyLoader.block = threading.Event()
+        with unittest.mock.patch(
+            "settings_collector.SC_LoadersManager._loaders",
+            {"Flaky": _TestFlakyLoader, "Environ": SC_EnvironLoader},
+        ), patch_env(foo="env foo"):
+            for _ in range(3):
+                self.assertEqual(my_settings.foo, "env foo")
+        self.assertEqual(_TestFlakyLoader.calls, 1)
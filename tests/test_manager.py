@@ -1,11 +1,15 @@
+from importlib.metadata import EntryPoint
+import sys
+import threading
 from typing import Iterable, Optional, Any
 import unittest.mock
 
 from settings_collector import (
-    SettingsCollector, SC_LoaderBase, SC_LoadersManager, SC_ConfigError,
+    SettingsCollector, SC_Setting, SC_LoaderBase, SC_LoadersManager,
+    SC_ConfigError, SC_NotALoader, SC_EnvironLoader,
 )
 
-from tests.utils import TestsBase
+from tests.utils import TestsBase, patch_env
 
 
 class _TestLoAder(SC_LoaderBase):
@@ -26,6 +30,26 @@ class _TestLoBder(SC_LoaderBase):
         return {"a": 17, "c": 19}
 
 
+class _TestLoDder(SC_LoaderBase):
+
+    values = {"a": 23, "b": 29, "c": 31}
+
+    @classmethod
+    def get_settings(
+        cls, prefix: str, settings_names: Iterable[str],
+    ) -> Optional[dict[str, Any]]:
+        return {
+            name: cls.values[name]
+            for name in settings_names
+            if name in cls.values
+        }
+
+
+class _TestLoEder(_TestLoDder):
+
+    values = {"a": 37, "c": 41}
+
+
 class TestManager(TestsBase):
 
     def test_get_loaders_include(self):
@@ -94,3 +118,305 @@ class TestManager(TestsBase):
         result = SC_LoadersManager.get_settings(my_settings)
 
         self.assertEqual(result, expected)
+
+    @unittest.mock.patch("settings_collector.SC_LoadersManager._get_loaders")
+    def test_get_settings_load_all_unresolved(self, mock_get_loaders):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                load_all = True
+            a = SC_Setting()
+            b = SC_Setting()
+            c = SC_Setting()
+
+        mock_get_loaders.return_value = (
+            loader for loader in (_TestLoAder, _TestLoBder)
+        )
+
+        with unittest.mock.patch.object(
+            _TestLoAder, "get_settings", wraps=_TestLoAder.get_settings,
+        ) as mock_get_settings:
+            result = SC_LoadersManager.get_settings(my_settings)
+
+        self.assertEqual(result, {"a": 17, "b": 13, "c": 19})
+        mock_get_loaders.assert_called_once_with(my_settings, reverse=False)
+        # The lower priority loader is asked only for the unresolved names.
+        mock_get_settings.assert_called_once_with("", ["b"])
+        self.assertIs(SC_LoadersManager.last_successful_loader, _TestLoBder)
+
+    @unittest.mock.patch("settings_collector.SC_LoadersManager._get_loaders")
+    def test_get_settings_load_all_early_exit(self, mock_get_loaders):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                load_all = True
+            a = SC_Setting()
+            c = SC_Setting()
+
+        mock_get_loaders.return_value = (
+            loader for loader in (_TestLoAder, _TestLoBder)
+        )
+
+        with unittest.mock.patch.object(
+            _TestLoAder, "get_settings", wraps=_TestLoAder.get_settings,
+        ) as mock_get_settings:
+            result = SC_LoadersManager.get_settings(my_settings, ["c", "a"])
+
+        self.assertEqual(result, {"c": 19, "a": 17})
+        mock_get_settings.assert_not_called()
+
+    def test_get_settings_load_all_same_priority(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                load_all = True
+            a = SC_Setting()
+            b = SC_Setting()
+
+        for loaders, expected in (
+            ({"loDder": _TestLoDder, "loEder": _TestLoEder}, 37),
+            ({"loEder": _TestLoEder, "loDder": _TestLoDder}, 23),
+        ):
+            with unittest.mock.patch(
+                "settings_collector.SC_LoadersManager._loaders", loaders,
+            ):
+                # Of the loaders with the same priority, the last registered
+                # one wins.
+                self.assertEqual(
+                    SC_LoadersManager.get_settings(my_settings),
+                    {"a": expected, "b": 29},
+                )
+
+    def test_get_settings_routes(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                group_loaders = {"g": ("loEder",)}
+            a = SC_Setting(loaders=("loEder", "loXder"))
+            b = SC_Setting()
+            c = SC_Setting(group="g")
+            d = SC_Setting(group="g", loaders=["loDder"])
+
+        with unittest.mock.patch(
+            "settings_collector.SC_LoadersManager._loaders",
+            {"loDder": _TestLoDder, "loEder": _TestLoEder},
+        ), unittest.mock.patch.object(
+            _TestLoEder, "get_settings", wraps=_TestLoEder.get_settings,
+        ) as mock_get_settings_e, unittest.mock.patch.object(
+            _TestLoDder, "get_settings", wraps=_TestLoDder.get_settings,
+        ) as mock_get_settings_d:
+            result = SC_LoadersManager.get_settings(
+                my_settings, ["a", "b", "c", "d"],
+            )
+
+        self.assertEqual(result, {"a": 37, "b": 29, "c": 41})
+        self.assertEqual(
+            [call.args[1] for call in mock_get_settings_d.call_args_list],
+            [["b"], ["d"]],
+        )
+        self.assertEqual(
+            [call.args[1] for call in mock_get_settings_e.call_args_list],
+            [["a"], ["c"]],
+        )
+
+    def test_get_settings_routes_unknown(self):
+        class my_settings(SettingsCollector):
+            a = SC_Setting(loaders=("loXder",))
+
+        with unittest.mock.patch(
+            "settings_collector.SC_LoadersManager._loaders",
+            {"loDder": _TestLoDder},
+        ):
+            with self.assertRaises(SC_ConfigError):
+                SC_LoadersManager.get_settings(my_settings, ["a"])
+
+
+    def test_get_settings_parallel(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                load_all = True
+                load_workers = 2
+            a = SC_Setting()
+            b = SC_Setting()
+            c = SC_Setting()
+
+        barrier = threading.Barrier(2, timeout=5)
+        threads = set()
+
+        def get_settings(loader_class, prefix, settings_names):
+            # Both loaders must be running at the same time to get past this.
+            barrier.wait()
+            threads.add(threading.get_ident())
+            self.assertEqual(list(settings_names), ["a", "b", "c"])
+            return {
+                name: loader_class.values[name]
+                for name in settings_names
+                if name in loader_class.values
+            }
+
+        with unittest.mock.patch(
+            "settings_collector.SC_LoadersManager._loaders",
+            {"loDder": _TestLoDder, "loEder": _TestLoEder},
+        ), unittest.mock.patch.object(
+            _TestLoEder, "priority", 1,
+        ), unittest.mock.patch.object(
+            _TestLoDder, "get_settings",
+            classmethod(get_settings),
+        ), unittest.mock.patch.object(
+            _TestLoEder, "get_settings",
+            classmethod(get_settings),
+        ):
+            sources = dict()
+            result = SC_LoadersManager.get_settings(
+                my_settings, sources=sources,
+            )
+
+        self.assertEqual(result, {"a": 37, "b": 29, "c": 41})
+        self.assertEqual(
+            sources, {"a": _TestLoEder, "b": _TestLoDder, "c": _TestLoEder},
+        )
+        self.assertEqual(len(threads), 2)
+        self.assertIs(SC_LoadersManager.last_successful_loader, _TestLoEder)
+
+
+def _entry_point(name: str, value: str) -> EntryPoint:
+    return EntryPoint(name, value, SC_LoadersManager.entry_points_group)
+
+
+class TestManagerLoadCycle(TestsBase):
+
+    def _get_collectors(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+
+        class other_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "other"
+            bar = SC_Setting("bar")
+
+        my_settings("x")
+        return my_settings, other_settings
+
+    def test_load_cycle(self):
+        my_settings, other_settings = self._get_collectors()
+        with patch_env(foo="food", x__foo="x food", other__bar="bard"):
+            with unittest.mock.patch.object(
+                SC_EnvironLoader, "get_source",
+                wraps=SC_EnvironLoader.get_source,
+            ) as mock_get_source:
+                SC_LoadersManager.warm_up([my_settings, other_settings])
+                self.assertEqual(mock_get_source.call_count, 1)
+                # Outside of the load cycle, each load fetches the source.
+                my_settings.clear_cache()
+                SC_LoadersManager.get_settings(my_settings, ["foo"])
+                SC_LoadersManager.get_settings(other_settings, ["bar"])
+                self.assertEqual(mock_get_source.call_count, 3)
+                self.assertEqual(my_settings.foo, "food")
+                self.assertEqual(my_settings("x").foo, "x food")
+                self.assertEqual(other_settings.bar, "bard")
+
+    def test_load_cycle_missing_source(self):
+        my_settings, other_settings = self._get_collectors()
+        with unittest.mock.patch.object(
+            SC_EnvironLoader, "get_source", side_effect=ImportError,
+        ) as mock_get_source:
+            with SC_LoadersManager.load_cycle():
+                with SC_LoadersManager.load_cycle():
+                    self.assertEqual(my_settings.foo, "foo")
+                self.assertEqual(my_settings("x").foo, "foo")
+                self.assertEqual(other_settings.bar, "bar")
+            self.assertEqual(mock_get_source.call_count, 1)
+
+
+class TestManagerEntryPoints(TestsBase):
+
+    plugin_module = "tests.plugin_loaders"
+
+    def setUp(self):
+        sys.modules.pop(self.plugin_module, None)
+        self.patch(
+            SC_LoadersManager, "_loaders", dict(SC_LoadersManager._loaders),
+        )
+        self.patch(SC_LoadersManager, "_entry_points", None)
+        super().setUp()
+
+    def tearDown(self):
+        sys.modules.pop(self.plugin_module, None)
+        super().tearDown()
+
+    def _patch_entry_points(self, *entry_points):
+        return unittest.mock.patch(
+            "importlib.metadata.entry_points",
+            return_value=list(entry_points),
+        )
+
+    def test_loaded_on_demand(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "plugin"
+                loaders = ("Environ",)
+                exclude = False
+            foo = SC_Setting("default")
+
+        class my_plugged_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "plugin"
+            foo = SC_Setting("default")
+
+        entry_point = _entry_point(
+            "Plugin", f"{self.plugin_module}:SC_PluginLoader",
+        )
+        with self._patch_entry_points(entry_point) as mock_entry_points:
+            self.assertEqual(my_settings.foo, "default")
+            self.assertNotIn(self.plugin_module, sys.modules)
+            self.assertEqual(my_plugged_settings.foo, "plugged")
+            self.assertIn(self.plugin_module, sys.modules)
+            self.assertIn("Plugin", SC_LoadersManager._loaders)
+        mock_entry_points.assert_called_once_with(
+            group=SC_LoadersManager.entry_points_group,
+        )
+
+    def test_include_only_plugin(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "plugin"
+                loaders = ("Plugin",)
+                exclude = False
+            foo = SC_Setting("default")
+
+        entry_point = _entry_point(
+            "Plugin", f"{self.plugin_module}:SC_PluginLoader",
+        )
+        with self._patch_entry_points(entry_point):
+            self.assertEqual(my_settings.foo, "plugged")
+
+    def test_missing_module(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                loaders = ("Missing",)
+                exclude = False
+
+        entry_point = _entry_point(
+            "Missing", "tests.no_such_module:SC_MissingLoader",
+        )
+        with self._patch_entry_points(entry_point):
+            with self.assertRaises(SC_ConfigError):
+                list(SC_LoadersManager._get_loaders(my_settings))
+
+    def test_not_a_loader(self):
+        class my_settings(SettingsCollector):
+            pass
+
+        entry_point = _entry_point(
+            "Plugin", f"{self.plugin_module}:NOT_A_LOADER",
+        )
+        with self._patch_entry_points(entry_point):
+            with self.assertRaises(SC_NotALoader):
+                list(SC_LoadersManager._get_loaders(my_settings))
+
+    def test_wrong_name(self):
+        class my_settings(SettingsCollector):
+            pass
+
+        entry_point = _entry_point(
+            "Plugged", f"{self.plugin_module}:SC_PluginLoader",
+        )
+        with self._patch_entry_points(entry_point):
+            with self.assertRaises(SC_ConfigError):
+                list(SC_LoadersManager._get_loaders(my_settings))
@@ -0,0 +1,159 @@
+import unittest.mock
+
+from settings_collector import (
+    SettingsCollector, SC_Setting, SC_EnvironLoader, SC_METRICS_CONTENT_TYPE,
+    sc_metrics_text, sc_metrics_app, sc_metrics_reset,
+)
+from settings_collector.metrics import sc_metrics_record_loader_call
+
+from tests.utils import TestsBase, patch_env
+
+
+class TestMetrics(TestsBase):
+
+    def setUp(self):
+        super().setUp()
+        sc_metrics_reset()
+
+    def _get_samples(self, text):
+        result = dict()
+        for line in text.splitlines():
+            if line and not line.startswith("#"):
+                name, value = line.rsplit(" ", 1)
+                result[name] = float(value)
+        return result
+
+    def test_metrics(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+            bar = SC_Setting("bar", no_cache=True)
+
+        with patch_env(foo="food", x__foo="x food"):
+            for _ in range(3):
+                my_settings.foo
+                my_settings.bar
+            my_settings("x").foo
+            my_settings("y")
+
+        text = sc_metrics_text()
+        self.assertIn(
+            "# TYPE settings_collector_loader_duration_seconds histogram\n",
+            text,
+        )
+        samples = self._get_samples(text)
+        collector = f'collector="{__name__}.{my_settings.__qualname__}"'
+        self.assertEqual(
+            samples[f"settings_collector_cache_hits_total{{{collector}}}"], 2,
+        )
+        # Root: `foo` once and `bar` three times. Scope "x": `foo` once.
+        self.assertEqual(
+            samples[f"settings_collector_cache_misses_total{{{collector}}}"],
+            5,
+        )
+        self.assertEqual(
+            samples[f"settings_collector_cache_hit_ratio{{{collector}}}"],
+            2 / 7,
+        )
+        self.assertEqual(
+            samples[f"settings_collector_scopes{{{collector}}}"], 2,
+        )
+        self.assertEqual(
+            samples[f"settings_collector_cached_values{{{collector}}}"], 2,
+        )
+
+        calls = samples[
+            'settings_collector_loader_calls_total{loader="Environ"}'
+        ]
+        # Greedy load of the root, three loads of `bar`, and one of `foo` in
+        # scope "x".
+        self.assertEqual(calls, 5)
+        self.assertEqual(
+            samples[
+                'settings_collector_loader_duration_seconds_bucket'
+                '{loader="Environ",le="+Inf"}'
+            ],
+            calls,
+        )
+        self.assertEqual(
+            samples[
+                'settings_collector_loader_duration_seconds_count'
+                '{loader="Environ"}'
+            ],
+            calls,
+        )
+        self.assertIn(
+            'settings_collector_loader_unavailable_total{loader="Settings"}',
+            samples,
+        )
+
+    def test_same_name(self):
+        def get_collector():
+            class my_settings(SettingsCollector):
+                foo = SC_Setting("foo")
+            return my_settings
+
+        collectors = [get_collector(), get_collector()]
+        with patch_env(foo="food"):
+            for my_settings in collectors:
+                my_settings.foo
+                my_settings.foo
+        text = sc_metrics_text()
+        collector = (
+            f'collector="{__name__}.{collectors[0].__qualname__}"'
+        )
+        name = f"settings_collector_cache_hits_total{{{collector}}}"
+        self.assertEqual(text.count(f"{name} "), 1)
+        samples = self._get_samples(text)
+        self.assertEqual(samples[name], 2)
+        self.assertEqual(
+            samples[f"settings_collector_cached_values{{{collector}}}"], 2,
+        )
+
+    def test_stale_values_kept(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+
+        with patch_env(foo="food"):
+            my_settings.foo
+        sc_value = my_settings.SC_Values.foo
+        my_settings.clear_cache()
+        with unittest.mock.patch.object(
+            sc_value, "clear_value", wraps=sc_value.clear_value,
+        ) as mock_clear_value:
+            samples = self._get_samples(sc_metrics_text())
+            mock_clear_value.assert_not_called()
+        collector = f'collector="{__name__}.{my_settings.__qualname__}"'
+        self.assertEqual(
+            samples[f"settings_collector_cached_values{{{collector}}}"], 0,
+        )
+        self.assertTrue(sc_value.value_is_set)
+
+    def test_histogram(self):
+        sc_metrics_record_loader_call(SC_EnvironLoader, 0.003, True)
+        sc_metrics_record_loader_call(SC_EnvironLoader, 7.0, False)
+        samples = self._get_samples(sc_metrics_text())
+        name = "settings_collector_loader_duration_seconds"
+        for le, expected in (("0.001", 0), ("0.005", 1), ("10.0", 2)):
+            self.assertEqual(
+                samples[f'{name}_bucket{{loader="Environ",le="{le}"}}'],
+                expected,
+            )
+        self.assertEqual(samples[f'{name}_sum{{loader="Environ"}}'], 7.003)
+        self.assertEqual(
+            samples[
+                'settings_collector_loader_unavailable_total{loader="Environ"}'
+            ],
+            1,
+        )
+
+    def test_app(self):
+        start_response = unittest.mock.Mock()
+        result = sc_metrics_app(dict(), start_response)
+        body = b"".join(result)
+        start_response.assert_called_once_with("200 OK", [
+            ("Content-Type", SC_METRICS_CONTENT_TYPE),
+            ("Content-Length", str(len(body))),
+        ])
+        self.assertIn(
+            b"# TYPE settings_collector_cache_hits_total counter", body,
+        )
@@ -0,0 +1,174 @@
+import sys
+import types
+import unittest.mock
+
+from settings_collector import (
+    SettingsCollector, SC_Setting, SC_LoadersManager, SC_FlaskLoader,
+    SC_BottleLoader, SC_CherryPyLoader,
+)
+
+from tests.utils import TestsBase
+
+
+class _FakeApp:
+
+    def __init__(self, **config):
+        self.config = config
+
+
+class _FakeCurrentApp:
+    """
+    A stand-in for Flask's `current_app` proxy.
+    """
+
+    def __init__(self):
+        self.app = None
+
+    def _get_current_object(self):
+        if self.app is None:
+            raise RuntimeError("Working outside of application context.")
+        return self.app
+
+    @property
+    def config(self):
+        return self._get_current_object().config
+
+    def has_app_context(self):
+        return self.app is not None
+
+
+class TestPartitions(TestsBase):
+
+    def _patch_module(self, name, **attrs):
+        module = types.ModuleType(name)
+        for attr_name, value in attrs.items():
+            setattr(module, attr_name, value)
+        return unittest.mock.patch.dict(sys.modules, {name: module})
+
+    def test_flask(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                loaders = ("Flask",)
+                exclude = False
+            foo = SC_Setting("foo")
+            bar = SC_Setting("bar", no_cache=True)
+
+        current_app = _FakeCurrentApp()
+        app_a = _FakeApp(FOO="a foo", BAR="a bar")
+        app_b = _FakeApp(FOO="b foo")
+        with self._patch_module(
+            "flask",
+            current_app=current_app,
+            has_app_context=current_app.has_app_context,
+        ):
+            self.assertIsNone(SC_LoadersManager.get_partition())
+            self.assertEqual(my_settings.foo, "foo")
+
+            current_app.app = app_a
+            self.assertEqual(SC_LoadersManager.get_partition(), (app_a,))
+            self.assertEqual(my_settings.foo, "a foo")
+            self.assertEqual(my_settings.bar, "a bar")
+            current_app.app = app_b
+            self.assertEqual(my_settings.foo, "b foo")
+            self.assertEqual(my_settings.bar, "bar")
+
+            # Each app keeps its own cache.
+            with unittest.mock.patch.object(
+                SC_FlaskLoader, "get_source",
+                wraps=SC_FlaskLoader.get_source,
+            ) as mock_get_source:
+                for app, expected in ((app_a, "a foo"), (app_b, "b foo")):
+                    current_app.app = app
+                    self.assertEqual(my_settings.foo, expected)
+                    self.assertEqual(my_settings.get_many(["foo"]), {
+                        "foo": expected,
+                    })
+                mock_get_source.assert_not_called()
+
+            my_settings.clear_cache()
+            app_a.config["FOO"] = "new a foo"
+            current_app.app = app_a
+            self.assertEqual(my_settings.foo, "new a foo")
+
+    def test_flask_runtime_error(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                loaders = ("Flask",)
+                exclude = False
+            foo = SC_Setting("foo")
+
+        class _BrokenApp:
+            @property
+            def config(self):
+                raise RuntimeError("Oops!")
+
+        current_app = _FakeCurrentApp()
+        current_app.app = _BrokenApp()
+        with self._patch_module(
+            "flask",
+            current_app=current_app,
+            has_app_context=current_app.has_app_context,
+        ):
+            with self.assertRaisesRegex(RuntimeError, "Oops!"):
+                my_settings.foo
+
+    def test_bottle(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                loaders = ("Bottle",)
+                exclude = False
+            foo = SC_Setting("foo")
+
+        apps = [_FakeApp(foo="a foo"), _FakeApp(foo="b foo")]
+        with self._patch_module("bottle", default_app=lambda: apps[0]):
+            self.assertEqual(my_settings.foo, "a foo")
+            apps.reverse()
+            self.assertEqual(my_settings.foo, "b foo")
+            apps.reverse()
+            self.assertEqual(my_settings.foo, "a foo")
+
+    def test_cherrypy(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                loaders = ("CherryPy",)
+                exclude = False
+            foo = SC_Setting("foo")
+            bar = SC_Setting("bar")
+
+        request = types.SimpleNamespace()
+        app_a = _FakeApp(foo="a foo")
+        app_b = _FakeApp(foo="b foo")
+        with self._patch_module(
+            "cherrypy", config={"bar": "global bar"}, request=request,
+        ):
+            self.assertEqual(my_settings.foo, "foo")
+            request.app = app_a
+            self.assertEqual(my_settings.foo, "a foo")
+            self.assertEqual(my_settings.bar, "global bar")
+            request.app = app_b
+            self.assertEqual(my_settings.foo, "b foo")
+            request.app = app_a
+            self.assertEqual(my_settings.foo, "a foo")
+
+    def test_disabled(self):
+        with self._patch_module(
+            "bottle", default_app=lambda: _FakeApp(),
+        ), unittest.mock.patch.object(SC_BottleLoader, "enabled", False):
+            self.assertIsNone(SC_LoadersManager.get_partition())
+        self.assertTrue(SC_CherryPyLoader.is_partitioned())
+        self.assertFalse(
+            SC_LoadersManager._loaders["Environ"].is_partitioned(),
+        )
+
+    def test_framework_not_imported(self):
+        with unittest.mock.patch.dict(sys.modules), unittest.mock.patch.object(
+            SC_FlaskLoader, "get_partition_key", return_value=object(),
+        ) as mock_get_partition_key:
+            sys.modules.pop("flask", None)
+            self.assertIsNone(SC_LoadersManager.get_partition())
+            mock_get_partition_key.assert_not_called()
+            sys.modules["flask"] = types.ModuleType("flask")
+            self.assertEqual(
+                SC_LoadersManager.get_partition(),
+                (mock_get_partition_key.return_value,),
+            )
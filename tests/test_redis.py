@@ -0,0 +1,217 @@
+import select
+import socketserver
+import threading
+import unittest.mock
+
+from settings_collector import SettingsCollector, SC_Setting, SC_RedisLoader
+
+from tests.utils import TestsBase
+
+
+class _RESPServer(socketserver.ThreadingTCPServer):
+    """
+    A stand-in for a Redis server, supporting only a few commands.
+    """
+
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _RESPHandler)
+        self.values = dict()
+        self.password = None
+        # Tuples `(connection id, command)`.
+        self.commands = list()
+        # Numbers of commands received in each network read.
+        self.reads = list()
+        self.connections = 0
+
+    @property
+    def url(self):
+        return f"redis://127.0.0.1:{self.server_address[1]}/3"
+
+
+class _RESPHandler(socketserver.StreamRequestHandler):
+
+    # Unbuffered, so that `select` tells if more commands were pipelined.
+    rbufsize = 0
+
+    def read_exactly(self, size):
+        result = b""
+        while len(result) < size:
+            result += self.rfile.read(size - len(result))
+        return result
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        assert line.startswith(b"*")
+        args = list()
+        for _ in range(int(line[1:])):
+            size = int(self.rfile.readline()[1:])
+            args.append(self.read_exactly(size + 2)[:-2])
+        return args
+
+    def reply(self, value):
+        if value is None:
+            return b"$-1\r\n"
+        if isinstance(value, list):
+            return b"*%d\r\n%s" % (
+                len(value), b"".join(self.reply(item) for item in value),
+            )
+        if isinstance(value, Exception):
+            return b"-ERR %s\r\n" % str(value).encode("utf-8")
+        if isinstance(value, str):
+            return b"+%s\r\n" % value.encode("utf-8")
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+
+    def handle(self):
+        server = self.server
+        server.connections += 1
+        connection_id = server.connections
+        authenticated = server.password is None
+        while True:
+            command = self.read_command()
+            if command is None:
+                return
+            # Count the commands that were sent together (i.e., pipelined).
+            count = 1
+            replies = list()
+            while True:
+                name = command[0].decode("utf-8").upper()
+                server.commands.append((connection_id, [name, *command[1:]]))
+                if name == "AUTH":
+                    authenticated = command[-1] == server.password
+                    replies.append(
+                        "OK" if authenticated else Exception("bad password"),
+                    )
+                elif not authenticated:
+                    replies.append(Exception("NOAUTH"))
+                elif name == "SELECT":
+                    replies.append("OK")
+                elif name == "MGET":
+                    replies.append([
+                        server.values.get(key.decode("utf-8"))
+                        for key in command[1:]
+                    ])
+                else:
+                    replies.append(Exception(f"unknown command {name}"))
+                if not select.select([self.connection], [], [], 0)[0]:
+                    break
+                command = self.read_command()
+                count += 1
+            server.reads.append(count)
+            self.wfile.write(b"".join(self.reply(item) for item in replies))
+
+
+class TestRedisLoader(TestsBase):
+
+    def setUp(self):
+        self.server = _RESPServer()
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,), daemon=True,
+        )
+        self.server_thread.start()
+        self.patch(SC_RedisLoader, "url", self.server.url)
+        self.patch(SC_RedisLoader, "enabled", True)
+        self.patch(SC_RedisLoader, "_pools", dict())
+        super().setUp()
+
+    def tearDown(self):
+        SC_RedisLoader.close_connections()
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def _get_settings(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "app"
+                loaders = ("Redis",)
+                exclude = False
+            foo = SC_Setting("foo")
+            bar = SC_Setting("bar")
+            baz = SC_Setting("baz")
+
+        return my_settings
+
+    def test_loader(self):
+        self.server.values = {
+            "app__foo": b"redis foo",
+            "app__bar": b"redis bar",
+            "app__x__foo": b"x foo",
+        }
+        my_settings = self._get_settings()
+        self.assertEqual(my_settings.foo, "redis foo")
+        self.assertEqual(my_settings.bar, "redis bar")
+        self.assertEqual(my_settings.baz, "baz")
+        self.assertEqual(my_settings("x").foo, "x foo")
+        self.assertEqual(self.server.commands, [
+            (1, ["SELECT", b"3"]),
+            (1, ["MGET", b"app__bar", b"app__baz", b"app__foo"]),
+            (1, ["MGET", b"app__x__bar", b"app__x__baz", b"app__x__foo"]),
+        ])
+        self.assertEqual(self.server.connections, 1)
+
+    def test_key_prefix_and_binary(self):
+        self.server.values = {"settings:app__foo": b"\x00\xff"}
+        my_settings = self._get_settings()
+        with unittest.mock.patch.object(
+            SC_RedisLoader, "key_prefix", "settings:",
+        ), unittest.mock.patch.object(SC_RedisLoader, "binary", True):
+            self.assertEqual(my_settings.foo, b"\x00\xff")
+            self.assertEqual(
+                SC_RedisLoader.get_source_key("app__", "foo"),
+                "settings:app__foo",
+            )
+
+    def test_pipeline(self):
+        self.server.values = {"app__bar": b"redis bar"}
+        my_settings = self._get_settings()
+        with unittest.mock.patch.object(SC_RedisLoader, "batch_size", 2):
+            self.assertEqual(my_settings.bar, "redis bar")
+        # Two `MGET` commands were sent in one pipeline.
+        self.assertEqual(self.server.commands[1:], [
+            (1, ["MGET", b"app__bar", b"app__baz"]),
+            (1, ["MGET", b"app__foo"]),
+        ])
+        self.assertEqual(self.server.reads, [1, 2])
+
+    def test_auth(self):
+        self.server.password = b"s3cr3t"
+        self.server.values = {"app__foo": b"redis foo"}
+        my_settings = self._get_settings()
+        with unittest.mock.patch.object(
+            SC_RedisLoader, "url",
+            self.server.url.replace("//", "//user:s3cr3t@"),
+        ):
+            self.assertEqual(my_settings.foo, "redis foo")
+        self.assertEqual(
+            self.server.commands[0], (1, ["AUTH", b"user", b"s3cr3t"]),
+        )
+
+        my_settings.clear_cache()
+        with unittest.mock.patch.object(
+            SC_RedisLoader, "url",
+            self.server.url.replace("//", "//:wrong@"),
+        ), self.assertRaises(ConnectionError):
+            my_settings.foo
+
+    def test_stale_connection(self):
+        self.server.values = {"app__foo": b"redis foo"}
+        my_settings = self._get_settings()
+        self.assertEqual(my_settings.foo, "redis foo")
+        # The server drops the idle connection.
+        for pool in SC_RedisLoader._pools.values():
+            for conn in pool:
+                conn.sock.shutdown(2)
+        my_settings.clear_cache()
+        self.assertEqual(my_settings.foo, "redis foo")
+        self.assertEqual(self.server.connections, 2)
+
+    def test_no_url(self):
+        my_settings = self._get_settings()
+        with unittest.mock.patch.object(SC_RedisLoader, "url", None):
+            self.assertEqual(my_settings.foo, "foo")
+        self.assertEqual(self.server.commands, [])
@@ -1,4 +1,8 @@
-from settings_collector import SettingsCollector, SC_Setting
+import unittest.mock
+
+from settings_collector import (
+    SettingsCollector, SC_Setting, SC_Value, sc_clear_caches,
+)
 
 from tests.utils import TestsBase, patch_env
 
@@ -59,3 +63,134 @@ class TestScopes(TestsBase):
             self.assertEqual(my_settings("x").foo, "x")
             self.assertEqual(my_settings("bar").foo, "foo")
             self.assertEqual(my_settings("bar__x").foo, "foo")
+
+
+class TestInvalidate(TestsBase):
+
+    def _get_collector(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+            bar = SC_Setting("bar")
+
+        env = dict()
+        for scope in ("t4", "t42", "t42__a", "t42__b", "t7"):
+            env[f"{scope}__foo"] = f"{scope} foo"
+            env[f"{scope}__bar"] = f"{scope} bar"
+            my_settings(scope)
+        with patch_env(foo="food", bar="bard", **env):
+            for scope in my_settings.iter_scopes():
+                scope.foo, scope.bar
+        return my_settings
+
+    def _get_cached(self, my_settings):
+        return {
+            (scope.SC_Data.scope_name, name)
+            for scope in my_settings.iter_scopes()
+            for name, sc_value in scope.get_sc_values()
+            if sc_value.value_is_set
+        }
+
+    def _get_all(self, my_settings, names=("foo", "bar")):
+        return {
+            (scope.SC_Data.scope_name, name)
+            for scope in my_settings.iter_scopes()
+            for name in names
+        }
+
+    def test_invalidate_all(self):
+        my_settings = self._get_collector()
+        my_settings.invalidate()
+        self.assertEqual(self._get_cached(my_settings), set())
+
+    def test_invalidate_names(self):
+        my_settings = self._get_collector()
+        my_settings.invalidate(names=["foo"])
+        self.assertEqual(
+            self._get_cached(my_settings), self._get_all(my_settings, ["bar"]),
+        )
+
+    def test_invalidate_scopes(self):
+        my_settings = self._get_collector()
+        my_settings.invalidate(
+            names=["foo"], scopes=[None, "t42__a", ("t7",), "nonexistent"],
+        )
+        self.assertEqual(
+            self._get_all(my_settings) - self._get_cached(my_settings),
+            {(None, "foo"), ("t42__a", "foo"), ("t7", "foo")},
+        )
+        self.assertNotIn("nonexistent", my_settings.SC_Data.scopes)
+
+    def test_invalidate_scope_prefix(self):
+        my_settings = self._get_collector()
+        my_settings.invalidate(scope_prefix="t42", scopes=["t4"])
+        self.assertEqual(
+            self._get_all(my_settings) - self._get_cached(my_settings),
+            {
+                (scope, name)
+                for scope in ("t4", "t42", "t42__a", "t42__b")
+                for name in ("foo", "bar")
+            },
+        )
+
+    def test_invalidate_from_scope(self):
+        my_settings = self._get_collector()
+        my_settings("t42").invalidate(names=["bar"])
+        self.assertEqual(
+            self._get_all(my_settings) - self._get_cached(my_settings),
+            {("t42", "bar"), ("t42__a", "bar"), ("t42__b", "bar")},
+        )
+        with patch_env(t42__a__bar="new bar"):
+            self.assertEqual(my_settings("t42__a").bar, "new bar")
+            self.assertEqual(my_settings("t42__a").foo, "t42__a foo")
+
+    def test_invalidate_invalid_name(self):
+        my_settings = self._get_collector()
+        with self.assertRaises(AttributeError):
+            my_settings.invalidate(names=["foo", "qux"])
+        self.assertEqual(
+            self._get_cached(my_settings), self._get_all(my_settings),
+        )
+
+
+class TestGenerations(TestsBase):
+
+    def test_clear_cache(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+
+        with patch_env(foo="food", x__foo="x food", x__y__foo="xy food"):
+            self.assertEqual(my_settings("x__y").foo, "xy food")
+            self.assertEqual(my_settings("x").foo, "x food")
+            self.assertEqual(my_settings.foo, "food")
+        with unittest.mock.patch.object(
+            SC_Value, "clear_cache",
+        ) as mock_clear_cache:
+            my_settings.clear_cache()
+            mock_clear_cache.assert_not_called()
+        with patch_env(foo="fool", x__foo="x fool"):
+            self.assertEqual(my_settings("x__y").foo, "x fool")
+            self.assertEqual(my_settings("x").foo, "x fool")
+            self.assertEqual(my_settings.foo, "fool")
+
+        # Clearing a scope's cache doesn't affect other scopes.
+        with patch_env(foo="fooled", x__foo="x fooled"):
+            my_settings("x").clear_cache()
+            self.assertEqual(my_settings("x").foo, "x fooled")
+            self.assertEqual(my_settings.foo, "fool")
+
+    def test_sc_clear_caches(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+
+        class other_settings(SettingsCollector):
+            bar = SC_Setting("bar")
+
+        with patch_env(foo="food", bar="bard", x__bar="x bard"):
+            self.assertEqual(my_settings.foo, "food")
+            self.assertEqual(other_settings("x").bar, "x bard")
+        sc_clear_caches()
+        self.assertFalse(my_settings.SC_Values.foo.is_cached())
+        with patch_env(foo="fool", bar="barman"):
+            self.assertEqual(my_settings.foo, "fool")
+            self.assertEqual(other_settings("x").bar, "barman")
+        self.assertTrue(my_settings.SC_Values.foo.is_cached())
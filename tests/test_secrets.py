@@ -0,0 +1,111 @@
+import os
+import tempfile
+import unittest.mock
+
+from settings_collector import SettingsCollector, SC_Setting, SC_SecretsLoader
+
+from tests.utils import TestsBase, patch_env
+
+
+class TestSecretsLoader(TestsBase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.patch(SC_SecretsLoader, "path", self.tmp_dir.name)
+        self.patch(SC_SecretsLoader, "_cache", dict())
+        self.patch(SC_SecretsLoader, "enabled", True)
+        super().setUp()
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def write(self, name: str, content: bytes) -> None:
+        path = os.path.join(self.tmp_dir.name, name)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(content)
+        # Replace the file atomically (and thus change its inode), like the
+        # secrets' rotation does.
+        os.replace(tmp_path, path)
+
+    def test_loader(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "app"
+            password = SC_Setting("default")
+            token = SC_Setting("default")
+            port = SC_Setting(value_type=int)
+
+        self.write("app__password", b"s3cr3t\n")
+        self.write("app__port", b"8080")
+        self.write("app__x__password", b"scoped\r\n")
+        with patch_env():
+            self.assertEqual(my_settings.password, "s3cr3t")
+            self.assertEqual(my_settings.token, "default")
+            self.assertEqual(my_settings.port, 8080)
+            self.assertEqual(my_settings("x").password, "scoped")
+
+    def test_lazy_and_cached(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                greedy_load = False
+            foo = SC_Setting("default", no_cache=True)
+            bar = SC_Setting("default", no_cache=True)
+
+        self.write("foo", b"food")
+        self.write("bar", b"bard")
+        with patch_env(), unittest.mock.patch.object(
+            SC_SecretsLoader, "_read", wraps=SC_SecretsLoader._read,
+        ) as mock_read:
+            for _ in range(3):
+                self.assertEqual(my_settings.foo, "food")
+            self.assertEqual(mock_read.call_count, 1)
+
+            self.write("foo", b"fool")
+            self.assertEqual(my_settings.foo, "fool")
+            self.assertEqual(mock_read.call_count, 2)
+
+            self.assertEqual(my_settings.bar, "bard")
+            self.assertEqual(mock_read.call_count, 3)
+
+    def test_large_files(self):
+        content = b"-----BEGIN CERTIFICATE-----\n" * 1000
+        self.write("bundle", content)
+        self.write("crlf", b"foo\r\n")
+        self.write("empty", b"")
+        for binary, expected, expected_crlf in (
+            (False, content.decode()[:-1], "foo"),
+            (True, content[:-1], b"foo"),
+        ):
+            with unittest.mock.patch.object(
+                SC_SecretsLoader, "binary", binary,
+            ), unittest.mock.patch.object(
+                SC_SecretsLoader, "_cache", dict(),
+            ):
+                self.assertEqual(
+                    SC_SecretsLoader.get_settings(
+                        "", ["bundle", "crlf", "empty"],
+                    ),
+                    {
+                        "bundle": expected,
+                        "crlf": expected_crlf,
+                        "empty": expected[:0],
+                    },
+                )
+
+    def test_invalid_names(self):
+        os.mkdir(os.path.join(self.tmp_dir.name, "dir"))
+        self.write(".hidden", b"hidden")
+        self.assertIsNone(
+            SC_SecretsLoader.get_settings(
+                "", ["dir", ".hidden", "../foo", "", "missing"],
+            ),
+        )
+
+    def test_missing_directory(self):
+        with unittest.mock.patch.object(
+            SC_SecretsLoader, "path",
+            os.path.join(self.tmp_dir.name, "missing"),
+        ):
+            self.assertIsNone(SC_SecretsLoader.get_settings("", ["foo"]))
@@ -0,0 +1,171 @@
+import unittest.mock
+
+from settings_collector import (
+    SettingsCollector, SC_Setting, SC_SharedStore, SC_SharedMemoryLoader,
+    SC_CompiledLoader, SC_ConfigError, sc_collectors,
+)
+
+from tests.utils import TestsBase, patch_env
+
+
+class TestSharedStore(TestsBase):
+
+    def setUp(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "shared"
+            foo = SC_Setting("default")
+            bar = SC_Setting(0, value_type=int)
+            baz = SC_Setting("default")
+
+        self.my_settings = my_settings
+        self.store = SC_SharedStore.create(size=4096)
+        self.patch(SC_SharedMemoryLoader, "store", None)
+        self.patch(SC_SharedMemoryLoader, "enabled", False)
+        super().setUp()
+
+    def tearDown(self):
+        self.store.close()
+        super().tearDown()
+
+    def test_publish_and_read(self):
+        with patch_env(
+            shared__foo="food", shared__bar="17", shared__x__foo="scoped",
+        ):
+            self.my_settings("x")
+            generation = self.store.publish([self.my_settings])
+        self.assertEqual(generation, 2)
+        self.assertEqual(self.store.generation, 2)
+
+        # Simulate a worker (with its own snapshot and loaders' state).
+        worker_store = SC_SharedStore(self.store.shm)
+        try:
+            worker_store.install()
+            self.my_settings.clear_cache()
+            with patch_env(), unittest.mock.patch(
+                "settings_collector.SC_EnvironLoader.get_source",
+            ) as mock_environ:
+                self.assertEqual(self.my_settings.foo, "food")
+                self.assertEqual(self.my_settings.bar, 17)
+                self.assertEqual(self.my_settings.baz, "default")
+                self.assertEqual(self.my_settings("x").foo, "scoped")
+                self.assertEqual(self.my_settings("x").bar, 17)
+            mock_environ.assert_not_called()
+            self.assertFalse(worker_store.refresh())
+
+            with patch_env(shared__foo="fool", shared__bar="19"):
+                self.store.publish([self.my_settings])
+            self.assertTrue(worker_store.refresh())
+            self.assertFalse(worker_store.refresh())
+            with patch_env():
+                self.assertEqual(self.my_settings.foo, "fool")
+                self.assertEqual(self.my_settings.bar, 19)
+                self.assertEqual(self.my_settings("x").foo, "fool")
+        finally:
+            SC_SharedMemoryLoader.store = None
+        self.assertIsNone(SC_SharedMemoryLoader.store)
+
+    @unittest.mock.patch("multiprocessing.resource_tracker.unregister")
+    def test_attach(self, mock_unregister):
+        with patch_env(shared__foo="food"):
+            self.store.publish([self.my_settings])
+        worker_store = SC_SharedStore.attach(self.store.name)
+        try:
+            self.assertFalse(worker_store.owner)
+            self.assertEqual(
+                worker_store.get_snapshot(), {"shared__foo": "food"},
+            )
+            self.assertTrue(worker_store.is_published("shared__foo"))
+            self.assertFalse(worker_store.is_published("shared__x__foo"))
+        finally:
+            worker_store.close()
+        mock_unregister.assert_called_once()
+
+    def test_unpublished_scope(self):
+        with patch_env(shared__foo="food", shared__x__foo="scoped"):
+            self.store.publish([self.my_settings])
+            self.store.install()
+            self.my_settings.clear_cache()
+            self.assertEqual(self.my_settings.foo, "food")
+            # Scope `x` wasn't published, so it comes from other loaders.
+            self.assertEqual(self.my_settings("x").foo, "scoped")
+
+    def test_unpublished_collector(self):
+        class other_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "shared"
+            qux = SC_Setting("default")
+
+        with patch_env(shared__foo="food"):
+            self.store.publish([self.my_settings])
+        self.store.install()
+        # Both collectors have the same prefix, but only the settings that
+        # were published are served from the shared memory.
+        with patch_env(shared__qux="env qux"):
+            self.my_settings.clear_cache()
+            self.assertEqual(self.my_settings.foo, "food")
+            self.assertEqual(other_settings.qux, "env qux")
+
+    def test_write_in_progress(self):
+        with patch_env(shared__foo="food"):
+            self.store.publish([self.my_settings])
+        self.assertEqual(self.store.get_snapshot(), {"shared__foo": "food"})
+        # A new snapshot is being written in the other slot.
+        self.store._generation.pack_into(self.store.shm.buf, 0, 3)
+        self.assertFalse(self.store.refresh())
+        self.assertEqual(self.store.get_snapshot(), {"shared__foo": "food"})
+        with patch_env(shared__foo="fool"):
+            self.assertEqual(self.store.publish([self.my_settings]), 4)
+        self.assertTrue(self.store.refresh())
+        self.assertEqual(self.store.get_snapshot(), {"shared__foo": "fool"})
+
+    def test_overwritten_snapshot(self):
+        with patch_env(shared__foo="food", shared__bar="17"):
+            self.store.publish([self.my_settings])
+        snapshot = self.store.get_snapshot()
+        self.assertEqual(snapshot["shared__bar"], "17")
+        with patch_env(shared__foo="fool"):
+            self.store.publish([self.my_settings])
+        self.assertEqual(snapshot["shared__foo"], "food")
+        with patch_env(shared__foo="foot"):
+            self.store.publish([self.my_settings])
+        # The old snapshot's slot was reused, so the newest one is read.
+        self.assertEqual(snapshot["shared__foo"], "foot")
+        with self.assertRaises(KeyError):
+            snapshot["shared__bar"]
+
+    def test_not_serialisable(self):
+        with unittest.mock.patch(
+            "settings_collector.SC_LoadersManager.get_settings",
+            return_value={"foo": object()},
+        ), self.assertRaises(SC_ConfigError):
+            self.store.publish([self.my_settings])
+        self.assertEqual(self.store.generation, 0)
+
+    def test_skip_compiled(self):
+        with unittest.mock.patch.multiple(
+            SC_CompiledLoader,
+            settings={"shared__foo": "compiled"},
+            names=frozenset({"shared__foo", "shared__bar", "shared__baz"}),
+            enabled=True,
+        ), patch_env(shared__foo="food"):
+            self.my_settings.clear_cache()
+            self.assertEqual(self.my_settings.foo, "compiled")
+            self.store.publish([self.my_settings])
+        self.assertEqual(self.store.get_snapshot(), {"shared__foo": "food"})
+
+    def test_too_large(self):
+        with patch_env(shared__foo="x" * 10000):
+            with self.assertRaises(SC_ConfigError):
+                self.store.publish([self.my_settings])
+
+    def test_not_installed(self):
+        self.assertIsNone(
+            SC_SharedMemoryLoader.get_settings("", ["foo"]),
+        )
+
+    def test_collectors(self):
+        self.assertIn(self.my_settings, sc_collectors())
+        self.my_settings("x")
+        self.assertNotIn(self.my_settings("x"), sc_collectors())
+        self.assertNotIn(SettingsCollector, sc_collectors())
@@ -0,0 +1,142 @@
+import os
+import sqlite3
+import tempfile
+import threading
+import unittest.mock
+
+from settings_collector import SettingsCollector, SC_Setting, SC_SQLiteLoader
+
+from tests.utils import TestsBase
+
+
+class TestSQLiteLoader(TestsBase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "settings.db")
+        self.patch(SC_SQLiteLoader, "path", self.path)
+        self.patch(SC_SQLiteLoader, "enabled", True)
+        super().setUp()
+
+    def tearDown(self):
+        SC_SQLiteLoader.close()
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def _get_settings(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "app"
+                loaders = ("SQLite",)
+                exclude = False
+            foo = SC_Setting("foo")
+            bar = SC_Setting("bar", no_cache=True)
+            baz = SC_Setting("baz")
+
+        return my_settings
+
+    def _trace(self):
+        """
+        Return a list to which the statements of the loader's connection are
+        added.
+        """
+        statements = list()
+        SC_SQLiteLoader._get_state()
+        SC_SQLiteLoader._state.conn.set_trace_callback(statements.append)
+        return statements
+
+    def test_loader(self):
+        SC_SQLiteLoader.set_values({
+            "app__foo": "sqlite foo",
+            "app__bar": 17,
+            "app__x__foo": "x foo",
+        })
+        my_settings = self._get_settings()
+        self.assertEqual(my_settings.foo, "sqlite foo")
+        self.assertEqual(my_settings.bar, 17)
+        self.assertEqual(my_settings.baz, "baz")
+        self.assertEqual(my_settings("x").foo, "x foo")
+        self.assertEqual(
+            SC_SQLiteLoader.get_source_key("app__", "foo"), "app__foo",
+        )
+
+    def test_missing(self):
+        my_settings = self._get_settings()
+        self.assertEqual(my_settings.foo, "foo")
+        # No table.
+        sqlite3.connect(self.path).close()
+        my_settings.clear_cache()
+        self.assertEqual(my_settings.foo, "foo")
+        with unittest.mock.patch.object(SC_SQLiteLoader, "path", None):
+            my_settings.clear_cache()
+            self.assertEqual(my_settings.foo, "foo")
+
+    def test_queries(self):
+        SC_SQLiteLoader.set_values({"app__bar": "sqlite bar"})
+        my_settings = self._get_settings()
+        statements = self._trace()
+        with unittest.mock.patch.object(
+            SC_SQLiteLoader, "range_scan_threshold", 2,
+        ):
+            # A greedy load scans the range of keys with the common prefix.
+            self.assertEqual(my_settings.foo, "foo")
+            self.assertEqual(
+                [
+                    statement
+                    for statement in statements
+                    if "SELECT" in statement
+                ],
+                [
+                    'SELECT key, value FROM "settings"'
+                    " WHERE key >= 'app__' AND key < 'app_`'",
+                ],
+            )
+            statements.clear()
+            # A single setting is looked up by its key, but only if it's not
+            # already cached.
+            self.assertEqual(my_settings.bar, "sqlite bar")
+            self.assertEqual(statements, ["PRAGMA data_version"])
+            SC_SQLiteLoader.set_values({"app__bar": "new bar"})
+            self.assertEqual(my_settings.bar, "new bar")
+            self.assertEqual(statements[1:], [
+                "PRAGMA data_version",
+                """SELECT value FROM "settings" WHERE key = 'app__bar'""",
+            ])
+
+    def test_change_detection(self):
+        SC_SQLiteLoader.set_values({"app__foo": "sqlite foo"})
+        my_settings = self._get_settings()
+        self.assertEqual(my_settings.foo, "sqlite foo")
+        self.assertFalse(SC_SQLiteLoader.refresh())
+
+        # Another process changes the database.
+        conn = sqlite3.connect(self.path, isolation_level=None)
+        conn.execute(
+            "UPDATE settings SET value = 'new foo' WHERE key = 'app__foo'",
+        )
+        conn.close()
+        self.assertEqual(my_settings.foo, "sqlite foo")
+        self.assertTrue(SC_SQLiteLoader.refresh())
+        self.assertEqual(my_settings.foo, "new foo")
+
+        SC_SQLiteLoader.delete_values(["app__foo"])
+        self.assertTrue(SC_SQLiteLoader.refresh())
+        self.assertEqual(my_settings.foo, "foo")
+
+    def test_threads(self):
+        SC_SQLiteLoader.set_values({"app__foo": "sqlite foo"})
+        my_settings = self._get_settings()
+        connections = list()
+
+        def load():
+            connections.append(SC_SQLiteLoader._get_state().conn)
+            results.append(SC_SQLiteLoader.get_settings("app__", ["foo"]))
+            SC_SQLiteLoader.close()
+
+        results = list()
+        thread = threading.Thread(target=load)
+        thread.start()
+        thread.join()
+        self.assertEqual(my_settings.foo, "sqlite foo")
+        self.assertEqual(results, [{"foo": "sqlite foo"}])
+        self.assertIsNot(connections[0], SC_SQLiteLoader._state.conn)
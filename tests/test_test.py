@@ -1,9 +1,14 @@
 import io
+import os
+import tempfile
 import textwrap
 import unittest
 import unittest.mock
 
-from settings_collector import SCTest, sc_test_print_expected, sc_test_run
+from settings_collector import (
+    SCTest, sc_test_print_expected, sc_test_run, sc_patch, sc_patch_fixture,
+    SettingsCollector, SC_Setting, SC_EnvironLoader,
+)
 
 from tests.utils import TestsBase, patch_env
 
@@ -83,6 +88,64 @@ class TestTest(TestsBase):
             ),
         )
 
+    @unittest.mock.patch("sys.stdout", new_callable=io.StringIO)
+    def test_run_greedy_after_clearing(self, mock_stdout):
+        with unittest.mock.patch.object(
+            SC_EnvironLoader,
+            "get_settings",
+            wraps=SC_EnvironLoader.get_settings,
+        ) as mock_get_settings:
+            with patch_env(
+                SCTest__JustAString="covfefe",
+                SCTest__AnInteger=17,
+                SCTest__scope1__scope2__JustAString="covfefe, but scoped",
+                SCTest__scope1__scope2__AnInteger=1719,
+            ):
+                sc_test_run(False)
+            # One greedy load per scope.
+            self.assertEqual(mock_get_settings.call_count, 2)
+            SCTest.clear_cache()
+            mock_get_settings.reset_mock()
+            with patch_env(
+                SCTest__JustAString="covfefe",
+                SCTest__scope1__scope2__JustAString="covfefe, but scoped",
+            ):
+                sc_test_run(True)
+            # Greedy reloads, then the missing settings alone (falling back
+            # to the outer scopes).
+            self.assertEqual(
+                mock_get_settings.call_args_list,
+                [
+                    unittest.mock.call(
+                        "SCTest__", ["AnInteger", "JustAString"],
+                    ),
+                    unittest.mock.call("SCTest__", ["AnInteger"]),
+                    unittest.mock.call(
+                        "SCTest__scope1__scope2__",
+                        ["AnInteger", "JustAString"],
+                    ),
+                    unittest.mock.call(
+                        "SCTest__scope1__scope2__", ["AnInteger"],
+                    ),
+                    unittest.mock.call(
+                        "SCTest__scope1__", ["AnInteger", "JustAString"],
+                    ),
+                    unittest.mock.call("SCTest__", ["AnInteger"]),
+                ],
+            )
+        self.assertEqual(
+            mock_stdout.getvalue(),
+            textwrap.dedent(
+                """\
+                Success: all tests have passed.
+                Test for 'JustAString' passed using SC_EnvironLoader.
+                Error getting value for SCTest__AnInteger loaded from SC_EnvironLoader: setting 'AnInteger' must be defined
+                Test for 'scope1__scope2__JustAString' passed using SC_EnvironLoader.
+                Error getting value for SCTest__scope1__scope2__AnInteger loaded from SC_EnvironLoader: setting 'AnInteger' must be defined
+                """,  # noqa: E501
+            ),
+        )
+
     @unittest.mock.patch("sys.stdout", new_callable=io.StringIO)
     def test_run_verbose_bad_cast(self, mock_stdout):
         self.maxDiff = None
@@ -126,3 +189,96 @@ class TestTest(TestsBase):
                 """,  # noqa: E501
             ),
         )
+
+
+class TestPatch(TestsBase):
+
+    def _get_collector(self):
+        class my_settings(SettingsCollector):
+            foo = SC_Setting("foo")
+            bar = SC_Setting(19, value_type=int)
+            baz = SC_Setting("baz", no_cache=True)
+
+        return my_settings
+
+    def test_patch(self):
+        my_settings = self._get_collector()
+        with patch_env(foo="food", x__foo="x food"):
+            self.assertEqual(my_settings.foo, "food")
+            with sc_patch(my_settings, foo="fool", bar="17", baz="bazaar"):
+                self.assertEqual(my_settings.foo, "fool")
+                self.assertEqual(my_settings.bar, 17)
+                self.assertEqual(my_settings.baz, "bazaar")
+                self.assertEqual(my_settings("x").foo, "x food")
+                self.assertEqual(my_settings("x").bar, 17)
+                with sc_patch(my_settings, foo="fooled"), sc_patch(
+                    my_settings("x"), foo="x fooled",
+                ):
+                    self.assertEqual(my_settings.foo, "fooled")
+                    self.assertEqual(my_settings("x").foo, "x fooled")
+                self.assertEqual(my_settings.foo, "fool")
+                self.assertEqual(my_settings("x").foo, "x food")
+
+            # Only the patched values were touched, so the cached ones are
+            # used without reloading.
+            with unittest.mock.patch.object(
+                SC_EnvironLoader, "get_settings",
+            ) as mock_get_settings:
+                self.assertEqual(my_settings.foo, "food")
+                self.assertEqual(my_settings("x").foo, "x food")
+                mock_get_settings.assert_not_called()
+            self.assertEqual(my_settings.baz, "baz")
+
+            # Patched values survive clearing the cache.
+            with sc_patch(my_settings, foo="fool"):
+                my_settings.clear_cache()
+                self.assertEqual(my_settings.foo, "fool")
+            self.assertEqual(my_settings.foo, "food")
+
+    def test_patch_decorator(self):
+        my_settings = self._get_collector()
+
+        @sc_patch(my_settings, foo="fool")
+        def get_foo():
+            return my_settings.foo
+
+        self.assertEqual(get_foo(), "fool")
+        self.assertEqual(my_settings.foo, "foo")
+
+    def test_patch_invalid_name(self):
+        my_settings = self._get_collector()
+        with self.assertRaises(AttributeError):
+            with sc_patch(my_settings, qux=17):
+                pass  # pragma: no cover
+        self.assertIsNone(my_settings.SC_Values.foo.pinned)
+
+    def test_patch_fixture(self):
+        try:
+            import pytest
+        except ImportError:  # pragma: no cover
+            self.skipTest("pytest is not installed")
+
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            with open(os.path.join(tmp_dir, "test_fixture.py"), "w") as f:
+                f.write(textwrap.dedent("""\
+                    from settings_collector import (
+                        SettingsCollector, SC_Setting, sc_patch_fixture,
+                    )
+
+                    class my_settings(SettingsCollector):
+                        foo = SC_Setting("foo")
+
+                    foo_17 = sc_patch_fixture(my_settings, foo=17)
+
+                    def test_patched(foo_17):
+                        assert my_settings.foo == 17
+
+                    def test_not_patched():
+                        assert my_settings.foo == "foo"
+                """))
+            with unittest.mock.patch("sys.stdout", new_callable=io.StringIO):
+                result = pytest.main(
+                    ["-q", "-p", "no:cacheprovider", tmp_dir],
+                )
+        self.assertEqual(result, 0)
+        self.assertTrue(callable(sc_patch_fixture(SCTest, JustAString="x")))
@@ -0,0 +1,279 @@
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import gc
+import json
+import threading
+import time
+import unittest.mock
+
+from settings_collector import SettingsCollector, SC_Setting, SC_VaultLoader
+
+from tests.utils import TestsBase
+
+
+class _SecretStore(ThreadingHTTPServer):
+    """
+    A stand-in for a Vault-style secret store.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), _SecretStoreHandler)
+        # Secrets' data by their paths (under `/v1/`).
+        self.secrets = dict()
+        self.lease_duration = 60
+        self.renewable = False
+        # Tuples `(method, path, token)`.
+        self.requests = list()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_port}"
+
+
+class _SecretStoreHandler(BaseHTTPRequestHandler):
+
+    protocol_version = "HTTP/1.1"
+
+    def respond(self, status, data=None):
+        body = b"" if data is None else json.dumps(data).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def record(self):
+        self.server.requests.append(
+            (self.command, self.path, self.headers.get("X-Vault-Token")),
+        )
+
+    def do_GET(self):
+        self.record()
+        path = self.path[len("/v1/"):]
+        try:
+            data = self.server.secrets[path]
+        except KeyError:
+            self.respond(404, {"errors": []})
+        else:
+            self.respond(200, {
+                "lease_id": f"{path}/lease" if self.server.renewable else "",
+                "lease_duration": self.server.lease_duration,
+                "renewable": self.server.renewable,
+                "data": data,
+            })
+
+    def do_PUT(self):
+        self.record()
+        request = json.loads(
+            self.rfile.read(int(self.headers["Content-Length"])),
+        )
+        self.respond(200, {
+            "lease_id": request["lease_id"],
+            "lease_duration": self.server.lease_duration,
+            "renewable": True,
+        })
+
+    def log_message(self, *args):
+        pass
+
+
+class TestVaultLoader(TestsBase):
+
+    def setUp(self):
+        self.server = _SecretStore()
+        self.server_thread = threading.Thread(
+            target=self.server.serve_forever, args=(0.01,), daemon=True,
+        )
+        self.server_thread.start()
+        self.patch(SC_VaultLoader, "url", self.server.url)
+        self.patch(SC_VaultLoader, "token", "t0k3n")
+        self.patch(SC_VaultLoader, "enabled", True)
+        self.patch(SC_VaultLoader, "_pools", dict())
+        self.patch(SC_VaultLoader, "_leases", dict())
+        super().setUp()
+
+    def tearDown(self):
+        SC_VaultLoader.stop_renewals()
+        SC_VaultLoader.close_connections()
+        self.server.shutdown()
+        self.server.server_close()
+        super().tearDown()
+
+    def _get_settings(self):
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "app"
+                loaders = ("Vault",)
+                exclude = False
+            foo = SC_Setting("foo", no_cache=True)
+            bar = SC_Setting("bar")
+            baz = SC_Setting("baz")
+
+        return my_settings
+
+    def _wait_for(self, condition):
+        deadline = time.monotonic() + 5
+        while not condition():
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_loader(self):
+        self.server.secrets = {
+            "secret/app__foo": {"value": "vault foo"},
+            # KV version 2.
+            "secret/app__bar": {
+                "data": {"value": "vault bar"}, "metadata": {"version": 3},
+            },
+            "secret/app__x__foo": {"value": "x foo"},
+        }
+        my_settings = self._get_settings()
+        for _ in range(3):
+            self.assertEqual(my_settings.foo, "vault foo")
+        self.assertEqual(my_settings.bar, "vault bar")
+        self.assertEqual(my_settings.baz, "baz")
+        self.assertEqual(my_settings("x").foo, "x foo")
+        # Each secret was read only once, even for `no_cache` setting.
+        self.assertEqual(sorted(self.server.requests), [
+            ("GET", f"/v1/secret/app__{name}", "t0k3n")
+            for name in ("bar", "baz", "foo", "x__bar", "x__baz", "x__foo")
+        ])
+
+    def test_field(self):
+        self.server.secrets = {
+            "kv/app__foo": {"user": "root", "password": "hunter2"},
+        }
+        my_settings = self._get_settings()
+        with unittest.mock.patch.object(
+            SC_VaultLoader, "mount", "/kv/",
+        ), unittest.mock.patch.object(SC_VaultLoader, "field", None):
+            self.assertEqual(
+                my_settings.foo, {"user": "root", "password": "hunter2"},
+            )
+        with unittest.mock.patch.object(
+            SC_VaultLoader, "mount", "kv",
+        ), unittest.mock.patch.object(SC_VaultLoader, "_leases", dict()):
+            self.assertEqual(my_settings.foo, "foo")
+
+    def test_rotation(self):
+        self.server.secrets = {
+            "secret/app__foo": {"value": "vault foo"},
+            "secret/app__bar": {"value": "vault bar"},
+            "secret/app__baz": {"value": "vault baz"},
+        }
+        self.server.lease_duration = 0.5
+        my_settings = self._get_settings()
+        scope = my_settings("x")
+        sc_values = dict(my_settings.get_sc_values())
+        with unittest.mock.patch.object(SC_VaultLoader, "renew_fraction", 0.2):
+            self.assertEqual(my_settings.bar, "vault bar")
+            self.assertEqual(my_settings.baz, "vault baz")
+            self.assertEqual(scope.bar, "vault bar")
+            self.server.secrets["secret/app__bar"] = {"value": "new bar"}
+            self.server.lease_duration = 60
+            # The secrets are read again in the background, before their
+            # leases expire.
+            self._wait_for(lambda: not sc_values["bar"].is_cached())
+        self.assertGreater(
+            self.server.requests.count(
+                ("GET", "/v1/secret/app__baz", "t0k3n"),
+            ),
+            1,
+        )
+        # Only the rotated secret's settings were invalidated.
+        self.assertTrue(sc_values["baz"].is_cached())
+        self.assertEqual(my_settings.bar, "new bar")
+        self.assertEqual(scope.bar, "new bar")
+
+    def test_consumers_locked(self):
+        condition = SC_VaultLoader._leases_condition
+        owned = list()
+
+        class _Consumers(set):
+            def add(self, item):
+                owned.append(condition._is_owned())
+                super().add(item)
+
+            def __iter__(self):
+                owned.append(condition._is_owned())
+                return super().__iter__()
+
+        self.server.secrets = {"secret/app__bar": {"value": "vault bar"}}
+        self.server.lease_duration = 0.5
+        my_settings = self._get_settings()
+        with unittest.mock.patch(
+            "settings_collector.loaders.vault.set", _Consumers, create=True,
+        ), unittest.mock.patch.object(SC_VaultLoader, "renew_fraction", 0.2):
+            self.assertEqual(my_settings.bar, "vault bar")
+            self._wait_for(lambda: len(owned) >= 3)
+        # The consumers were added (by the reader) and iterated over (by the
+        # renewer) only while holding the lock.
+        self.assertTrue(all(owned))
+
+    def test_missing_not_renewed(self):
+        self.server.secrets = {"secret/app__bar": {"value": "vault bar"}}
+        self.server.lease_duration = 0.5
+        my_settings = self._get_settings()
+        with unittest.mock.patch.object(
+            SC_VaultLoader, "renew_fraction", 0.2,
+        ), unittest.mock.patch.object(
+            SC_VaultLoader, "default_lease_duration", 0.3,
+        ):
+            self.assertEqual(my_settings.bar, "vault bar")
+            self.assertEqual(my_settings.baz, "baz")
+            self._wait_for(lambda: "app__baz" not in SC_VaultLoader._leases)
+            self._wait_for(
+                lambda: self.server.requests.count(
+                    ("GET", "/v1/secret/app__bar", "t0k3n"),
+                ) >= 3,
+            )
+        # The missing secrets were read only once, even though the existing
+        # one was renewed several times meanwhile.
+        self.assertEqual(
+            self.server.requests.count(
+                ("GET", "/v1/secret/app__baz", "t0k3n"),
+            ),
+            1,
+        )
+
+    def test_unused_dropped(self):
+        self.server.secrets = {"secret/app__bar": {"value": "vault bar"}}
+        self.server.lease_duration = 0.5
+        my_settings = self._get_settings()
+        with unittest.mock.patch.object(SC_VaultLoader, "renew_fraction", 0.2):
+            self.assertEqual(my_settings.bar, "vault bar")
+            self.assertIn("app__bar", SC_VaultLoader._leases)
+            del my_settings
+            gc.collect()
+            self._wait_for(lambda: "app__bar" not in SC_VaultLoader._leases)
+
+    def test_renewable(self):
+        self.server.secrets = {"secret/app__foo": {"value": "vault foo"}}
+        self.server.lease_duration = 0.5
+        self.server.renewable = True
+        my_settings = self._get_settings()
+        with unittest.mock.patch.object(SC_VaultLoader, "renew_fraction", 0.2):
+            self.assertEqual(my_settings.foo, "vault foo")
+            self._wait_for(lambda: len(self.server.requests) >= 5)
+        self.assertEqual(
+            [
+                request
+                for request in self.server.requests
+                if "app__foo" in request[1] or request[0] == "PUT"
+            ][:3],
+            [
+                ("GET", "/v1/secret/app__foo", "t0k3n"),
+                ("PUT", "/v1/sys/leases/renew", "t0k3n"),
+                ("PUT", "/v1/sys/leases/renew", "t0k3n"),
+            ],
+        )
+        self.assertEqual(my_settings.foo, "vault foo")
+
+    def test_expired(self):
+        self.server.secrets = {"secret/app__foo": {"value": "vault foo"}}
+        my_settings = self._get_settings()
+        self.assertEqual(my_settings.foo, "vault foo")
+        SC_VaultLoader.stop_renewals()
+        self.server.secrets = {"secret/app__foo": {"value": "new foo"}}
+        for lease in SC_VaultLoader._leases.values():
+            lease.expires = time.monotonic()
+        self.assertEqual(my_settings.foo, "new foo")
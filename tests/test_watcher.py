@@ -0,0 +1,125 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest.mock
+
+from settings_collector import (
+    SettingsCollector, SC_Setting, SC_JSONLoader, SC_SecretsLoader,
+    SC_Watcher,
+)
+
+from tests.utils import TestsBase, patch_env
+
+
+class TestWatcher(TestsBase):
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "settings.json")
+        self.secrets_path = os.path.join(self.tmp_dir.name, "secrets")
+        os.mkdir(self.secrets_path)
+        self.patch(SC_JSONLoader, "path", self.path)
+        self.patch(SC_JSONLoader, "_cache", None)
+        self.patch(SC_JSONLoader, "enabled", True)
+        self.patch(SC_SecretsLoader, "path", self.secrets_path)
+        self.patch(SC_SecretsLoader, "_cache", dict())
+        self.patch(SC_SecretsLoader, "enabled", True)
+
+        class my_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "watched"
+            foo = SC_Setting("default")
+
+        class unwatched_settings(SettingsCollector):
+            class SC_Config:
+                prefix = "watched"
+                loaders = ("Environ",)
+                exclude = False
+            foo = SC_Setting("default")
+
+        self.my_settings = my_settings
+        self.unwatched_settings = unwatched_settings
+        self.watcher = SC_Watcher(
+            interval=0.01, loaders=[SC_JSONLoader, SC_SecretsLoader],
+        )
+        super().setUp()
+
+    def tearDown(self):
+        self.watcher.stop()
+        self.tmp_dir.cleanup()
+        super().tearDown()
+
+    def write(self, path: str, content: str, mtime_ns: int) -> None:
+        with open(path, "w") as f:
+            f.write(content)
+        os.utime(path, ns=(mtime_ns, mtime_ns))
+
+    def test_check(self):
+        self.write(self.path, '{"watched__foo": "food"}', 1_000_000_000)
+        with patch_env(watched__foo="environ"):
+            self.assertEqual(self.my_settings.foo, "food")
+            self.assertEqual(self.unwatched_settings.foo, "environ")
+            self.assertEqual(self.watcher.check(), [])
+
+            self.write(self.path, '{"watched__foo": "fool"}', 2_000_000_000)
+            self.assertEqual(self.my_settings.foo, "food")
+
+        with patch_env(watched__foo="changed"):
+            self.assertEqual(self.watcher.check(), [SC_JSONLoader])
+            self.assertEqual(self.my_settings.foo, "fool")
+            # The cache of the collector not using JSON loader is intact.
+            self.assertEqual(self.unwatched_settings.foo, "environ")
+            self.assertEqual(self.watcher.check(), [])
+
+    def test_secrets(self):
+        with patch_env():
+            self.assertEqual(self.my_settings.foo, "default")
+            self.watcher.check()
+            self.write(
+                os.path.join(self.secrets_path, "watched__foo"), "secret",
+                1_000_000_000,
+            )
+            self.assertEqual(self.my_settings.foo, "default")
+            self.assertEqual(self.watcher.check(), [SC_SecretsLoader])
+            self.assertEqual(self.my_settings.foo, "secret")
+
+    def _wait_for_foo(self, expected: str) -> None:
+        deadline = time.monotonic() + 5
+        while self.my_settings.foo != expected:
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_thread(self):
+        self.write(self.path, '{"watched__foo": "food"}', 1_000_000_000)
+        with patch_env():
+            self.assertEqual(self.my_settings.foo, "food")
+            thread = self.watcher.start()
+            self.assertIs(self.watcher.start(), thread)
+            time.sleep(0.05)
+            self.write(self.path, '{"watched__foo": "fool"}', 2_000_000_000)
+            self._wait_for_foo("fool")
+            self.watcher.stop()
+            self.assertFalse(thread.is_alive())
+
+    def test_async(self):
+        self.write(self.path, '{"watched__foo": "food"}', 1_000_000_000)
+
+        async def run():
+            task = asyncio.create_task(self.watcher.run_async())
+            await asyncio.sleep(0.05)
+            self.write(self.path, '{"watched__foo": "fool"}', 2_000_000_000)
+            deadline = time.monotonic() + 5
+            while self.my_settings.foo != "fool":
+                self.assertLess(time.monotonic(), deadline)
+                await asyncio.sleep(0.01)
+            task.cancel()
+
+        with patch_env():
+            self.assertEqual(self.my_settings.foo, "food")
+            asyncio.run(run())
+
+    def test_default_loaders(self):
+        self.assertIn(SC_JSONLoader, SC_Watcher()._get_loaders())
+        with unittest.mock.patch.object(SC_JSONLoader, "enabled", False):
+            self.assertNotIn(SC_JSONLoader, SC_Watcher()._get_loaders())
@@ -4,6 +4,7 @@ Testing utilities.
 
 from contextlib import contextmanager
 import os
+from typing import Any
 import unittest
 from unittest.mock import patch
 
@@ -31,6 +32,14 @@ class TestsBase(unittest.TestCase):
         """
         pass
 
+    def patch(self, target: Any, attribute: str, new: Any) -> None:
+        """
+        Patch `target`'s `attribute` with `new` until the end of the test.
+        """
+        patcher = patch.object(target, attribute, new)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
 
 @contextmanager
 def patch_env(_upper: bool = True, **kwargs):